@@ -11,9 +11,33 @@ class Settings(BaseSettings):
     APP_VERSION: str = "0.1.0"
     DEBUG: bool = True
     API_V1_PREFIX: str = "/api/v1"
+    # `/metrics` is served only to requests with "Authorization: Bearer <METRICS_TOKEN>";
+    # unset = the endpoint is disabled (404)
+    METRICS_TOKEN: str | None = None
+
+    # Real-time hall feed (SSE)
+    HALL_STREAM_QUEUE_SIZE: int = 100  # per connection; overflowing consumers are dropped
+    HALL_STREAM_HEARTBEAT_SECONDS: float = 15.0
 
     # Database
     DATABASE_URL: str = "sqlite+aiosqlite:///./seeforme.db"
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = -1  # seconds, -1 disables recycling
+    # Read-only routes use a separate pool; point it at a replica if available.
+    # Unset = dedicated reader pool on DATABASE_URL (WAL readers don't block the writer).
+    READ_DATABASE_URL: str | None = None
+    DB_READ_POOL_SIZE: int = 10
+
+    # SQLite engine profile (PRAGMAs applied on every new connection)
+    SQLITE_TUNING_ENABLED: bool = True
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_SIZE: int = -64000  # negative = KiB, i.e. 64MB page cache
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024  # 256MB
+    SQLITE_TEMP_STORE: str = "MEMORY"
 
     # JWT
     SECRET_KEY: str = "change-me-in-production-please"
@@ -21,8 +45,55 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
 
+    # Signed media URLs: first key signs, all keys verify (rotate by prepending)
+    MEDIA_URL_SIGNING_KEYS: list[str] = []  # empty -> derived from SECRET_KEY
+    MEDIA_URL_TTL_SECONDS: int = 3600
+    # Expiries are rounded up to this step so URLs stay stable (and cacheable) for a while
+    MEDIA_URL_EXPIRY_STEP_SECONDS: int = 900
+
+    # Authenticated user cache (identity + active state, keyed by user id)
+    USER_CACHE_MAX_SIZE: int = 10_000
+    USER_CACHE_TTL_SECONDS: float = 30.0
+    # Let `require_role` trust the signed role claim instead of loading the user.
+    # Deactivation then takes effect once the cache learns of it or the token expires.
+    AUTH_TRUST_ROLE_CLAIM: bool = False
+
+    # Password hashing runs in a bounded thread pool off the event loop
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 64  # running + queued; beyond this -> 503
+    PASSWORD_HASH_RETRY_AFTER_SECONDS: int = 2
+
     # Upload
     UPLOAD_DIR: str = "./uploads"
+    UPLOAD_CHUNK_SIZE: int = 256 * 1024  # bytes read/written per step when streaming
+    UPLOAD_PRESIGN_BATCH_MAX: int = 9  # 3 images + 3 voice clips + 3 videos per request
+    UPLOAD_RESUMABLE_CHUNK_SIZE: int = 1024 * 1024  # suggested client chunk for resumable uploads
+    UPLOAD_RESUMABLE_TTL_SECONDS: int = 24 * 3600  # abandoned partial uploads are swept after this
+    UPLOAD_SWEEP_INTERVAL_SECONDS: float = 600.0
+    # Orphan collection: presigned records that never got content and stored uploads
+    # nothing references are deleted, with their files, in bounded batches.
+    UPLOAD_GC_INTERVAL_SECONDS: float = 3600.0
+    UPLOAD_GC_PENDING_TTL_SECONDS: int = 2 * 24 * 3600  # outlives resumable uploads
+    UPLOAD_GC_UNATTACHED_TTL_SECONDS: int = 7 * 24 * 3600
+    UPLOAD_GC_BATCH_SIZE: int = 200
+    UPLOAD_GC_DRY_RUN: bool = False  # only report what would be collected
+    # Where stored content lives: "local" (under UPLOAD_DIR) or "s3" (any S3-compatible store)
+    STORAGE_BACKEND: str = "local"
+    # How content responses are sent: "app" streams bytes from Python; "x-accel-redirect"
+    # (nginx) and "x-sendfile" (Apache/lighttpd/Caddy) hand the file to the front proxy.
+    STORAGE_SERVE_MODE: str = "app"
+    STORAGE_ACCEL_PREFIX: str = "/_protected/uploads/"  # internal location aliased to UPLOAD_DIR
+    S3_BUCKET: str = ""
+    S3_ENDPOINT_URL: str | None = None  # e.g. MinIO/R2; None means AWS
+    S3_REGION: str = "us-east-1"
+    S3_ACCESS_KEY_ID: str | None = None
+    S3_SECRET_ACCESS_KEY: str | None = None
+    S3_KEY_PREFIX: str = ""
+    S3_ACCEL_PREFIX: str = "/_protected/s3/"  # internal location proxied to the bucket
+    # Local read-through copies of S3 objects (UPLOAD_DIR/cache), trimmed least recently
+    # used first; copies used within the last minute are kept while they may be in flight.
+    S3_CACHE_MAX_BYTES: int = 1024 * 1024 * 1024
+    S3_CACHE_SWEEP_INTERVAL_SECONDS: float = 300.0
     MAX_IMAGE_SIZE: int = 5 * 1024 * 1024  # 5MB
     MAX_VOICE_SIZE: int = 10 * 1024 * 1024  # 10MB
     ALLOWED_IMAGE_TYPES: list[str] = [
@@ -46,6 +117,55 @@ class Settings(BaseSettings):
     MAX_VIDEO_SIZE: int = 50 * 1024 * 1024  # 50MB
     ALLOWED_VIDEO_TYPES: list[str] = ["video/mp4", "video/quicktime", "video/webm"]
 
+    # Speech-to-text: a DB-backed job queue drained by in-process workers
+    STT_ENGINE: str = "local"  # deterministic stand-in, or "package.module:EngineClass"
+    STT_LANGUAGE: str = "zh-CN"
+    STT_WORKERS: int = 2
+    STT_MAX_ATTEMPTS: int = 3
+    STT_RETRY_BACKOFF_SECONDS: float = 30.0  # multiplied by the attempt number
+    STT_JOB_LEASE_SECONDS: float = 300.0  # running jobs not finished by then are retried
+    STT_POLL_INTERVAL_SECONDS: float = 5.0  # fallback when no enqueue notification arrives
+    TTS_ENGINE: str = "local"  # deterministic stand-in, or "package.module:EngineClass"
+    TTS_SEGMENT_MAX_CHARS: int = 120  # streamed replies are synthesized sentence by sentence
+    TTS_STREAM_CONCURRENCY: int = 3  # segments of one stream synthesized at once
+    TTS_LOCAL_LATENCY_SECONDS: float = 0.0  # simulated per-call latency of the local stand-in
+    TTS_LOCAL_LATENCY_PER_CHAR_SECONDS: float = 0.0
+    IMAGE_DESCRIBE_ENGINE: str = "local"  # deterministic stand-in, or "package.module:EngineClass"
+    # Describe requests are micro-batched: a batch goes to a worker process once it has
+    # BATCH_MAX_ITEMS images or its oldest has waited BATCH_WAIT_MS (and a worker is free).
+    IMAGE_DESCRIBE_WORKERS: int = 1
+    IMAGE_DESCRIBE_BATCH_MAX_ITEMS: int = 8
+    IMAGE_DESCRIBE_BATCH_WAIT_MS: float = 20.0
+    IMAGE_DESCRIBE_TIMEOUT_SECONDS: float = 30.0
+    IMAGE_DESCRIBE_MAX_QUEUE: int = 256  # queued beyond this -> 503
+    IMAGE_DESCRIBE_LOCAL_BATCH_SECONDS: float = 0.0  # simulated model cost of the local stand-in
+    IMAGE_DESCRIBE_LOCAL_ITEM_SECONDS: float = 0.0
+    # Clarity pre-check on a thumb-sized grayscale decode (0-255 luminance)
+    IMAGE_CLARITY_BLUR_THRESHOLD: float = 100.0  # Laplacian variance below this -> blurry
+    IMAGE_CLARITY_DARK_THRESHOLD: float = 40.0  # mean luminance below this -> too dark
+    IMAGE_CLARITY_CLIP_FRACTION: float = 0.25  # share of crushed/blown pixels -> badly exposed
+    # Beyond these the photo is unusable: the describer is skipped and only a retake note is sent
+    IMAGE_CLARITY_UNUSABLE_BLUR_SCORE: float = 10.0
+    IMAGE_CLARITY_UNUSABLE_MEAN_LUMINANCE: float = 12.0
+    IMAGE_CLARITY_UNUSABLE_CLIP_FRACTION: float = 0.75
+
+    # Inference results keyed by (content hash, engine, version, language, params):
+    # an in-memory LRU over a size-bounded SQLite file
+    RESULT_CACHE_MEMORY_ENTRIES: int = 1024
+    RESULT_CACHE_MEMORY_MAX_VALUE_BYTES: int = 256 * 1024  # bigger ones stay on disk, if there is one
+    RESULT_CACHE_PATH: str | None = None  # None = UPLOAD_DIR/results.db; "" = memory only
+    RESULT_CACHE_MAX_BYTES: int = 512 * 1024 * 1024
+
+    # Media derivatives (image variants, compact voice) rendered in a process pool
+    MEDIA_WORKERS: int = 2
+    IMAGE_THUMB_MAX_EDGE: int = 480
+    IMAGE_DISPLAY_MAX_EDGE: int = 1280
+    VOICE_COMPACT_BITRATE: int = 32_000  # mono AAC, plays on iOS/Android/web alike
+    VOICE_COMPACT_SAMPLE_RATE: int = 24_000
+    VOICE_SILENCE_THRESHOLD_DBFS: float = -45.0
+    VOICE_SILENCE_PADDING_MS: int = 150
+    VOICE_WAVEFORM_BUCKETS: int = 48
+
     model_config = {"env_file": ".env", "extra": "ignore"}
 
 
@@ -4,17 +4,106 @@ from __future__ import annotations
 
 import logging
 
-from sqlalchemy import text
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import DeclarativeBase
 
 from app.core.config import settings
 
-engine = create_async_engine(settings.DATABASE_URL, echo=settings.DEBUG)
-async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 logger = logging.getLogger(__name__)
 
 
+def sqlite_pragmas() -> dict[str, str | int]:
+    """PRAGMAs of the configured SQLite engine profile, in application order."""
+    return {
+        "journal_mode": settings.SQLITE_JOURNAL_MODE,
+        "synchronous": settings.SQLITE_SYNCHRONOUS,
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+        "cache_size": settings.SQLITE_CACHE_SIZE,
+        "mmap_size": settings.SQLITE_MMAP_SIZE,
+        "temp_store": settings.SQLITE_TEMP_STORE,
+    }
+
+
+def _apply_sqlite_pragmas(dbapi_connection, _connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in sqlite_pragmas().items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def _apply_sqlite_query_only(dbapi_connection, _connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("PRAGMA query_only=ON")
+    finally:
+        cursor.close()
+
+
+def _is_in_memory_sqlite(url: str) -> bool:
+    parsed = make_url(url)
+    return parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:")
+
+
+def create_engine_from_settings(url: str | None = None, **overrides) -> AsyncEngine:
+    """Create an async engine using the pool and SQLite profile from settings."""
+    url = url or settings.DATABASE_URL
+    is_sqlite = make_url(url).get_backend_name() == "sqlite"
+    in_memory = _is_in_memory_sqlite(url)
+
+    options: dict = {"echo": settings.DEBUG}
+    if not in_memory:
+        options.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+        )
+    options.update(overrides)
+
+    new_engine = create_async_engine(url, **options)
+    if is_sqlite and settings.SQLITE_TUNING_ENABLED:
+        event.listen(new_engine.sync_engine, "connect", _apply_sqlite_pragmas)
+    return new_engine
+
+
+def create_read_engine_from_settings(write_engine: AsyncEngine) -> AsyncEngine:
+    """Create the engine backing read-only sessions.
+
+    Uses READ_DATABASE_URL when set (e.g. a replica), otherwise a separate
+    pool on DATABASE_URL whose SQLite connections are opened ``query_only``.
+    An in-memory SQLite database cannot be shared across pools, so the write
+    engine is reused in that case.
+    """
+    url = settings.READ_DATABASE_URL or settings.DATABASE_URL
+    if _is_in_memory_sqlite(url):
+        return write_engine
+
+    read_engine = create_engine_from_settings(url, pool_size=settings.DB_READ_POOL_SIZE)
+    if read_engine.dialect.name == "sqlite":
+        event.listen(read_engine.sync_engine, "connect", _apply_sqlite_query_only)
+    return read_engine
+
+
+engine = create_engine_from_settings()
+async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+read_engine = create_read_engine_from_settings(engine)
+async_read_session = async_sessionmaker(
+    read_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+
 class Base(DeclarativeBase):
     """Base class for all ORM models."""
     pass
@@ -33,6 +122,16 @@ async def get_db() -> AsyncSession:
             await session.close()
 
 
+async def get_read_db() -> AsyncSession:
+    """FastAPI dependency that yields a read-only async database session.
+
+    The session never commits: no flush, no COMMIT round-trip, and the
+    implicit read transaction is simply released when the session closes.
+    """
+    async with async_read_session() as session:
+        yield session
+
+
 async def init_db() -> None:
     """Create all tables (for development / testing)."""
     async with engine.begin() as conn:
@@ -159,9 +258,23 @@ async def _ensure_schema_compatibility(conn) -> None:
         await conn.execute(
             text("ALTER TABLE uploaded_files ADD COLUMN storage_path VARCHAR(500)")
         )
+    if "sha256" not in upload_columns_after:
+        await conn.execute(text("ALTER TABLE uploaded_files ADD COLUMN sha256 VARCHAR(64)"))
+    if "duration_ms" not in upload_columns_after:
+        await conn.execute(text("ALTER TABLE uploaded_files ADD COLUMN duration_ms INTEGER"))
+    if "waveform" not in upload_columns_after:
+        await conn.execute(text("ALTER TABLE uploaded_files ADD COLUMN waveform JSON"))
 
     final_upload_columns = await _table_columns("uploaded_files")
     if upload_columns_before != final_upload_columns:
         logger.warning(
             "Applied SQLite compatibility patch: synced uploaded_files columns"
         )
+
+    # `create_all()` skips indexes of tables that already exist.
+    def _create_missing_indexes(sync_conn) -> None:
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(sync_conn, checkfirst=True)
+
+    await conn.run_sync(_create_missing_indexes)
@@ -16,6 +16,7 @@ class ErrorCode(IntEnum):
     CONFLICT = 1005
     BAD_REQUEST = 1006
     DATABASE_ERROR = 1007
+    SERVICE_UNAVAILABLE = 1008
     INTERNAL_ERROR = 1099
 
     # Module range example: help_requests (2001-2099)
@@ -30,6 +31,7 @@ HTTP_STATUS_CODE_MAP: dict[int, ErrorCode] = {
     409: ErrorCode.CONFLICT,
     422: ErrorCode.VALIDATION_ERROR,
     500: ErrorCode.INTERNAL_ERROR,
+    503: ErrorCode.SERVICE_UNAVAILABLE,
 }
 
 
@@ -43,12 +45,14 @@ class AppException(Exception):
         message: str,
         status_code: int = 400,
         data: Any = None,
+        headers: dict[str, str] | None = None,
     ) -> None:
         super().__init__(message)
         self.code = int(code)
         self.message = message
         self.status_code = status_code
         self.data = data
+        self.headers = headers
 
 
 def build_error_payload(*, code: int, message: str, data: Any = None) -> dict[str, Any]:
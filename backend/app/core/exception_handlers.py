@@ -42,6 +42,7 @@ def register_exception_handlers(app: FastAPI) -> None:
                 message=exc.message,
                 data=exc.data,
             ),
+            headers=exc.headers,
         )
 
     @app.exception_handler(RequestValidationError)
@@ -69,6 +70,7 @@ def register_exception_handlers(app: FastAPI) -> None:
                 message=_resolve_http_error_message(exc.detail),
                 data=None,
             ),
+            headers=exc.headers,
         )
 
     @app.exception_handler(SQLAlchemyError)
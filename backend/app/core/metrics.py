@@ -0,0 +1,31 @@
+"""In-process metrics registry exposed on the `/metrics` endpoint."""
+
+from __future__ import annotations
+
+import hmac
+from typing import Any, Callable
+
+from fastapi import Header, HTTPException
+
+from app.core.config import settings
+
+_providers: dict[str, Callable[[], dict[str, Any]]] = {}
+
+
+def register_metrics(name: str, provider: Callable[[], dict[str, Any]]) -> None:
+    """Register a callable returning a snapshot of counters under ``name``."""
+    _providers[name] = provider
+
+
+def collect_metrics() -> dict[str, dict[str, Any]]:
+    """Snapshot every registered metrics provider."""
+    return {name: provider() for name, provider in _providers.items()}
+
+
+async def require_metrics_token(authorization: str | None = Header(None)) -> None:
+    """Dependency: admit only scrapers presenting ``METRICS_TOKEN``."""
+    token = settings.METRICS_TOKEN
+    if not token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not hmac.compare_digest((authorization or "").encode(), f"Bearer {token}".encode()):
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
@@ -0,0 +1,106 @@
+"""In-process pub/sub broker for pushing domain events to live connections."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.metrics import register_metrics
+
+_PENDING_EVENTS_KEY = "pubsub_pending_events"
+
+
+class Subscription:
+    """A subscriber's bounded queue.
+
+    Publishing never waits on a subscriber: when the queue is full the
+    subscription is marked ``dropped`` and detached, and the consumer is
+    expected to resync (e.g. refetch the hall) and subscribe again.
+    """
+
+    def __init__(self, broker: "Broker", topic: str, maxsize: int) -> None:
+        self._broker = broker
+        self.topic = topic
+        self.queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(maxsize=maxsize)
+        self.dropped = False
+
+    async def get(self, timeout: float | None = None) -> dict[str, Any] | None:
+        """Next event, or None on timeout."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self) -> None:
+        self._broker.unsubscribe(self)
+
+
+class Broker:
+    """Topic-based fan-out with per-subscriber backpressure."""
+
+    def __init__(self) -> None:
+        self._subscribers: dict[str, set[Subscription]] = {}
+        self.published = 0
+        self.delivered = 0
+        self.dropped_subscribers = 0
+
+    def subscribe(self, topic: str, maxsize: int = 100) -> Subscription:
+        subscription = Subscription(self, topic, maxsize)
+        self._subscribers.setdefault(topic, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscribers = self._subscribers.get(subscription.topic)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[subscription.topic]
+
+    def publish(self, topic: str, payload: dict[str, Any]) -> None:
+        """Deliver to every subscriber of ``topic`` without blocking."""
+        self.published += 1
+        for subscription in list(self._subscribers.get(topic, ())):
+            try:
+                subscription.queue.put_nowait(payload)
+                self.delivered += 1
+            except asyncio.QueueFull:
+                subscription.dropped = True
+                self.unsubscribe(subscription)
+                self.dropped_subscribers += 1
+
+    def subscriber_count(self, topic: str | None = None) -> int:
+        if topic is not None:
+            return len(self._subscribers.get(topic, ()))
+        return sum(len(subs) for subs in self._subscribers.values())
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "subscribers": self.subscriber_count(),
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped_subscribers": self.dropped_subscribers,
+        }
+
+
+broker = Broker()
+register_metrics("pubsub", broker.stats)
+
+
+def publish_after_commit(db: AsyncSession, topic: str, payload: dict[str, Any]) -> None:
+    """Queue an event to be published only once ``db`` commits successfully."""
+    db.sync_session.info.setdefault(_PENDING_EVENTS_KEY, []).append((topic, payload))
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_pending_events(session: Session) -> None:
+    for topic, payload in session.info.pop(_PENDING_EVENTS_KEY, []):
+        broker.publish(topic, payload)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_pending_events(session: Session, previous_transaction) -> None:
+    session.info.pop(_PENDING_EVENTS_KEY, None)
@@ -0,0 +1,270 @@
+"""Content-addressed cache for inference results (STT, TTS, image descriptions).
+
+A result is keyed by everything that determines it: the SHA-256 of the input
+content, the engine and its version, the language and engine parameters.
+Lookups go to a bounded in-memory LRU first, then to a SQLite file whose total
+size is capped by evicting the least recently used rows. Concurrent misses on
+the same key share one computation.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import math
+import sqlite3
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.metrics import register_metrics
+
+
+def content_sha256(data: bytes | str) -> str:
+    """Hex SHA-256 of ``data`` (text is hashed as UTF-8)."""
+    return hashlib.sha256(data.encode() if isinstance(data, str) else data).hexdigest()
+
+
+@dataclass(frozen=True)
+class ResultKey:
+    content_sha256: str
+    engine: str  # "<kind>:<engine name>", e.g. "tts:local"
+    engine_version: str
+    language: str = ""
+    params: tuple[tuple[str, Any], ...] = ()
+
+    @classmethod
+    def build(
+        cls, content_sha256: str, engine: str, engine_version: str, language: str = "", **params: Any
+    ) -> "ResultKey":
+        return cls(content_sha256, engine, engine_version, language, tuple(sorted(params.items())))
+
+    @property
+    def digest(self) -> str:
+        payload = json.dumps(
+            [self.content_sha256, self.engine, self.engine_version, self.language, self.params],
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ResultCacheStats:
+    """Per-engine hit/miss counters for `/metrics`."""
+
+    def __init__(self) -> None:
+        self._counts: dict[str, Counter[str]] = {}
+
+    def record(self, engine: str, outcome: str) -> None:
+        self._counts.setdefault(engine, Counter())[outcome] += 1
+
+    def stats(self) -> dict[str, dict[str, int | float]]:
+        snapshot = {}
+        for engine, counts in self._counts.items():
+            hits = counts["memory_hits"] + counts["disk_hits"]
+            lookups = hits + counts["misses"]
+            snapshot[engine] = {
+                "memory_hits": counts["memory_hits"],
+                "disk_hits": counts["disk_hits"],
+                "misses": counts["misses"],
+                "hit_rate": hits / lookups if lookups else 0.0,
+            }
+        return snapshot
+
+
+cache_stats = ResultCacheStats()
+register_metrics("result_cache", cache_stats.stats)
+
+
+class _DiskTier:
+    """SQLite table of results, trimmed to ``max_bytes`` by last access.
+
+    Blocking; called through ``asyncio.to_thread``. One connection is shared
+    under a lock, opened on first use.
+    """
+
+    def __init__(self, path: Path, max_bytes: int) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self._approx_size = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                " key TEXT PRIMARY KEY, engine TEXT NOT NULL, value BLOB NOT NULL,"
+                " size INTEGER NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_results_accessed ON results (accessed_at)")
+            self._approx_size = conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE results SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            return row[0]
+
+    def put(self, key: str, engine: str, value: bytes) -> None:
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO results (key, engine, value, size, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, engine, value, len(value), time.time()),
+            )
+            self._approx_size += len(value)
+            if self._approx_size > self.max_bytes:
+                self._evict(conn)
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        # Other processes may share the file, so trim against the real total.
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        target = self.max_bytes * 0.9
+        while total > target:
+            rows = conn.execute(
+                "SELECT key, size FROM results ORDER BY accessed_at LIMIT 64"
+            ).fetchall()
+            if not rows:
+                break
+            victims = []
+            for key, size in rows:
+                victims.append((key,))
+                total -= size
+                if total <= target:
+                    break
+            conn.executemany("DELETE FROM results WHERE key = ?", victims)
+        self._approx_size = total
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class ResultCache:
+    """Two-tier result cache; values are opaque bytes."""
+
+    def __init__(
+        self, memory_entries: int, memory_max_value_bytes: int, disk: _DiskTier | None
+    ) -> None:
+        self._memory: TTLCache[str, bytes] = TTLCache(memory_entries, math.inf)
+        self._memory_max_value_bytes = memory_max_value_bytes
+        self._disk = disk
+        self._inflight: dict[str, asyncio.Future[bytes]] = {}
+
+    def _remember(self, digest: str, value: bytes) -> None:
+        # Without a disk tier memory is the only copy, so nothing is too big for it.
+        if self._disk is None or len(value) <= self._memory_max_value_bytes:
+            self._memory.set(digest, value)
+
+    async def lookup(self, digest: str) -> bytes | None:
+        """Fetch a result by ``ResultKey.digest``, without touching hit counters."""
+        value = self._memory.get(digest)
+        if value is None and self._disk is not None:
+            value = await asyncio.to_thread(self._disk.get, digest)
+            if value is not None:
+                self._remember(digest, value)
+        return value
+
+    async def get(self, key: ResultKey) -> bytes | None:
+        digest = key.digest
+        value = self._memory.get(digest)
+        if value is not None:
+            cache_stats.record(key.engine, "memory_hits")
+            return value
+        if self._disk is not None:
+            value = await asyncio.to_thread(self._disk.get, digest)
+            if value is not None:
+                self._remember(digest, value)
+                cache_stats.record(key.engine, "disk_hits")
+                return value
+        cache_stats.record(key.engine, "misses")
+        return None
+
+    async def put(self, key: ResultKey, value: bytes) -> None:
+        digest = key.digest
+        self._remember(digest, value)
+        if self._disk is not None:
+            await asyncio.to_thread(self._disk.put, digest, key.engine, value)
+
+    async def get_or_compute(
+        self, key: ResultKey, compute: Callable[[], Awaitable[bytes]]
+    ) -> bytes:
+        """Cached value for ``key``, computing (once, however many callers wait) on a miss."""
+        value = await self.get(key)
+        if value is not None:
+            return value
+        digest = key.digest
+        task = self._inflight.get(digest)
+        if task is None:
+
+            async def _compute_and_store() -> bytes:
+                result = await compute()
+                await self.put(key, result)
+                return result
+
+            task = asyncio.ensure_future(_compute_and_store())
+            self._inflight[digest] = task
+            task.add_done_callback(lambda _: self._inflight.pop(digest, None))
+        # A cancelled caller must not cancel the computation others are waiting on.
+        return await asyncio.shield(task)
+
+    async def get_or_compute_json(
+        self, key: ResultKey, compute: Callable[[], Awaitable[dict[str, Any]]]
+    ) -> dict[str, Any]:
+        async def _encoded() -> bytes:
+            return json.dumps(await compute(), ensure_ascii=False).encode()
+
+        return json.loads(await self.get_or_compute(key, _encoded))
+
+    def close(self) -> None:
+        self._memory.clear()
+        if self._disk is not None:
+            self._disk.close()
+
+
+_caches: dict[tuple, ResultCache] = {}
+
+
+def get_result_cache() -> ResultCache:
+    """The cache configured by ``RESULT_CACHE_*`` (one instance per setting)."""
+    path = settings.RESULT_CACHE_PATH
+    if path is None:
+        path = str(Path(settings.UPLOAD_DIR) / "results.db")
+    config = (
+        path,
+        settings.RESULT_CACHE_MAX_BYTES,
+        settings.RESULT_CACHE_MEMORY_ENTRIES,
+        settings.RESULT_CACHE_MEMORY_MAX_VALUE_BYTES,
+    )
+    cache = _caches.get(config)
+    if cache is None:
+        disk = _DiskTier(Path(path), config[1]) if path and config[1] > 0 else None
+        cache = _caches[config] = ResultCache(config[2], config[3], disk)
+    return cache
+
+
+def close_result_caches() -> None:
+    """Close every cache's SQLite connection; the next use starts afresh."""
+    for cache in _caches.values():
+        cache.close()
+    _caches.clear()
@@ -1,7 +1,10 @@
 """JWT token utilities and password hashing."""
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Any, Callable, Optional, TypeVar
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
@@ -10,13 +13,98 @@ from passlib.context import CryptContext
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import TTLCache
 from app.core.config import settings
-from app.core.db import get_db
+from app.core.db import get_read_db
+from app.core.errors import AppException, ErrorCode
+from app.core.metrics import register_metrics
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 bearer_scheme = HTTPBearer()
 
 
+@dataclass(frozen=True)
+class AuthenticatedUser:
+    """Detached snapshot of the authenticated user, safe to share across requests."""
+
+    id: str
+    role: str
+    is_active: bool = True
+    phone: Optional[str] = None
+    email: Optional[str] = None
+
+
+user_cache: TTLCache[str, AuthenticatedUser] = TTLCache(
+    maxsize=settings.USER_CACHE_MAX_SIZE,
+    ttl=settings.USER_CACHE_TTL_SECONDS,
+)
+register_metrics("user_cache", user_cache.stats)
+
+
+def invalidate_cached_user(user_id: str) -> None:
+    """Drop a cached identity, e.g. after role or active state changes."""
+    user_cache.pop(user_id)
+
+
+T = TypeVar("T")
+
+
+class PasswordHashPool:
+    """Bounded thread pool for bcrypt work with admission control.
+
+    bcrypt releases the GIL, so hashing in threads keeps the event loop free.
+    Once ``max_pending`` calls are running or queued, new ones fail fast with
+    503 + Retry-After instead of piling up behind a login storm.
+    """
+
+    def __init__(self, workers: int, max_pending: int, retry_after: int) -> None:
+        self.workers = workers
+        self.max_pending = max_pending
+        self.retry_after = retry_after
+        self._executor: ThreadPoolExecutor | None = None
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise AppException(
+                code=ErrorCode.SERVICE_UNAVAILABLE,
+                message="Authentication service is busy, please retry shortly",
+                status_code=503,
+                headers={"Retry-After": str(self.retry_after)},
+            )
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="password-hash"
+            )
+        self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        finally:
+            self.pending -= 1
+            self.completed += 1
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "in_flight": min(self.pending, self.workers),
+            "queued": max(0, self.pending - self.workers),
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+
+password_hash_pool = PasswordHashPool(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    retry_after=settings.PASSWORD_HASH_RETRY_AFTER_SECONDS,
+)
+register_metrics("password_hash_pool", password_hash_pool.stats)
+
+
 def hash_password(password: str) -> str:
     """Hash a plaintext password."""
     return pwd_context.hash(password)
@@ -27,6 +115,16 @@ def verify_password(plain: str, hashed: str) -> bool:
     return pwd_context.verify(plain, hashed)
 
 
+async def hash_password_async(password: str) -> str:
+    """Hash a plaintext password on the bounded hashing pool."""
+    return await password_hash_pool.run(hash_password, password)
+
+
+async def verify_password_async(plain: str, hashed: str) -> bool:
+    """Verify a password on the bounded hashing pool."""
+    return await password_hash_pool.run(verify_password, plain, hashed)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token."""
     to_encode = data.copy()
@@ -57,31 +155,70 @@ def decode_token(token: str) -> dict:
         )
 
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
-    db: AsyncSession = Depends(get_db),
-):
-    """Dependency: extract and validate the current user from Bearer token."""
-    from app.modules.auth.models import User
-
+def _decode_access_token(credentials: HTTPAuthorizationCredentials) -> dict:
     payload = decode_token(credentials.credentials)
     if payload.get("type") != "access":
         raise HTTPException(status_code=401, detail="Invalid token type")
-
-    user_id = payload.get("sub")
-    if not user_id:
+    if not payload.get("sub"):
         raise HTTPException(status_code=401, detail="Invalid token payload")
+    return payload
+
+
+async def _load_user(db: AsyncSession, user_id: str) -> AuthenticatedUser:
+    """Resolve a user through the cache, falling back to the database."""
+    from app.modules.auth.models import User
 
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
-    if not user or not user.is_active:
+    cached = user_cache.get(user_id)
+    if cached is None:
+        result = await db.execute(select(User).where(User.id == user_id))
+        user = result.scalar_one_or_none()
+        if not user:
+            raise HTTPException(status_code=401, detail="User not found or inactive")
+        cached = AuthenticatedUser(
+            id=user.id,
+            role=user.role,
+            is_active=bool(user.is_active),
+            phone=user.phone,
+            email=user.email,
+        )
+        user_cache.set(user_id, cached)
+
+    if not cached.is_active:
         raise HTTPException(status_code=401, detail="User not found or inactive")
-    return user
+    return cached
+
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
+    db: AsyncSession = Depends(get_read_db),
+) -> AuthenticatedUser:
+    """Dependency: extract and validate the current user from Bearer token."""
+    payload = _decode_access_token(credentials)
+    return await _load_user(db, payload["sub"])
 
 
 def require_role(role: str):
-    """Dependency factory: ensure the current user has the specified role."""
-    async def _check(current_user=Depends(get_current_user)):
+    """Dependency factory: ensure the current user has the specified role.
+
+    With ``AUTH_TRUST_ROLE_CLAIM`` enabled, the signed role claim is used
+    directly unless the cache already holds fresher state for the user.
+    """
+    async def _check(
+        credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
+        db: AsyncSession = Depends(get_read_db),
+    ) -> AuthenticatedUser:
+        payload = _decode_access_token(credentials)
+        user_id = payload["sub"]
+        current_user = None
+        if settings.AUTH_TRUST_ROLE_CLAIM and payload.get("role"):
+            current_user = user_cache.get(user_id) or AuthenticatedUser(
+                id=user_id, role=payload["role"]
+            )
+            if not current_user.is_active:
+                raise HTTPException(status_code=401, detail="User not found or inactive")
+        if current_user is None:
+            current_user = await _load_user(db, user_id)
+
         if current_user.role != role:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -0,0 +1,52 @@
+"""HMAC signing for capability URLs (verifiable without a database).
+
+Keys come from ``MEDIA_URL_SIGNING_KEYS``; the first one signs and every one
+verifies, so a key is rotated by prepending its successor and dropping it once
+URLs it signed have expired. Each signature names its key by a short key id.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import hmac
+from functools import lru_cache
+
+from app.core.config import settings
+
+
+def _key_id(key: bytes) -> str:
+    return hashlib.sha256(key).hexdigest()[:8]
+
+
+@lru_cache(maxsize=8)
+def _keyring(keys: tuple[str, ...], fallback_secret: str) -> tuple[str, dict[str, bytes]]:
+    if keys:
+        raw = [key.encode() for key in keys]
+    else:
+        # No dedicated keys configured: derive one from the app secret.
+        raw = [hmac.new(fallback_secret.encode(), b"media-url-signing", hashlib.sha256).digest()]
+    return _key_id(raw[0]), {_key_id(key): key for key in raw}
+
+
+def _current_keyring() -> tuple[str, dict[str, bytes]]:
+    return _keyring(tuple(settings.MEDIA_URL_SIGNING_KEYS), settings.SECRET_KEY)
+
+
+def _digest(key: bytes, message: str) -> str:
+    mac = hmac.new(key, message.encode(), hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(mac).rstrip(b"=").decode()
+
+
+def sign(message: str) -> tuple[str, str]:
+    """Sign ``message`` with the active key; returns ``(key_id, signature)``."""
+    active, keys = _current_keyring()
+    return active, _digest(keys[active], message)
+
+
+def verify(message: str, key_id: str, signature: str) -> bool:
+    """Check ``signature`` against any configured key (constant time)."""
+    key = _current_keyring()[1].get(key_id)
+    if key is None:
+        return False
+    return hmac.compare_digest(_digest(key, message), signature)
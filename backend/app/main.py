@@ -1,13 +1,16 @@
 """SeeForMe / 为你所见 — FastAPI application entry point."""
 
+import asyncio
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import settings
 from app.core.db import init_db
 from app.core.exception_handlers import register_exception_handlers
+from app.core.metrics import collect_metrics, require_metrics_token
+from app.core.result_cache import close_result_caches
 
 # Import all routers
 from app.modules.auth.router import router as auth_router
@@ -21,13 +24,31 @@ from app.modules.moderation.router import router as moderation_router
 from app.modules.notifications.router import router as notifications_router
 from app.modules.ai_assist.router import router as ai_assist_router
 from app.modules.image_analysis.router import router as image_analysis_router
+from app.modules.ai_assist.jobs import worker_pool as transcription_workers
+from app.modules.image_analysis.batching import batcher as describe_batcher
+from app.modules.uploads import service as upload_service
+from app.modules.uploads.orphans import run_orphan_collector
+from app.modules.uploads.storage import run_cache_pruner
+from app.modules.uploads.variants import renderer as variant_renderer
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan: initialize DB on startup."""
     await init_db()
+    background = [
+        asyncio.create_task(upload_service.run_partial_upload_sweeper()),
+        asyncio.create_task(run_orphan_collector()),
+        asyncio.create_task(run_cache_pruner()),
+    ]
+    transcription_workers.start()
     yield
+    for task in background:
+        task.cancel()
+    await transcription_workers.stop()
+    variant_renderer.shutdown()
+    describe_batcher.shutdown()
+    close_result_caches()
 
 
 app = FastAPI(
@@ -64,3 +85,9 @@ app.include_router(image_analysis_router, prefix=settings.API_V1_PREFIX)
 async def root():
     """Health check endpoint."""
     return {"name": settings.APP_NAME, "version": settings.APP_VERSION, "status": "ok"}
+
+
+@app.get("/metrics", dependencies=[Depends(require_metrics_token)], include_in_schema=False)
+async def metrics():
+    """In-process counters (caches, pools, queues); requires ``METRICS_TOKEN``."""
+    return collect_metrics()
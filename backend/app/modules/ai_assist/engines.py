@@ -0,0 +1,149 @@
+"""Speech engines: speech-to-text and text-to-speech.
+
+``STT_ENGINE`` and ``TTS_ENGINE`` each select one: ``local`` is a
+deterministic stand-in that needs no model (development and tests); anything
+else is a ``package.module:Class`` path to an engine subclass wrapping a real
+service (Whisper or cloud ASR; Azure or Tencent TTS). Engines carry a
+``version`` that is part of every cached result's key, so bump it whenever the
+output for the same input changes.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import importlib
+import io
+import json
+import wave
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+from app.core.config import settings
+
+
+@dataclass
+class Transcript:
+    text: str
+    confidence: float | None = None
+
+
+@dataclass
+class SynthesizedSpeech:
+    audio: bytes
+    mime_type: str
+    duration_seconds: float
+
+    def to_bytes(self) -> bytes:
+        """Serialize as a one-line JSON header followed by the audio."""
+        header = json.dumps({"mime_type": self.mime_type, "duration_seconds": self.duration_seconds})
+        return header.encode() + b"\n" + self.audio
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "SynthesizedSpeech":
+        header, _, audio = data.partition(b"\n")
+        return cls(audio=audio, **json.loads(header))
+
+
+class SpeechToTextEngine(ABC):
+    """Transcribes audio files; implementations must be safe to call concurrently."""
+
+    name: str
+    version: str = "1"
+
+    @abstractmethod
+    async def transcribe(self, audio: Path, mime_type: str, language: str) -> Transcript:
+        """Transcribe ``audio``; raise to have the job retried."""
+
+
+def _hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(settings.UPLOAD_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class LocalSpeechToText(SpeechToTextEngine):
+    """Deterministic stand-in: the same audio always yields the same text."""
+
+    name = "local"
+
+    async def transcribe(self, audio: Path, mime_type: str, language: str) -> Transcript:
+        digest = await asyncio.to_thread(_hash_file, audio)
+        return Transcript(
+            text=f"[Local transcription {digest[:12]} ({language})]",
+            confidence=0.0,
+        )
+
+
+class TextToSpeechEngine(ABC):
+    """Synthesizes speech; implementations must be safe to call concurrently."""
+
+    name: str
+    version: str = "1"
+
+    @abstractmethod
+    async def synthesize(self, text: str, language: str, speed: float) -> SynthesizedSpeech:
+        """Synthesize ``text`` as one complete audio file.
+
+        Streamed replies are stitched from per-sentence results, so the output
+        should be WAV (PCM) or a frame-concatenable format (MP3, ADTS AAC).
+        """
+
+
+LOCAL_TTS_SAMPLE_RATE = 8000
+LOCAL_TTS_SECONDS_PER_CHAR = 0.15
+
+
+class LocalTextToSpeech(TextToSpeechEngine):
+    """Deterministic stand-in: silent 8 kHz mono WAV, 0.15 s per character.
+
+    ``TTS_LOCAL_LATENCY_*`` make it as slow as a real engine for benchmarks.
+    """
+
+    name = "local"
+
+    async def synthesize(self, text: str, language: str, speed: float) -> SynthesizedSpeech:
+        latency = (
+            settings.TTS_LOCAL_LATENCY_SECONDS
+            + len(text) * settings.TTS_LOCAL_LATENCY_PER_CHAR_SECONDS
+        )
+        if latency > 0:
+            await asyncio.sleep(latency)
+        duration = len(text) * LOCAL_TTS_SECONDS_PER_CHAR / speed
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(LOCAL_TTS_SAMPLE_RATE)
+            wav.writeframes(b"\x00\x00" * round(duration * LOCAL_TTS_SAMPLE_RATE))
+        return SynthesizedSpeech(buffer.getvalue(), "audio/wav", duration)
+
+
+_LOCAL_ENGINES = {"stt": LocalSpeechToText, "tts": LocalTextToSpeech}
+
+
+@lru_cache(maxsize=8)
+def _load_engine(kind: str, spec: str):
+    if spec == "local":
+        return _LOCAL_ENGINES[kind]()
+    module_name, _, class_name = spec.partition(":")
+    if not class_name:
+        raise RuntimeError(
+            f"{kind.upper()}_ENGINE must be 'local' or 'package.module:Class', got {spec!r}"
+        )
+    engine_class = getattr(importlib.import_module(module_name), class_name)
+    return engine_class()
+
+
+def get_stt_engine() -> SpeechToTextEngine:
+    """The engine selected by ``STT_ENGINE`` (one instance per setting)."""
+    return _load_engine("stt", settings.STT_ENGINE)
+
+
+def get_tts_engine() -> TextToSpeechEngine:
+    """The engine selected by ``TTS_ENGINE`` (one instance per setting)."""
+    return _load_engine("tts", settings.TTS_ENGINE)
@@ -0,0 +1,280 @@
+"""Durable speech-to-text jobs.
+
+Jobs are rows in ``transcription_jobs``, so they survive restarts. Workers
+claim the oldest eligible job with a single ``UPDATE ... RETURNING`` (atomic
+under SQLite's single writer), run the engine outside any transaction and
+write the result back. A claim is a lease: a job whose worker died is claimed
+again once ``run_after`` passes, until ``STT_MAX_ATTEMPTS`` leases have been
+spent; then it is failed. Enqueuing publishes an after-commit event so
+idle workers wake up immediately instead of waiting for the next poll.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.db import async_session
+from app.core.metrics import register_metrics
+from app.core.pubsub import broker, publish_after_commit
+from app.modules.ai_assist.engines import Transcript, get_stt_engine
+from app.modules.ai_assist.service import transcribe_upload
+from app.modules.ai_assist.models import TranscriptionJob
+from app.modules.help_requests.models import HelpRequest
+from app.modules.uploads import service as upload_service
+
+logger = logging.getLogger(__name__)
+
+JOBS_TOPIC = "ai_assist.transcription_jobs"
+
+
+class UnrecoverableJobError(Exception):
+    """The job can never succeed (e.g. its upload is gone); fail without retrying."""
+
+
+async def enqueue_transcriptions(
+    db: AsyncSession, user_id: str, file_ids: list[str], request_id: str | None = None
+) -> list[TranscriptionJob]:
+    """Queue one job per voice upload; workers see them once ``db`` commits."""
+    jobs = [
+        TranscriptionJob(file_id=file_id, user_id=user_id, request_id=request_id, position=index)
+        for index, file_id in enumerate(file_ids)
+    ]
+    if not jobs:
+        return jobs
+    db.add_all(jobs)
+    await db.flush()
+    publish_after_commit(db, JOBS_TOPIC, {"queued": len(jobs)})
+    return jobs
+
+
+async def get_job(db: AsyncSession, job_id: str) -> TranscriptionJob | None:
+    """Fetch a transcription job by ID."""
+    return await db.get(TranscriptionJob, job_id)
+
+
+async def list_request_jobs(db: AsyncSession, request_id: str) -> list[TranscriptionJob]:
+    """Jobs of a help request, in voice-attachment order."""
+    result = await db.execute(
+        select(TranscriptionJob)
+        .where(TranscriptionJob.request_id == request_id)
+        .order_by(TranscriptionJob.position)
+    )
+    return list(result.scalars().all())
+
+
+async def _fail_exhausted(db: AsyncSession, now: datetime) -> int:
+    """Fail jobs whose final attempt's lease expired without an outcome.
+
+    A job that kills its worker never reaches the retry accounting, so this
+    is what stops it from being claimed forever.
+    """
+    result = await db.execute(
+        update(TranscriptionJob)
+        .where(
+            TranscriptionJob.status == "running",
+            TranscriptionJob.run_after <= now,
+            TranscriptionJob.attempts >= settings.STT_MAX_ATTEMPTS,
+        )
+        .values(status="failed", error="Lease expired on the final attempt", finished_at=now)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+async def _claim_next(db: AsyncSession, now: datetime):
+    candidate = (
+        select(TranscriptionJob.id)
+        .where(
+            TranscriptionJob.status.in_(("queued", "running")),
+            TranscriptionJob.run_after <= now,
+            TranscriptionJob.attempts < settings.STT_MAX_ATTEMPTS,
+        )
+        .order_by(TranscriptionJob.run_after)
+        .limit(1)
+        .scalar_subquery()
+    )
+    result = await db.execute(
+        update(TranscriptionJob)
+        .where(TranscriptionJob.id == candidate)
+        .values(
+            status="running",
+            attempts=TranscriptionJob.attempts + 1,
+            run_after=now + timedelta(seconds=settings.STT_JOB_LEASE_SECONDS),
+        )
+        .returning(
+            TranscriptionJob.id,
+            TranscriptionJob.file_id,
+            TranscriptionJob.request_id,
+            TranscriptionJob.attempts,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    return result.one_or_none()
+
+
+async def _transcribe(session_factory: Callable[[], AsyncSession], file_id: str) -> Transcript:
+    async with session_factory() as db:
+        record = await upload_service.get_uploaded_file(db, file_id)
+    if record is None or record.category != "voice":
+        raise UnrecoverableJobError("Voice upload not found")
+    try:
+        return await transcribe_upload(record)
+    except FileNotFoundError:
+        raise UnrecoverableJobError("Voice content is not available") from None
+
+
+async def _update_request_text(db: AsyncSession, request_id: str, now: datetime) -> None:
+    """Rebuild ``transcribed_text`` from every finished job of the request."""
+    from app.modules.help_requests.service import publish_hall_event
+
+    texts = (
+        await db.execute(
+            select(TranscriptionJob.text)
+            .where(TranscriptionJob.request_id == request_id, TranscriptionJob.status == "succeeded")
+            .order_by(TranscriptionJob.position)
+        )
+    ).scalars().all()
+    mode = (
+        await db.execute(
+            update(HelpRequest)
+            .where(HelpRequest.id == request_id)
+            .values(transcribed_text="\n".join(t for t in texts if t), updated_at=now)
+            .returning(HelpRequest.mode)
+            .execution_options(synchronize_session=False)
+        )
+    ).scalar_one_or_none()
+    if mode == "hall":
+        publish_hall_event(db, "transcribed", request_id)
+
+
+class TranscriptionWorkerPool:
+    """In-process workers draining the job table, plus counters for `/metrics`."""
+
+    def __init__(self) -> None:
+        self._tasks: list[asyncio.Task] = []
+        self._wakeup = asyncio.Event()
+        self.succeeded = 0
+        self.retried = 0
+        self.failed = 0
+
+    async def process_next_job(
+        self, session_factory: Callable[[], AsyncSession] = async_session
+    ) -> bool:
+        """Claim and run one job; returns False when none is eligible."""
+        now = datetime.now(timezone.utc)
+        async with session_factory() as db:
+            self.failed += await _fail_exhausted(db, now)
+            claimed = await _claim_next(db, now)
+            await db.commit()
+        if claimed is None:
+            return False
+
+        values: dict = {}
+        try:
+            transcript = await _transcribe(session_factory, claimed.file_id)
+        except UnrecoverableJobError as e:
+            values.update(status="failed", error=str(e))
+        except Exception as e:
+            logger.warning("Transcription job %s failed", claimed.id, exc_info=True)
+            if claimed.attempts >= settings.STT_MAX_ATTEMPTS:
+                values.update(status="failed", error=str(e) or type(e).__name__)
+            else:
+                backoff = settings.STT_RETRY_BACKOFF_SECONDS * claimed.attempts
+                values.update(
+                    status="queued",
+                    error=str(e) or type(e).__name__,
+                    run_after=datetime.now(timezone.utc) + timedelta(seconds=backoff),
+                )
+        else:
+            values.update(
+                status="succeeded",
+                text=transcript.text,
+                confidence=transcript.confidence,
+                engine=get_stt_engine().name,
+                error=None,
+            )
+
+        finished = datetime.now(timezone.utc)
+        if values["status"] != "queued":
+            values["finished_at"] = finished
+        async with session_factory() as db:
+            # Only the worker holding the current lease may record the outcome.
+            result = await db.execute(
+                update(TranscriptionJob)
+                .where(
+                    TranscriptionJob.id == claimed.id,
+                    TranscriptionJob.status == "running",
+                    TranscriptionJob.attempts == claimed.attempts,
+                )
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount == 1 and values["status"] == "succeeded" and claimed.request_id:
+                await _update_request_text(db, claimed.request_id, finished)
+            await db.commit()
+
+        if values["status"] == "succeeded":
+            self.succeeded += 1
+        elif values["status"] == "queued":
+            self.retried += 1
+        else:
+            self.failed += 1
+        return True
+
+    async def _listen(self) -> None:
+        """Turn enqueue notifications into wake-ups for idle workers."""
+        while True:
+            subscription = broker.subscribe(JOBS_TOPIC)
+            try:
+                while not subscription.dropped:
+                    if await subscription.get(timeout=settings.STT_POLL_INTERVAL_SECONDS):
+                        self._wakeup.set()
+            finally:
+                subscription.close()
+
+    async def _work(self, session_factory: Callable[[], AsyncSession]) -> None:
+        while True:
+            try:
+                processed = await self.process_next_job(session_factory)
+            except Exception:
+                logger.warning("Transcription worker error", exc_info=True)
+                processed = False
+            if processed:
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), settings.STT_POLL_INTERVAL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    def start(self, session_factory: Callable[[], AsyncSession] = async_session) -> None:
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._listen())]
+        self._tasks += [
+            asyncio.create_task(self._work(session_factory)) for _ in range(settings.STT_WORKERS)
+        ]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "workers": max(0, len(self._tasks) - 1),
+            "succeeded": self.succeeded,
+            "retried": self.retried,
+            "failed": self.failed,
+        }
+
+
+worker_pool = TranscriptionWorkerPool()
+register_metrics("transcription_jobs", worker_pool.stats)
@@ -1 +1,43 @@
-"""AI Assist - no extra ORM models needed; uses UploadedFile."""
+"""AI Assist ORM models (durable speech-to-text job queue)."""
+
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import DateTime, Float, ForeignKey, Index, Integer, SmallInteger, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.db import Base
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class TranscriptionJob(Base):
+    """Transcription of one voice upload, optionally feeding a help request.
+
+    ``run_after`` is when a queued job becomes eligible and, while running,
+    when its lease expires; a worker that dies mid-job leaves it to be
+    claimed again after that.
+    """
+
+    __tablename__ = "transcription_jobs"
+    __table_args__ = (
+        Index("ix_transcription_jobs_claim", "status", "run_after"),
+        Index("ix_transcription_jobs_request", "request_id", "position"),
+    )
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    file_id: Mapped[str] = mapped_column(String(36), nullable=False)
+    user_id: Mapped[str] = mapped_column(String(36), ForeignKey("users.id"), nullable=False)
+    request_id: Mapped[str | None] = mapped_column(String(36), ForeignKey("help_requests.id"), nullable=True)
+    position: Mapped[int] = mapped_column(SmallInteger, nullable=False, default=0)  # voice order in the request
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default="queued")  # queued | running | succeeded | failed
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    run_after: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=_utcnow)
+    text: Mapped[str | None] = mapped_column(Text, nullable=True)
+    confidence: Mapped[float | None] = mapped_column(Float, nullable=True)
+    engine: Mapped[str | None] = mapped_column(String(50), nullable=True)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=_utcnow)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
@@ -1,12 +1,12 @@
 """AI Assist API routes."""
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.db import get_db
-from app.core.security import get_current_user
-from app.modules.auth.models import User
-from app.modules.ai_assist import schemas, service
+from app.core.db import get_db, get_read_db
+from app.core.security import AuthenticatedUser, get_current_user
+from app.modules.ai_assist import jobs, schemas, service, streaming
 
 router = APIRouter(prefix="/ai-assist", tags=["ai-assist"])
 
@@ -14,18 +14,18 @@ router = APIRouter(prefix="/ai-assist", tags=["ai-assist"])
 @router.post("/transcribe", response_model=schemas.TranscribeResponse)
 async def transcribe_voice(
     payload: schemas.TranscribeRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> schemas.TranscribeResponse:
     """Transcribe a voice file to text using AI."""
-    result = await service.transcribe_voice(payload.voice_file_id)
+    result = await service.transcribe_voice(db, payload.voice_file_id)
     return schemas.TranscribeResponse(**result)
 
 
 @router.post("/synthesize", response_model=schemas.SynthesizeResponse)
 async def synthesize_speech(
     payload: schemas.SynthesizeRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> schemas.SynthesizeResponse:
     """Convert text to speech audio using AI."""
@@ -33,3 +33,66 @@ async def synthesize_speech(
         payload.text, payload.language, payload.speed
     )
     return schemas.SynthesizeResponse(**result)
+
+
+@router.post("/synthesize/stream")
+async def synthesize_speech_stream(
+    payload: schemas.SynthesizeRequest,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+) -> StreamingResponse:
+    """Stream speech sentence by sentence; audio starts once the first is ready."""
+    try:
+        stream = await streaming.open_speech_stream(payload.text, payload.language, payload.speed)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return StreamingResponse(
+        stream.chunks,
+        media_type=stream.mime_type,
+        headers={"Cache-Control": "no-store", "X-Speech-Segments": str(stream.segments)},
+    )
+
+
+@router.get("/audio/{digest}")
+async def get_synthesized_audio(
+    digest: str,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+) -> Response:
+    """Audio returned by `/synthesize`; 404 once evicted (synthesize again)."""
+    speech = await service.get_synthesized_audio(digest)
+    if speech is None:
+        raise HTTPException(status_code=404, detail="Audio not found")
+    return Response(
+        content=speech.audio,
+        media_type=speech.mime_type,
+        headers={"Cache-Control": "private, max-age=86400, immutable", "ETag": f'"{digest}"'},
+    )
+
+
+@router.get("/jobs", response_model=schemas.TranscriptionJobListResponse)
+async def list_transcription_jobs(
+    request_id: str = Query(...),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+) -> schemas.TranscriptionJobListResponse:
+    """Transcription jobs queued for a help request's voice attachments."""
+    items = await jobs.list_request_jobs(db, request_id)
+    if current_user.role == "seeker":
+        items = [job for job in items if job.user_id == current_user.id]
+    return schemas.TranscriptionJobListResponse(
+        items=[schemas.TranscriptionJobResponse.model_validate(job) for job in items]
+    )
+
+
+@router.get("/jobs/{job_id}", response_model=schemas.TranscriptionJobResponse)
+async def get_transcription_job(
+    job_id: str,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+) -> schemas.TranscriptionJobResponse:
+    """Poll a background transcription. Seeker sees own, volunteer sees all."""
+    job = await jobs.get_job(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if current_user.role == "seeker" and job.user_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not your job")
+    return schemas.TranscriptionJobResponse.model_validate(job)
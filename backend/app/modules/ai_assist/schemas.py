@@ -1,5 +1,6 @@
 """AI Assist schemas."""
 
+from datetime import datetime
 from typing import Optional
 from pydantic import BaseModel
 
@@ -26,3 +27,25 @@ class SynthesizeResponse(BaseModel):
     """Text-to-speech synthesis result."""
     audio_url: str
     duration_seconds: Optional[float] = None
+
+
+class TranscriptionJobResponse(BaseModel):
+    """Status (and, once succeeded, result) of a background transcription."""
+    id: str
+    file_id: str
+    request_id: Optional[str] = None
+    status: str
+    attempts: int
+    text: Optional[str] = None
+    confidence: Optional[float] = None
+    engine: Optional[str] = None
+    error: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+
+    model_config = {"from_attributes": True}
+
+
+class TranscriptionJobListResponse(BaseModel):
+    """Transcription jobs of a help request, in voice-attachment order."""
+    items: list[TranscriptionJobResponse]
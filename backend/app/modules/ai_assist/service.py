@@ -1,27 +1,88 @@
-"""AI Assist business logic (pluggable transcription backend)."""
+"""AI Assist business logic (pluggable speech engines, results cached by content hash)."""
 
+from dataclasses import asdict
 
-async def transcribe_voice(voice_file_id: str) -> dict:
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.result_cache import ResultKey, content_sha256, get_result_cache
+from app.modules.ai_assist.engines import (
+    SynthesizedSpeech,
+    Transcript,
+    get_stt_engine,
+    get_tts_engine,
+)
+from app.modules.uploads.models import UploadedFile
+from app.modules.uploads.service import get_upload_content_path, get_uploaded_file
+
+
+async def transcribe_upload(record: UploadedFile, language: str | None = None) -> Transcript:
+    """Transcribe a stored voice upload; identical audio is transcribed once.
+
+    Raises FileNotFoundError when the upload has no retrievable content.
+    """
+    engine = get_stt_engine()
+    language = language or settings.STT_LANGUAGE
+
+    async def _run() -> dict:
+        path = await get_upload_content_path(record)
+        return asdict(await engine.transcribe(path, record.mime_type, language))
+
+    if not record.sha256:
+        return Transcript(**await _run())
+    key = ResultKey.build(record.sha256, f"stt:{engine.name}", engine.version, language)
+    return Transcript(**await get_result_cache().get_or_compute_json(key, _run))
+
+
+async def transcribe_voice(db: AsyncSession, voice_file_id: str) -> dict:
     """Transcribe a voice file to text.
 
-    This is a placeholder implementation. In production, this would call
-    a real speech-to-text service (e.g., Whisper, Tencent ASR, etc.).
+    IDs that do not name stored voice content get a placeholder result.
     """
-    # TODO: integrate real STT service
+    record = await get_uploaded_file(db, voice_file_id)
+    if record is not None and record.category == "voice":
+        try:
+            return asdict(await transcribe_upload(record))
+        except FileNotFoundError:
+            pass
     return {
         "text": f"[Transcription placeholder for file: {voice_file_id}]",
         "confidence": 0.0,
     }
 
 
-async def synthesize_speech(text: str, language: str, speed: float) -> dict:
-    """Convert text to speech audio.
+async def synthesize(text: str, language: str, speed: float) -> tuple[str, SynthesizedSpeech]:
+    """Synthesize ``text``, reusing earlier audio for the same phrase.
 
-    This is a placeholder implementation. In production, this would call
-    a real text-to-speech service (e.g., Azure TTS, Tencent TTS, etc.).
+    Returns the result's cache digest (which addresses the audio) and the speech.
     """
-    # TODO: integrate real TTS service
+    engine = get_tts_engine()
+    key = ResultKey.build(
+        content_sha256(text), f"tts:{engine.name}", engine.version, language, speed=speed
+    )
+
+    async def _run() -> bytes:
+        return (await engine.synthesize(text, language, speed)).to_bytes()
+
+    data = await get_result_cache().get_or_compute(key, _run)
+    return key.digest, SynthesizedSpeech.from_bytes(data)
+
+
+async def synthesize_speech(text: str, language: str, speed: float) -> dict:
+    """Convert text to speech audio."""
+    digest, speech = await synthesize(text, language, speed)
     return {
-        "audio_url": f"/audio/synthesized/{hash(text) & 0xFFFFFFFF}.mp3",
-        "duration_seconds": len(text) * 0.15 / speed,
+        "audio_url": f"/ai-assist/audio/{digest}",
+        "duration_seconds": speech.duration_seconds,
     }
+
+
+async def get_synthesized_audio(digest: str) -> SynthesizedSpeech | None:
+    """Audio behind an ``audio_url``; None once evicted from the cache."""
+    data = await get_result_cache().lookup(digest)
+    if data is None:
+        return None
+    try:
+        return SynthesizedSpeech.from_bytes(data)
+    except (ValueError, TypeError):
+        return None
@@ -0,0 +1,145 @@
+"""Streaming speech synthesis.
+
+Text is split at sentence boundaries and segments are synthesized through the
+result cache (so common sentences are reused across requests) by a bounded
+window of concurrent tasks. Audio is emitted in text order as soon as the
+segment at the head of the window is ready, so playback starts after the
+first sentence rather than the whole reply.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import struct
+import wave
+from collections import deque
+from dataclasses import dataclass
+from typing import AsyncIterator
+
+from app.core.config import settings
+from app.modules.ai_assist.engines import SynthesizedSpeech
+from app.modules.ai_assist.service import synthesize
+
+_SENTENCE_ENDS = set("。！？!?；;…\n")
+_CLOSERS = set("”’」』）)\"'")
+_SOFT_BREAKS = set("，,、：: ")
+_UNKNOWN_SIZE = 0xFFFFFFFF
+
+
+def _cut(piece: str, max_chars: int) -> list[str]:
+    """Split an over-long sentence at the last soft break (or hard) within ``max_chars``."""
+    parts = []
+    while len(piece) > max_chars:
+        window = piece[:max_chars]
+        cut = max((window.rfind(ch) for ch in _SOFT_BREAKS), default=-1)
+        cut = cut + 1 if cut > 0 else max_chars
+        parts.append(piece[:cut])
+        piece = piece[cut:]
+    return [*parts, piece]
+
+
+def split_sentences(text: str, max_chars: int) -> list[str]:
+    """Split ``text`` into sentences of at most ``max_chars``, keeping punctuation."""
+    sentences: list[str] = []
+    start = 0
+    length = len(text)
+    for i, ch in enumerate(text):
+        ends = (
+            ch in _SENTENCE_ENDS
+            or (ch == "." and (i + 1 == length or text[i + 1].isspace()))
+            or (ch in _CLOSERS and i > 0 and text[i - 1] in _SENTENCE_ENDS)
+        )
+        if not ends or (i + 1 < length and (text[i + 1] in _SENTENCE_ENDS or text[i + 1] in _CLOSERS)):
+            continue
+        sentences.append(text[start : i + 1])
+        start = i + 1
+    sentences.append(text[start:])
+    return [
+        part.strip()
+        for sentence in sentences
+        for part in _cut(sentence.strip(), max_chars)
+        if part.strip()
+    ]
+
+
+async def _synthesize_in_order(
+    segments: list[str], language: str, speed: float, concurrency: int
+) -> AsyncIterator[SynthesizedSpeech]:
+    pending = iter(segments)
+    window: deque[asyncio.Task] = deque()
+
+    def refill() -> None:
+        while len(window) < concurrency and (segment := next(pending, None)) is not None:
+            window.append(asyncio.create_task(synthesize(segment, language, speed)))
+
+    refill()
+    try:
+        while window:
+            _, speech = await window[0]
+            window.popleft()
+            refill()
+            yield speech
+    finally:
+        for task in window:
+            task.cancel()
+
+
+def _wav_pcm(data: bytes) -> tuple[tuple[int, int, int], bytes]:
+    with wave.open(io.BytesIO(data)) as wav:
+        params = (wav.getnchannels(), wav.getsampwidth(), wav.getframerate())
+        return params, wav.readframes(wav.getnframes())
+
+
+def _streaming_wav_header(channels: int, sample_width: int, rate: int) -> bytes:
+    """WAV header with unknown RIFF/data sizes, as players expect for live PCM."""
+    fmt = struct.pack(
+        "<HHIIHH", 1, channels, rate, rate * channels * sample_width, channels * sample_width, sample_width * 8
+    )
+    return (
+        b"RIFF" + struct.pack("<I", _UNKNOWN_SIZE) + b"WAVE"
+        + b"fmt " + struct.pack("<I", len(fmt)) + fmt
+        + b"data" + struct.pack("<I", _UNKNOWN_SIZE)
+    )
+
+
+@dataclass
+class SpeechStream:
+    mime_type: str
+    segments: int
+    chunks: AsyncIterator[bytes]
+
+
+async def open_speech_stream(text: str, language: str, speed: float) -> SpeechStream:
+    """Start synthesizing ``text``; returns once the first segment's audio is ready.
+
+    Raises ValueError when there is nothing to say.
+    """
+    segments = split_sentences(text, settings.TTS_SEGMENT_MAX_CHARS)
+    if not segments:
+        raise ValueError("Text is empty")
+    speeches = _synthesize_in_order(
+        segments, language, speed, max(1, settings.TTS_STREAM_CONCURRENCY)
+    )
+    try:
+        first = await speeches.__anext__()
+    except BaseException:
+        await speeches.aclose()
+        raise
+    is_wav = first.mime_type in ("audio/wav", "audio/x-wav")
+
+    async def chunks() -> AsyncIterator[bytes]:
+        try:
+            if is_wav:
+                params, pcm = _wav_pcm(first.audio)
+                yield _streaming_wav_header(*params) + pcm
+                async for speech in speeches:
+                    yield _wav_pcm(speech.audio)[1]
+            else:
+                yield first.audio
+                async for speech in speeches:
+                    yield speech.audio
+        finally:
+            await speeches.aclose()
+
+    return SpeechStream(first.mime_type, len(segments), chunks())
@@ -2,38 +2,56 @@
 
 from datetime import datetime, timezone
 
-from sqlalchemy import select
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.modules.assignments.models import Assignment
 from app.modules.help_requests.models import HelpRequest
+from app.modules.help_requests.service import publish_hall_event
+from app.modules.notifications.service import notify_claim
+
+
+class ClaimConflictError(ValueError):
+    """The request exists but is no longer claimable (someone else won)."""
 
 
 async def claim_request(
     db: AsyncSession, request_id: str, volunteer_id: str
 ) -> Assignment:
-    """Volunteer claims a help request."""
-    # Check request exists and is open
-    result = await db.execute(select(HelpRequest).where(HelpRequest.id == request_id))
-    req = result.scalar_one_or_none()
-    if not req:
-        raise ValueError("Request not found")
-    if req.status != "open":
-        raise ValueError(f"Cannot claim request with status: {req.status}")
-
-    # Check not already assigned
-    existing = await db.execute(
-        select(Assignment).where(Assignment.request_id == request_id)
+    """Volunteer claims a help request.
+
+    The open -> claimed transition is a single conditional UPDATE, so when
+    several volunteers race exactly one statement matches; the assignment
+    insert happens in the same transaction.
+    """
+    result = await db.execute(
+        update(HelpRequest)
+        .where(HelpRequest.id == request_id, HelpRequest.status == "open")
+        .values(status="claimed", updated_at=datetime.now(timezone.utc))
+        .returning(HelpRequest.seeker_id, HelpRequest.mode)
+        .execution_options(synchronize_session=False)
     )
-    if existing.scalar_one_or_none():
-        raise ValueError("Request already claimed")
+    claimed = result.one_or_none()
+    if claimed is None:
+        current_status = await db.scalar(
+            select(HelpRequest.status).where(HelpRequest.id == request_id)
+        )
+        if current_status is None:
+            raise ValueError("Request not found")
+        raise ClaimConflictError(f"Cannot claim request with status: {current_status}")
 
     assignment = Assignment(request_id=request_id, volunteer_id=volunteer_id)
     db.add(assignment)
-    req.status = "claimed"
-    req.updated_at = datetime.now(timezone.utc)
-    await db.flush()
+    try:
+        await db.flush()
+    except IntegrityError:
+        # A stale assignment row already exists for this request.
+        raise ClaimConflictError("Request already claimed")
 
+    await notify_claim(db, claimed.seeker_id, request_id)
+    if claimed.mode == "hall":
+        publish_hall_event(db, "claimed", request_id, status="claimed")
     return assignment
 
 
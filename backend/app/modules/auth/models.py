@@ -3,10 +3,11 @@
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import Boolean, DateTime, Numeric, SmallInteger, String, ForeignKey
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import Boolean, DateTime, Numeric, SmallInteger, String, ForeignKey, event, inspect
+from sqlalchemy.orm import Mapped, Session, mapped_column, relationship
 
 from app.core.db import Base
+from app.core.security import invalidate_cached_user
 
 
 def _utcnow() -> datetime:
@@ -27,6 +28,36 @@ class User(Base):
     settings: Mapped["UserSettings"] = relationship(back_populates="user", uselist=False)
 
 
+_IDENTITY_ATTRIBUTES = ("role", "is_active", "phone", "email")
+_INVALIDATED_USERS_KEY = "auth_invalidated_users"
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_identities(session: Session, flush_context) -> None:
+    """Note users whose cached identity a flush made stale (see `get_current_user`)."""
+    changed = [
+        user.id
+        for user in session.dirty
+        if isinstance(user, User)
+        and any(inspect(user).attrs[name].history.has_changes() for name in _IDENTITY_ATTRIBUTES)
+    ]
+    changed += [user.id for user in session.deleted if isinstance(user, User)]
+    if changed:
+        session.info.setdefault(_INVALIDATED_USERS_KEY, set()).update(changed)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_cached_identities(session: Session) -> None:
+    # Only once committed: evicting earlier lets a concurrent request re-cache the old row.
+    for user_id in session.info.pop(_INVALIDATED_USERS_KEY, ()):
+        invalidate_cached_user(user_id)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_changed_identities(session: Session, previous_transaction) -> None:
+    session.info.pop(_INVALIDATED_USERS_KEY, None)
+
+
 class UserSettings(Base):
     __tablename__ = "user_settings"
 
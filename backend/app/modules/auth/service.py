@@ -3,7 +3,12 @@
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.security import hash_password, verify_password, create_access_token, create_refresh_token
+from app.core.security import (
+    create_access_token,
+    create_refresh_token,
+    hash_password_async,
+    verify_password_async,
+)
 from app.modules.auth.models import User, UserSettings
 from app.modules.auth.schemas import RegisterRequest
 
@@ -24,7 +29,7 @@ async def register_user(db: AsyncSession, payload: RegisterRequest) -> User:
         role=payload.role,
         phone=payload.phone,
         email=payload.email,
-        password_hash=hash_password(payload.password),
+        password_hash=await hash_password_async(payload.password),
     )
     db.add(user)
     await db.flush()
@@ -43,7 +48,7 @@ async def authenticate_user(db: AsyncSession, account: str, password: str) -> Us
         select(User).where((User.phone == account) | (User.email == account))
     )
     user = result.scalar_one_or_none()
-    if user and verify_password(password, user.password_hash):
+    if user and await verify_password_async(password, user.password_hash):
         return user
     return None
 
@@ -4,8 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.db import get_db
-from app.core.security import require_role
-from app.modules.auth.models import User
+from app.core.security import AuthenticatedUser, require_role
 from app.modules.feedback import schemas, service
 
 router = APIRouter(prefix="/help-requests", tags=["feedback"])
@@ -19,7 +18,7 @@ router = APIRouter(prefix="/help-requests", tags=["feedback"])
 async def create_feedback(
     request_id: str,
     payload: schemas.FeedbackCreateRequest,
-    current_user: User = Depends(require_role("seeker")),
+    current_user: AuthenticatedUser = Depends(require_role("seeker")),
     db: AsyncSession = Depends(get_db),
 ) -> schemas.FeedbackResponse:
     """Submit feedback for a help request. Seeker only."""
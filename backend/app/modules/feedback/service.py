@@ -5,9 +5,11 @@ from datetime import datetime, timezone
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.modules.assignments.models import Assignment
 from app.modules.feedback.models import Feedback
 from app.modules.feedback.schemas import FeedbackCreateRequest
 from app.modules.help_requests.models import HelpRequest
+from app.modules.notifications.service import notify_feedback
 
 
 async def create_feedback(
@@ -44,4 +46,10 @@ async def create_feedback(
     req.updated_at = datetime.now(timezone.utc)
     await db.flush()
 
+    volunteer_id = await db.scalar(
+        select(Assignment.volunteer_id).where(Assignment.request_id == request_id)
+    )
+    if volunteer_id:
+        await notify_feedback(db, volunteer_id, feedback)
+
     return feedback, req
@@ -3,11 +3,12 @@
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import DateTime, ForeignKey, SmallInteger, String, Text
+from sqlalchemy import DateTime, ForeignKey, Index, SmallInteger, String, Text, inspect
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.db import Base
-from app.modules.uploads.service import build_content_url
+from app.modules.uploads.models import UploadedFile
+from app.modules.uploads.service import build_content_url, signed_content_url
 
 
 def _utcnow() -> datetime:
@@ -16,6 +17,17 @@ def _utcnow() -> datetime:
 
 class HelpRequest(Base):
     __tablename__ = "help_requests"
+    __table_args__ = (
+        # Hall listing: mode (+ optional status) filter, ordered by priority/created_at/id.
+        Index("ix_help_requests_hall_status", "mode", "status", "priority", "created_at", "id"),
+        Index("ix_help_requests_hall", "mode", "priority", "created_at", "id"),
+        # Seeker "mine" listing and notification joins.
+        Index("ix_help_requests_seeker", "seeker_id", "created_at", "id"),
+        # Direct-mode requests addressed to a volunteer.
+        Index("ix_help_requests_target_volunteer", "target_volunteer_id", "status"),
+        # Upload reference checks (deletion, orphan collection).
+        Index("ix_help_requests_voice_file", "voice_file_id"),
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     seeker_id: Mapped[str] = mapped_column(String(36), ForeignKey("users.id"), nullable=False)
@@ -35,6 +47,10 @@ class HelpRequest(Base):
 
 class RequestAttachment(Base):
     __tablename__ = "request_attachments"
+    __table_args__ = (
+        Index("ix_request_attachments_request", "request_id"),
+        Index("ix_request_attachments_file", "file_id"),
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     request_id: Mapped[str] = mapped_column(String(36), ForeignKey("help_requests.id"), nullable=False)
@@ -42,8 +58,21 @@ class RequestAttachment(Base):
     file_type: Mapped[str] = mapped_column(String(20), nullable=False)
 
     request: Mapped["HelpRequest"] = relationship(back_populates="attachments")
+    # Only loaded (eagerly) where signed URLs are handed out.
+    upload: Mapped[UploadedFile | None] = relationship(
+        primaryjoin="foreign(RequestAttachment.file_id) == UploadedFile.id",
+        viewonly=True,
+        lazy="raise",
+    )
 
     @property
     def file_url(self) -> str:
         """Public API path for fetching the attachment content."""
         return build_content_url(self.file_id)
+
+    @property
+    def signed_url(self) -> str | None:
+        """Expiring signed content URL, when the upload row was loaded with us."""
+        if "upload" in inspect(self).unloaded or self.upload is None:
+            return None
+        return signed_content_url(self.upload)
@@ -1,12 +1,18 @@
 """Help requests API routes."""
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+import json
+from typing import AsyncIterator, Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.db import get_db
-from app.core.security import get_current_user, require_role
-from app.modules.auth.models import User
+from app.core.config import settings
+from app.core.db import get_db, get_read_db
+from app.core.pubsub import Subscription, broker
+from app.core.security import AuthenticatedUser, get_current_user, require_role
 from app.modules.help_requests import schemas, service
+from app.modules.uploads.bundle import build_bundle, iter_zip
 
 router = APIRouter(prefix="/help-requests", tags=["help-requests"])
 
@@ -18,7 +24,7 @@ router = APIRouter(prefix="/help-requests", tags=["help-requests"])
 )
 async def create_help_request(
     payload: schemas.HelpRequestCreateRequest,
-    current_user: User = Depends(require_role("seeker")),
+    current_user: AuthenticatedUser = Depends(require_role("seeker")),
     db: AsyncSession = Depends(get_db),
 ) -> schemas.HelpRequestResponse:
     """Create a new help request. Requires seeker role."""
@@ -32,16 +38,79 @@ async def list_hall_requests(
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
     status_filter: str | None = Query(None, alias="status"),
-    current_user: User = Depends(require_role("volunteer")),
-    db: AsyncSession = Depends(get_db),
+    cursor: str | None = Query(None),
+    with_total: bool = Query(True),
+    current_user: AuthenticatedUser = Depends(require_role("volunteer")),
+    db: AsyncSession = Depends(get_read_db),
 ) -> schemas.HelpRequestListResponse:
-    """List help requests in the public hall. Requires volunteer role."""
-    items, total = await service.get_hall_requests(db, page, page_size, status_filter)
+    """List help requests in the public hall. Requires volunteer role.
+
+    Pass the returned ``next_cursor`` back as ``cursor`` to page by keyset;
+    ``with_total=false`` skips the COUNT query.
+    """
+    try:
+        items, total, next_cursor = await service.get_hall_requests(
+            db,
+            page,
+            page_size,
+            status_filter,
+            cursor=cursor,
+            with_total=with_total,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     return schemas.HelpRequestListResponse(
         items=[schemas.HelpRequestResponse.model_validate(r) for r in items],
         total=total,
         page=page,
         page_size=page_size,
+        next_cursor=next_cursor,
+    )
+
+
+async def _hall_event_stream(
+    request: Request, subscription: Subscription
+) -> AsyncIterator[str]:
+    """Render broker events as SSE frames, with heartbeats while idle."""
+    try:
+        yield "retry: 3000\n\n"
+        while True:
+            event = await subscription.get(timeout=settings.HALL_STREAM_HEARTBEAT_SECONDS)
+            if subscription.dropped:
+                # Fell too far behind: tell the client to refetch the hall.
+                yield "event: reset\ndata: {}\n\n"
+                return
+            if event is None:
+                if await request.is_disconnected():
+                    return
+                yield ": ping\n\n"
+                continue
+            yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+    finally:
+        subscription.close()
+
+
+@router.get("/hall/stream")
+async def stream_hall_events(
+    request: Request,
+    current_user: AuthenticatedUser = Depends(require_role("volunteer")),
+    db: AsyncSession = Depends(get_read_db),
+) -> StreamingResponse:
+    """Server-sent events for hall changes: created, claimed and cancelled.
+
+    Each connection has a bounded queue; a consumer that falls behind gets a
+    final ``reset`` event and should refetch ``/hall`` and reconnect.
+    """
+    # The auth lookup's session would otherwise pin a pooled connection for
+    # the whole lifetime of the stream.
+    await db.close()
+    subscription = broker.subscribe(
+        service.HALL_EVENTS_TOPIC, maxsize=settings.HALL_STREAM_QUEUE_SIZE
+    )
+    return StreamingResponse(
+        _hall_event_stream(request, subscription),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
 
@@ -50,30 +119,38 @@ async def list_my_requests(
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
     status_filter: str | None = Query(None, alias="status"),
-    current_user: User = Depends(require_role("seeker")),
-    db: AsyncSession = Depends(get_db),
+    cursor: str | None = Query(None),
+    with_total: bool = Query(True),
+    current_user: AuthenticatedUser = Depends(require_role("seeker")),
+    db: AsyncSession = Depends(get_read_db),
 ) -> schemas.HelpRequestListResponse:
     """List current seeker's own help requests."""
-    items, total = await service.get_seeker_requests(
-        db,
-        seeker_id=current_user.id,
-        page=page,
-        page_size=page_size,
-        status_filter=status_filter,
-    )
+    try:
+        items, total, next_cursor = await service.get_seeker_requests(
+            db,
+            seeker_id=current_user.id,
+            page=page,
+            page_size=page_size,
+            status_filter=status_filter,
+            cursor=cursor,
+            with_total=with_total,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     return schemas.HelpRequestListResponse(
         items=[schemas.HelpRequestResponse.model_validate(r) for r in items],
         total=total,
         page=page,
         page_size=page_size,
+        next_cursor=next_cursor,
     )
 
 
 @router.get("/{request_id}", response_model=schemas.HelpRequestResponse)
 async def get_help_request(
     request_id: str,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
 ) -> schemas.HelpRequestResponse:
     """Get help request details. Seeker sees own, volunteer sees all."""
     req = await service.get_request_by_id(db, request_id)
@@ -87,10 +164,42 @@ async def get_help_request(
     return schemas.HelpRequestResponse.model_validate(req)
 
 
+@router.get("/{request_id}/media-bundle")
+async def download_media_bundle(
+    request_id: str,
+    variant: Literal["original", "thumb"] = Query("original"),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+) -> StreamingResponse:
+    """Every attachment of a request as one zip, streamed while it is built.
+
+    ``variant=thumb`` swaps images for thumbnails and voice for the compact
+    AAC, for prefetching over slow links. ``manifest.json`` maps entries back
+    to attachments.
+    """
+    req = await service.get_request_by_id(db, request_id)
+    if not req:
+        raise HTTPException(status_code=404, detail="Request not found")
+    if current_user.role == "seeker" and req.seeker_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not your request")
+
+    entries = await build_bundle(
+        [(a.id, a.file_type, a.upload) for a in req.attachments], variant
+    )
+    return StreamingResponse(
+        iter_zip(entries),
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": f'attachment; filename="request-{req.id}-media.zip"',
+            "Cache-Control": "private, no-cache",
+        },
+    )
+
+
 @router.post("/{request_id}/cancel", response_model=schemas.HelpRequestResponse)
 async def cancel_help_request(
     request_id: str,
-    current_user: User = Depends(require_role("seeker")),
+    current_user: AuthenticatedUser = Depends(require_role("seeker")),
     db: AsyncSession = Depends(get_db),
 ) -> schemas.HelpRequestResponse:
     """Cancel a help request. Only the seeker who created it can cancel."""
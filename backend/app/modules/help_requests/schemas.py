@@ -37,6 +37,7 @@ class RequestAttachmentResponse(BaseModel):
     file_id: str
     file_type: str
     file_url: str
+    signed_url: Optional[str] = None
 
     model_config = {"from_attributes": True}
 
@@ -61,8 +62,13 @@ class HelpRequestResponse(BaseModel):
 
 
 class HelpRequestListResponse(BaseModel):
-    """Paginated list of help requests."""
+    """Paginated list of help requests.
+
+    ``next_cursor`` is an opaque keyset token for the following page (None on
+    the last page). ``total`` is None when the client opted out of counting.
+    """
     items: list[HelpRequestResponse]
-    total: int
+    total: Optional[int] = None
     page: int
     page_size: int
+    next_cursor: Optional[str] = None
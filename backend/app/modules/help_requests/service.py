@@ -1,15 +1,88 @@
 """Help request business logic."""
 
+import base64
+import json
 from datetime import datetime, timezone
 
-from sqlalchemy import select, func
+from sqlalchemy import func, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.core.pubsub import publish_after_commit
+from app.modules.ai_assist import jobs as transcription_jobs
 from app.modules.help_requests.models import HelpRequest, RequestAttachment
 from app.modules.help_requests.schemas import HelpRequestCreateRequest
+from app.modules.uploads.models import UploadedFile
 
 TEXT_ONLY_PLACEHOLDER_VOICE_FILE_ID = "text-only-placeholder"
+HALL_EVENTS_TOPIC = "help_requests.hall"
+
+
+def publish_hall_event(db: AsyncSession, event_type: str, request_id: str, **fields) -> None:
+    """Announce a hall change (created/claimed/transcribed/...) once ``db`` commits."""
+    publish_after_commit(
+        db,
+        HALL_EVENTS_TOPIC,
+        {"type": event_type, "request_id": request_id, **fields},
+    )
+
+
+# Attachments plus their upload rows, so responses can carry signed media URLs.
+_with_attachments = selectinload(HelpRequest.attachments).selectinload(RequestAttachment.upload)
+
+
+def encode_cursor(values: list) -> str:
+    """Encode keyset values into an opaque, URL-safe cursor string."""
+    raw = json.dumps(
+        [v.isoformat() if isinstance(v, datetime) else v for v in values],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, size: int) -> list:
+    """Decode an opaque cursor; raises ValueError when malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def _parse_cursor_datetime(value) -> datetime:
+    if not isinstance(value, str):
+        raise ValueError("Invalid cursor")
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError("Invalid cursor")
+
+
+def _hall_cursor_condition(cursor: str):
+    """Keyset predicate: rows strictly after (priority, created_at, id) in DESC order.
+
+    Expressed as a row-value comparison so the composite hall index can seek
+    straight to the cursor position.
+    """
+    priority, created_at, request_id = _decode_cursor(cursor, 3)
+    if not isinstance(priority, int) or not isinstance(request_id, str):
+        raise ValueError("Invalid cursor")
+    created_at = _parse_cursor_datetime(created_at)
+    return tuple_(HelpRequest.priority, HelpRequest.created_at, HelpRequest.id) < tuple_(
+        priority, created_at, request_id
+    )
+
+
+def _seeker_cursor_condition(cursor: str):
+    """Keyset predicate: rows strictly after (created_at, id) in DESC order."""
+    created_at, request_id = _decode_cursor(cursor, 2)
+    if not isinstance(request_id, str):
+        raise ValueError("Invalid cursor")
+    created_at = _parse_cursor_datetime(created_at)
+    return tuple_(HelpRequest.created_at, HelpRequest.id) < tuple_(created_at, request_id)
 
 
 def _dedupe_keep_order(values: list[str]) -> list[str]:
@@ -66,16 +139,56 @@ async def create_help_request(
 
     await db.flush()
 
+    # Transcribed in the background; results land in `transcribed_text`.
+    if voice_file_ids:
+        stored_voice = set(
+            (
+                await db.execute(
+                    select(UploadedFile.id).where(
+                        UploadedFile.id.in_(voice_file_ids[:3]),
+                        UploadedFile.category == "voice",
+                    )
+                )
+            ).scalars()
+        )
+        await transcription_jobs.enqueue_transcriptions(
+            db,
+            seeker_id,
+            [fid for fid in voice_file_ids[:3] if fid in stored_voice],
+            request_id=req.id,
+        )
+
+    if req.mode == "hall":
+        publish_hall_event(
+            db,
+            "created",
+            req.id,
+            status=req.status,
+            priority=req.priority,
+            created_at=req.created_at.isoformat(),
+        )
     return req
 
 
 async def get_hall_requests(
-    db: AsyncSession, page: int = 1, page_size: int = 20, status_filter: str | None = None
-) -> tuple[list[HelpRequest], int]:
-    """Get paginated help requests for the public hall."""
+    db: AsyncSession,
+    page: int = 1,
+    page_size: int = 20,
+    status_filter: str | None = None,
+    cursor: str | None = None,
+    with_total: bool = True,
+) -> tuple[list[HelpRequest], int | None, str | None]:
+    """Get help requests for the public hall.
+
+    Ordered by (priority, created_at, id) descending. When ``cursor`` is given
+    the page is fetched by keyset instead of OFFSET, so deep pages cost the
+    same as the first one and stay stable while new requests arrive.
+
+    Returns (items, total, next_cursor); total is None when ``with_total`` is off.
+    """
     query = (
         select(HelpRequest)
-        .options(selectinload(HelpRequest.attachments))
+        .options(_with_attachments)
         .where(HelpRequest.mode == "hall")
     )
     count_query = select(func.count()).select_from(HelpRequest).where(HelpRequest.mode == "hall")
@@ -84,16 +197,30 @@ async def get_hall_requests(
         query = query.where(HelpRequest.status == status_filter)
         count_query = count_query.where(HelpRequest.status == status_filter)
 
-    query = query.order_by(HelpRequest.priority.desc(), HelpRequest.created_at.desc())
-    query = query.offset((page - 1) * page_size).limit(page_size)
+    query = query.order_by(
+        HelpRequest.priority.desc(), HelpRequest.created_at.desc(), HelpRequest.id.desc()
+    )
+    if cursor:
+        query = query.where(_hall_cursor_condition(cursor))
+    else:
+        query = query.offset((page - 1) * page_size)
+    query = query.limit(page_size + 1)
 
     result = await db.execute(query)
     items = list(result.scalars().all())
 
-    count_result = await db.execute(count_query)
-    total = count_result.scalar() or 0
+    next_cursor = None
+    if len(items) > page_size:
+        items = items[:page_size]
+        last = items[-1]
+        next_cursor = encode_cursor([last.priority, last.created_at, last.id])
 
-    return items, total
+    total = None
+    if with_total:
+        count_result = await db.execute(count_query)
+        total = count_result.scalar() or 0
+
+    return items, total, next_cursor
 
 
 async def get_seeker_requests(
@@ -102,11 +229,17 @@ async def get_seeker_requests(
     page: int = 1,
     page_size: int = 20,
     status_filter: str | None = None,
-) -> tuple[list[HelpRequest], int]:
-    """Get paginated help requests created by a specific seeker."""
+    cursor: str | None = None,
+    with_total: bool = True,
+) -> tuple[list[HelpRequest], int | None, str | None]:
+    """Get help requests created by a specific seeker.
+
+    Ordered by (created_at, id) descending; supports the same cursor mode as
+    :func:`get_hall_requests`.
+    """
     query = (
         select(HelpRequest)
-        .options(selectinload(HelpRequest.attachments))
+        .options(_with_attachments)
         .where(HelpRequest.seeker_id == seeker_id)
     )
     count_query = (
@@ -119,23 +252,35 @@ async def get_seeker_requests(
         query = query.where(HelpRequest.status == status_filter)
         count_query = count_query.where(HelpRequest.status == status_filter)
 
-    query = query.order_by(HelpRequest.created_at.desc())
-    query = query.offset((page - 1) * page_size).limit(page_size)
+    query = query.order_by(HelpRequest.created_at.desc(), HelpRequest.id.desc())
+    if cursor:
+        query = query.where(_seeker_cursor_condition(cursor))
+    else:
+        query = query.offset((page - 1) * page_size)
+    query = query.limit(page_size + 1)
 
     result = await db.execute(query)
     items = list(result.scalars().all())
 
-    count_result = await db.execute(count_query)
-    total = count_result.scalar() or 0
+    next_cursor = None
+    if len(items) > page_size:
+        items = items[:page_size]
+        last = items[-1]
+        next_cursor = encode_cursor([last.created_at, last.id])
+
+    total = None
+    if with_total:
+        count_result = await db.execute(count_query)
+        total = count_result.scalar() or 0
 
-    return items, total
+    return items, total, next_cursor
 
 
 async def get_request_by_id(db: AsyncSession, request_id: str) -> HelpRequest | None:
     """Get a single help request by ID."""
     result = await db.execute(
         select(HelpRequest)
-        .options(selectinload(HelpRequest.attachments))
+        .options(_with_attachments)
         .where(HelpRequest.id == request_id)
     )
     return result.scalar_one_or_none()
@@ -148,4 +293,6 @@ async def cancel_request(db: AsyncSession, request: HelpRequest) -> HelpRequest:
     request.status = "cancelled"
     request.updated_at = datetime.now(timezone.utc)
     await db.flush()
+    if request.mode == "hall":
+        publish_hall_event(db, "cancelled", request.id, status=request.status)
     return request
@@ -0,0 +1,201 @@
+"""Micro-batching executor for image description.
+
+Vision models are far cheaper per image on batches. Describe calls queue
+here; a batch is dispatched to the worker process pool once it holds
+``IMAGE_DESCRIBE_BATCH_MAX_ITEMS`` images or its oldest image has waited
+``IMAGE_DESCRIBE_BATCH_WAIT_MS``. While every worker is busy the queue keeps
+filling, so batches grow with load. Results fan back out to the waiting
+coroutines; a caller that times out is dropped from its batch if the batch
+has not started yet. A worker that dies (a crashing model, an OOM kill)
+breaks the whole pool, so the pool is replaced before anything is retried.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+
+from app.core.config import settings
+from app.core.errors import AppException, ErrorCode
+from app.core.metrics import register_metrics
+from app.modules.image_analysis.engines import (
+    ImageDescription,
+    ImageInput,
+    describe_batch_in_worker,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Pending:
+    image: ImageInput
+    future: asyncio.Future
+    enqueued_at: float
+
+
+class DescribeBatcher:
+    """Batching front of the describe process pool, plus counters for `/metrics`."""
+
+    def __init__(self) -> None:
+        self._pool: ProcessPoolExecutor | None = None
+        self._queue: deque[_Pending] = deque()
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+        self.running = 0
+        self.batches = 0
+        self.items = 0
+        self.max_queue_depth = 0
+        self.timeouts = 0
+        self.rejected = 0
+        self.failed = 0
+        self.pool_restarts = 0
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=settings.IMAGE_DESCRIBE_WORKERS)
+        return self._pool
+
+    async def describe(self, image: ImageInput) -> ImageDescription:
+        """Describe one image as part of the next batch."""
+        if len(self._queue) >= settings.IMAGE_DESCRIBE_MAX_QUEUE:
+            self.rejected += 1
+            raise AppException(
+                code=ErrorCode.SERVICE_UNAVAILABLE,
+                message="Image description is busy, please retry shortly",
+                status_code=503,
+                headers={"Retry-After": "1"},
+            )
+        loop = asyncio.get_running_loop()
+        pending = _Pending(image, loop.create_future(), loop.time())
+        self._queue.append(pending)
+        self.max_queue_depth = max(self.max_queue_depth, len(self._queue))
+        self._schedule()
+        try:
+            # Cancels the future on timeout, which drops it from a batch not yet sent.
+            return await asyncio.wait_for(pending.future, settings.IMAGE_DESCRIBE_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise AppException(
+                code=ErrorCode.SERVICE_UNAVAILABLE,
+                message="Image description timed out, please retry",
+                status_code=503,
+                headers={"Retry-After": "1"},
+            ) from None
+
+    def _schedule(self) -> None:
+        """Dispatch if a batch is full or overdue, else arm a timer for the oldest item."""
+        if not self._queue or self.running >= settings.IMAGE_DESCRIBE_WORKERS:
+            return
+        loop = asyncio.get_running_loop()
+        wait = settings.IMAGE_DESCRIBE_BATCH_WAIT_MS / 1000
+        waited = loop.time() - self._queue[0].enqueued_at
+        if len(self._queue) >= settings.IMAGE_DESCRIBE_BATCH_MAX_ITEMS or waited >= wait:
+            self._dispatch()
+        elif self._timer is None:
+            self._timer = loop.call_later(wait - waited, self._dispatch)
+
+    def _dispatch(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._queue and self.running < settings.IMAGE_DESCRIBE_WORKERS:
+            batch: list[_Pending] = []
+            while self._queue and len(batch) < settings.IMAGE_DESCRIBE_BATCH_MAX_ITEMS:
+                pending = self._queue.popleft()
+                if not pending.future.done():
+                    batch.append(pending)
+            if batch:
+                self.running += 1
+                task = asyncio.create_task(self._run_batch(batch))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+
+    def _discard_pool(self, pool: ProcessPoolExecutor) -> None:
+        """Drop a broken pool; the next call starts a fresh one."""
+        if self._pool is pool:
+            self._pool = None
+            self.pool_restarts += 1
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    async def _call(self, images: list[ImageInput]) -> list[dict]:
+        loop = asyncio.get_running_loop()
+        pool = self._executor()
+        try:
+            return await loop.run_in_executor(
+                pool, describe_batch_in_worker, settings.IMAGE_DESCRIBE_ENGINE, images
+            )
+        except BrokenProcessPool:
+            self._discard_pool(pool)
+            raise
+
+    async def _run_batch(self, batch: list[_Pending]) -> None:
+        images = [pending.image for pending in batch]
+        self.batches += 1
+        self.items += len(batch)
+        outcomes: list[dict | Exception]
+        try:
+            try:
+                outcomes = list(await self._call(images))
+            except Exception:
+                if len(images) == 1:
+                    raise
+                # One image the engine chokes on must not fail its neighbours.
+                logger.warning("Describe batch of %d failed; retrying singly", len(images), exc_info=True)
+                outcomes = []
+                for image in images:
+                    try:
+                        outcomes.extend(await self._call([image]))
+                    except Exception as e:
+                        outcomes.append(e)
+        except Exception as e:
+            outcomes = [e]
+        finally:
+            self.running -= 1
+            self._schedule()
+
+        for pending, outcome in zip(batch, outcomes):
+            if pending.future.done():
+                continue
+            if isinstance(outcome, BrokenProcessPool):
+                outcome = AppException(
+                    code=ErrorCode.SERVICE_UNAVAILABLE,
+                    message="Image description failed",
+                    status_code=503,
+                )
+            if isinstance(outcome, Exception):
+                self.failed += 1
+                pending.future.set_exception(outcome)
+            else:
+                pending.future.set_result(ImageDescription(**outcome))
+
+    def shutdown(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def stats(self) -> dict[str, int | float]:
+        return {
+            "workers": settings.IMAGE_DESCRIBE_WORKERS if self._pool is not None else 0,
+            "queue_depth": sum(1 for pending in self._queue if not pending.future.done()),
+            "max_queue_depth": self.max_queue_depth,
+            "running_batches": self.running,
+            "batches": self.batches,
+            "items": self.items,
+            "mean_batch_size": self.items / self.batches if self.batches else 0.0,
+            "timeouts": self.timeouts,
+            "rejected": self.rejected,
+            "failed": self.failed,
+            "pool_restarts": self.pool_restarts,
+        }
+
+
+batcher = DescribeBatcher()
+register_metrics("image_describe", batcher.stats)
@@ -0,0 +1,123 @@
+"""Image description engines.
+
+``IMAGE_DESCRIBE_ENGINE`` selects one: ``local`` is a deterministic stand-in
+that needs no model (development and tests); anything else is a
+``package.module:Class`` path to an ``ImageDescriber`` subclass wrapping a
+vision model or service. ``version`` is part of every cached result's key.
+
+Engines describe batches and run in worker processes (see ``batching``), so
+a model is loaded once per worker, on first use, and never in the web process.
+"""
+
+from __future__ import annotations
+
+import importlib
+import time
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+
+from app.core.config import settings
+
+
+@dataclass
+class ImageInput:
+    path: str
+    mime_type: str
+    language: str
+
+
+@dataclass
+class ImageDescription:
+    description: str
+    is_clear: bool = True
+    clarity_note: str | None = None
+    confidence: float | None = None
+
+
+class ImageDescriber(ABC):
+    """Describes batches of images; one instance per worker process."""
+
+    name: str
+    version: str = "1"
+
+    @abstractmethod
+    def describe_batch(self, images: list[ImageInput]) -> list[ImageDescription]:
+        """Describe ``images`` in one pass, returning results in the same order."""
+
+
+def _image_size(path: str) -> tuple[int, int] | None:
+    from PIL import Image, UnidentifiedImageError
+
+    try:
+        from pillow_heif import register_heif_opener
+    except ImportError:
+        pass
+    else:
+        register_heif_opener()
+
+    try:
+        with Image.open(path) as image:
+            return image.size
+    except (UnidentifiedImageError, OSError):
+        return None
+
+
+class LocalImageDescriber(ImageDescriber):
+    """Deterministic stand-in: reports each image's dimensions.
+
+    ``IMAGE_DESCRIBE_LOCAL_*`` simulate a model's fixed per-batch and per-image
+    cost for benchmarks.
+    """
+
+    name = "local"
+
+    def describe_batch(self, images: list[ImageInput]) -> list[ImageDescription]:
+        cost = (
+            settings.IMAGE_DESCRIBE_LOCAL_BATCH_SECONDS
+            + len(images) * settings.IMAGE_DESCRIBE_LOCAL_ITEM_SECONDS
+        )
+        if cost > 0:
+            time.sleep(cost)
+        results = []
+        for image in images:
+            size = _image_size(image.path)
+            if size is None:
+                results.append(ImageDescription(
+                    description="",
+                    is_clear=False,
+                    clarity_note="The photo could not be read; please take it again.",
+                    confidence=0.0,
+                ))
+                continue
+            results.append(ImageDescription(
+                description=f"[Local description of a {size[0]}x{size[1]} image ({image.language})]",
+                confidence=0.0,
+            ))
+        return results
+
+
+@lru_cache(maxsize=4)
+def describer_class(spec: str) -> type[ImageDescriber]:
+    """Engine class for an ``IMAGE_DESCRIBE_ENGINE`` value (not instantiated)."""
+    if spec == "local":
+        return LocalImageDescriber
+    module_name, _, class_name = spec.partition(":")
+    if not class_name:
+        raise RuntimeError(
+            f"IMAGE_DESCRIBE_ENGINE must be 'local' or 'package.module:Class', got {spec!r}"
+        )
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+@lru_cache(maxsize=4)
+def _load_describer(spec: str) -> ImageDescriber:
+    return describer_class(spec)()
+
+
+def describe_batch_in_worker(spec: str, images: list[ImageInput]) -> list[dict]:
+    """Worker-process entry point: describe ``images`` with the engine ``spec`` names."""
+    results = _load_describer(spec).describe_batch(images)
+    if len(results) != len(images):
+        raise RuntimeError(f"{spec} returned {len(results)} results for {len(images)} images")
+    return [asdict(result) for result in results]
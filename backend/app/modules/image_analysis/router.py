@@ -1,11 +1,10 @@
 """Image analysis API routes."""
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.db import get_db
-from app.core.security import get_current_user
-from app.modules.auth.models import User
+from app.core.db import get_db, get_read_db
+from app.core.security import AuthenticatedUser, get_current_user
 from app.modules.image_analysis import schemas, service
 
 router = APIRouter(prefix="/image-analysis", tags=["image-analysis"])
@@ -14,9 +13,25 @@ router = APIRouter(prefix="/image-analysis", tags=["image-analysis"])
 @router.post("/describe", response_model=schemas.ImageDescribeResponse)
 async def describe_image(
     payload: schemas.ImageDescribeRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> schemas.ImageDescribeResponse:
     """Describe an image to help visually impaired users understand its content."""
-    result = await service.describe_image(payload.image_file_id, payload.language)
+    result = await service.describe_image(db, payload.image_file_id, payload.language)
     return schemas.ImageDescribeResponse(**result)
+
+
+@router.post("/clarity", response_model=schemas.ImageClarityResponse)
+async def check_image_clarity(
+    payload: schemas.ImageDescribeRequest,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+) -> schemas.ImageClarityResponse:
+    """Tell within milliseconds whether a photo is too dark, badly exposed or blurry."""
+    try:
+        result = await service.check_image_clarity(db, payload.image_file_id, payload.language)
+    except service.ImageNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return schemas.ImageClarityResponse(**result)
@@ -16,3 +16,15 @@ class ImageDescribeResponse(BaseModel):
     is_clear: bool
     clarity_note: Optional[str] = None
     confidence: Optional[float] = None
+
+
+class ImageClarityResponse(BaseModel):
+    """Result of the fast clarity pre-check."""
+    is_clear: bool
+    usable: bool
+    issue: Optional[str] = None  # dark | underexposed | overexposed | blurry
+    clarity_note: Optional[str] = None
+    blur_score: float
+    mean_luminance: float
+    dark_fraction: float
+    bright_fraction: float
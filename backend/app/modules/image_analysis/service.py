@@ -1,20 +1,117 @@
-"""Image analysis business logic."""
+"""Image analysis business logic (clarity pre-check, batched describer, cached results)."""
 
+import asyncio
+from dataclasses import asdict
+from pathlib import Path
 
-async def describe_image(image_file_id: str, language: str) -> dict:
-    """Describe image content for visually impaired users.
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.result_cache import ResultKey, get_result_cache
+from app.modules.image_analysis import clarity
+from app.modules.image_analysis.batching import batcher
+from app.modules.image_analysis.engines import ImageInput, describer_class
+from app.modules.uploads import variants
+from app.modules.uploads.models import UploadedFile
+from app.modules.uploads.service import get_upload_content_path, get_uploaded_file
+
+
+class ImageNotFoundError(ValueError):
+    """The ID does not name stored image content."""
+
+
+async def check_clarity(record: UploadedFile) -> clarity.ClarityReport | None:
+    """Clarity pre-check of a stored image; None if it cannot be decoded.
+
+    Uses the rendered ``thumb`` variant when there is one, which decodes
+    in a fraction of the time of a full-size photo. Raises FileNotFoundError
+    when the upload has no retrievable content.
+    """
+    source: Path | None = None
+    if record.sha256:
+        thumb = variants.variant_path(record.sha256, variants.variant_specs()["thumb"])
+        if thumb.is_file():
+            source = thumb
+    if source is None:
+        source = await get_upload_content_path(record)
+    return await asyncio.to_thread(clarity.assess_image, source)
+
+
+async def describe_upload(record: UploadedFile, language: str) -> dict:
+    """Describe a stored image; the same picture is described once per language.
+
+    Photos the clarity pre-check finds unusable are answered with retake
+    advice without running the describer. Raises FileNotFoundError when the
+    upload has no retrievable content.
+    """
+    describer = describer_class(settings.IMAGE_DESCRIBE_ENGINE)
+
+    async def _run() -> dict:
+        report = await check_clarity(record)
+        note = report.note(language) if report is not None else None
+        if report is not None and not report.usable:
+            return {"description": note, "is_clear": False, "clarity_note": note, "confidence": 0.0}
+        path = await get_upload_content_path(record)
+        result = asdict(await batcher.describe(ImageInput(str(path), record.mime_type, language)))
+        if note is not None and result["is_clear"]:
+            result.update(is_clear=False, clarity_note=note)
+        return result
+
+    if not record.sha256:
+        return await _run()
+    key = ResultKey.build(
+        record.sha256,
+        f"describe:{describer.name}",
+        describer.version,
+        language,
+        clarity=clarity.thresholds(),
+    )
+    return await get_result_cache().get_or_compute_json(key, _run)
 
-    This is a placeholder implementation. In production, this would call
-    a real vision AI service (e.g., GPT-4 Vision, Tencent Cloud OCR, etc.)
-    to generate a natural-language description of the image.
 
-    When the image is blurry or unclear, the service should indicate that
-    and provide the best possible description.
+async def describe_image(db: AsyncSession, image_file_id: str, language: str) -> dict:
+    """Describe image content for visually impaired users.
+
+    When the image is blurry or unclear, the result says so and gives the
+    best possible description. IDs that do not name stored image content get
+    a placeholder result.
     """
-    # TODO: integrate real vision AI service
+    record = await get_uploaded_file(db, image_file_id)
+    if record is not None and record.category == "image":
+        try:
+            return await describe_upload(record, language)
+        except FileNotFoundError:
+            pass
     return {
         "description": f"[Image description placeholder for file: {image_file_id}]",
         "is_clear": True,
         "clarity_note": None,
         "confidence": 0.0,
     }
+
+
+async def check_image_clarity(db: AsyncSession, image_file_id: str, language: str) -> dict:
+    """Instant clarity feedback for a stored image.
+
+    Raises ImageNotFoundError for unknown IDs and ValueError for content
+    that is not a decodable image.
+    """
+    record = await get_uploaded_file(db, image_file_id)
+    if record is None or record.category != "image":
+        raise ImageNotFoundError("Image not found")
+    try:
+        report = await check_clarity(record)
+    except FileNotFoundError:
+        raise ImageNotFoundError("Image not found") from None
+    if report is None:
+        raise ValueError("Image could not be decoded")
+    return {
+        "is_clear": report.is_clear,
+        "usable": report.usable,
+        "issue": report.issue,
+        "clarity_note": report.note(language),
+        "blur_score": report.blur_score,
+        "mean_luminance": report.mean_luminance,
+        "dark_fraction": report.dark_fraction,
+        "bright_fraction": report.bright_fraction,
+    }
@@ -1,3 +1,41 @@
-"""Notifications - placeholder module for future push/in-app notifications."""
+"""Notifications ORM models (persisted in-app inbox)."""
 
-# No ORM models needed for MVP placeholder
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.db import Base
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class Notification(Base):
+    __tablename__ = "notifications"
+    __table_args__ = (
+        Index("ix_notifications_user_created", "user_id", "created_at"),
+    )
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id: Mapped[str] = mapped_column(String(36), ForeignKey("users.id"), nullable=False)
+    type: Mapped[str] = mapped_column(String(20), nullable=False)  # reply | claim | feedback | system
+    sender: Mapped[str] = mapped_column(String(50), nullable=False)
+    title: Mapped[str] = mapped_column(String(100), nullable=False)
+    preview: Mapped[str] = mapped_column(Text, nullable=False)
+    tag: Mapped[str] = mapped_column(String(20), nullable=False)
+    request_id: Mapped[str | None] = mapped_column(String(36), nullable=True)
+    reply_id: Mapped[str | None] = mapped_column(String(36), nullable=True)
+    is_read: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=_utcnow)
+
+
+class NotificationCounter(Base):
+    """Per-user unread counter maintained alongside `notifications` writes."""
+
+    __tablename__ = "notification_counters"
+
+    user_id: Mapped[str] = mapped_column(String(36), ForeignKey("users.id"), primary_key=True)
+    unread_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
@@ -1,11 +1,10 @@
 """Notification API routes."""
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.db import get_db
-from app.core.security import get_current_user
-from app.modules.auth.models import User
+from app.core.db import get_db, get_read_db
+from app.core.security import AuthenticatedUser, get_current_user
 from app.modules.notifications import schemas
 from app.modules.notifications import service
 
@@ -15,9 +14,48 @@ router = APIRouter(prefix="/notifications", tags=["notifications"])
 @router.get("", response_model=schemas.NotificationListResponse)
 async def get_notifications(
     limit: int = Query(100, ge=1, le=200),
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    unread_only: bool = Query(False),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
 ) -> schemas.NotificationListResponse:
     """Get in-app notifications for current user."""
-    items = await service.list_notifications(db, current_user=current_user, limit=limit)
-    return schemas.NotificationListResponse(items=items)
+    items = await service.list_notifications(
+        db, user_id=current_user.id, limit=limit, unread_only=unread_only
+    )
+    return schemas.NotificationListResponse(
+        items=[schemas.NotificationItem.model_validate(n) for n in items]
+    )
+
+
+@router.get("/unread-count", response_model=schemas.UnreadCountResponse)
+async def get_unread_count(
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+) -> schemas.UnreadCountResponse:
+    """Get the number of unread notifications."""
+    unread = await service.get_unread_count(db, current_user.id)
+    return schemas.UnreadCountResponse(unread=unread)
+
+
+@router.post("/read-all", response_model=schemas.MarkReadResponse)
+async def mark_all_notifications_read(
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> schemas.MarkReadResponse:
+    """Mark every notification of the current user as read."""
+    updated = await service.mark_all_read(db, current_user.id)
+    return schemas.MarkReadResponse(updated=updated, unread=0)
+
+
+@router.post("/{notification_id}/read", response_model=schemas.MarkReadResponse)
+async def mark_notification_read(
+    notification_id: str,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> schemas.MarkReadResponse:
+    """Mark a single notification as read."""
+    found = await service.mark_read(db, current_user.id, notification_id)
+    if not found:
+        raise HTTPException(status_code=404, detail="Notification not found")
+    unread = await service.get_unread_count(db, current_user.id)
+    return schemas.MarkReadResponse(updated=1, unread=unread)
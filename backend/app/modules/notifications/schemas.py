@@ -10,17 +10,33 @@ class NotificationItem(BaseModel):
     """Single in-app notification item."""
 
     id: str
-    type: Literal["reply", "system"] = "reply"
+    type: Literal["reply", "claim", "feedback", "system"] = "reply"
     sender: str
     title: str
     preview: str
     tag: str
     request_id: str | None = None
     reply_id: str | None = None
+    is_read: bool = False
     created_at: datetime
 
+    model_config = {"from_attributes": True}
+
 
 class NotificationListResponse(BaseModel):
     """List of in-app notifications."""
 
     items: list[NotificationItem]
+
+
+class UnreadCountResponse(BaseModel):
+    """Unread notification counter."""
+
+    unread: int
+
+
+class MarkReadResponse(BaseModel):
+    """Result of marking notifications read."""
+
+    updated: int
+    unread: int
@@ -1,11 +1,18 @@
-"""Notification service."""
+"""Notification service.
 
-from sqlalchemy import select
+Notifications are fanned out on write: replying, claiming and giving
+feedback insert an inbox row for the recipient and bump their unread
+counter in the same transaction, so reading the inbox is an indexed range
+scan on (user_id, created_at).
+"""
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.modules.auth.models import User
-from app.modules.help_requests.models import HelpRequest
-from app.modules.notifications.schemas import NotificationItem
+from app.modules.feedback.models import Feedback
+from app.modules.notifications.models import Notification, NotificationCounter
 from app.modules.replies.models import Reply
 
 
@@ -17,42 +24,179 @@ def _build_reply_preview(reply: Reply) -> str:
     return "收到一条文本回复，点击查看详情。"
 
 
+def _build_feedback_preview(feedback: Feedback) -> str:
+    if feedback.comment and feedback.comment.strip():
+        return feedback.comment.strip()
+    if feedback.resolved:
+        return "求助者确认问题已解决，感谢你的帮助！"
+    return "求助者反馈问题未解决。"
+
+
+# Dialects with INSERT ... ON CONFLICT DO UPDATE.
+_UPSERT_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+
+async def _adjust_unread(db: AsyncSession, user_id: str, delta: int) -> None:
+    upsert = _UPSERT_INSERTS.get(db.bind.dialect.name)
+    if upsert is not None:
+        # One upsert statement: concurrent first notifications cannot both insert.
+        stmt = upsert(NotificationCounter).values(user_id=user_id, unread_count=max(delta, 0))
+        await db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[NotificationCounter.user_id],
+                set_={"unread_count": NotificationCounter.unread_count + delta},
+            )
+        )
+        return
+
+    bump = (
+        update(NotificationCounter)
+        .where(NotificationCounter.user_id == user_id)
+        .values(unread_count=NotificationCounter.unread_count + delta)
+    )
+    if (await db.execute(bump)).rowcount:
+        return
+    try:
+        async with db.begin_nested():
+            await db.execute(
+                insert(NotificationCounter).values(user_id=user_id, unread_count=max(delta, 0))
+            )
+    except IntegrityError:
+        # A concurrent transaction created the row first.
+        await db.execute(bump)
+
+
+async def create_notification(
+    db: AsyncSession,
+    *,
+    user_id: str,
+    type: str,
+    sender: str,
+    title: str,
+    preview: str,
+    tag: str,
+    request_id: str | None = None,
+    reply_id: str | None = None,
+) -> Notification:
+    """Insert an unread notification for ``user_id`` and bump their counter."""
+    notification = Notification(
+        user_id=user_id,
+        type=type,
+        sender=sender,
+        title=title,
+        preview=preview,
+        tag=tag,
+        request_id=request_id,
+        reply_id=reply_id,
+        is_read=False,
+    )
+    db.add(notification)
+    await _adjust_unread(db, user_id, 1)
+    return notification
+
+
+async def notify_reply(db: AsyncSession, seeker_id: str, reply: Reply) -> Notification:
+    """Tell the seeker their request received a reply."""
+    return await create_notification(
+        db,
+        user_id=seeker_id,
+        type="reply",
+        sender="志愿者",
+        title="你的求助收到新回复",
+        preview=_build_reply_preview(reply),
+        tag="语音" if reply.reply_type == "voice" else "回复",
+        request_id=reply.request_id,
+        reply_id=reply.id,
+    )
+
+
+async def notify_claim(db: AsyncSession, seeker_id: str, request_id: str) -> Notification:
+    """Tell the seeker a volunteer has claimed their request."""
+    return await create_notification(
+        db,
+        user_id=seeker_id,
+        type="claim",
+        sender="志愿者",
+        title="你的求助已被接单",
+        preview="志愿者已接单，请留意稍后的回复。",
+        tag="接单",
+        request_id=request_id,
+    )
+
+
+async def notify_feedback(db: AsyncSession, volunteer_id: str, feedback: Feedback) -> Notification:
+    """Tell the assigned volunteer how the seeker rated the help."""
+    return await create_notification(
+        db,
+        user_id=volunteer_id,
+        type="feedback",
+        sender="求助者",
+        title="求助者已确认解决" if feedback.resolved else "求助者反馈未解决",
+        preview=_build_feedback_preview(feedback),
+        tag="反馈",
+        request_id=feedback.request_id,
+    )
+
+
 async def list_notifications(
     db: AsyncSession,
-    current_user: User,
+    user_id: str,
     limit: int = 100,
-) -> list[NotificationItem]:
-    """List in-app notifications for current user.
+    unread_only: bool = False,
+) -> list[Notification]:
+    """List the newest notifications of a user."""
+    query = select(Notification).where(Notification.user_id == user_id)
+    if unread_only:
+        query = query.where(Notification.is_read.is_(False))
+    query = query.order_by(Notification.created_at.desc()).limit(limit)
+    result = await db.execute(query)
+    return list(result.scalars().all())
+
+
+async def get_unread_count(db: AsyncSession, user_id: str) -> int:
+    """Return the maintained unread counter (primary-key lookup)."""
+    count = await db.scalar(
+        select(NotificationCounter.unread_count).where(NotificationCounter.user_id == user_id)
+    )
+    return max(count or 0, 0)
 
-    Current behavior:
-    - seeker: return reply notifications from their own help requests.
-    - volunteer: return empty list (no volunteer message center feed yet).
-    """
-    if current_user.role != "seeker":
-        return []
 
+async def mark_read(db: AsyncSession, user_id: str, notification_id: str) -> bool:
+    """Mark one notification read. Returns False when it does not exist."""
     result = await db.execute(
-        select(Reply)
-        .join(HelpRequest, HelpRequest.id == Reply.request_id)
-        .where(HelpRequest.seeker_id == current_user.id)
-        .order_by(Reply.created_at.desc())
-        .limit(limit)
-    )
-
-    items: list[NotificationItem] = []
-    for reply in result.scalars().all():
-        items.append(
-            NotificationItem(
-                id=f"reply-{reply.id}",
-                type="reply",
-                sender="志愿者",
-                title="你的求助收到新回复",
-                preview=_build_reply_preview(reply),
-                tag="语音" if reply.reply_type == "voice" else "回复",
-                request_id=reply.request_id,
-                reply_id=reply.id,
-                created_at=reply.created_at,
-            )
+        update(Notification)
+        .where(
+            Notification.id == notification_id,
+            Notification.user_id == user_id,
+            Notification.is_read.is_(False),
         )
+        .values(is_read=True)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 1:
+        await _adjust_unread(db, user_id, -1)
+        return True
+
+    exists = await db.scalar(
+        select(Notification.id).where(
+            Notification.id == notification_id, Notification.user_id == user_id
+        )
+    )
+    return exists is not None
 
-    return items
+
+async def mark_all_read(db: AsyncSession, user_id: str) -> int:
+    """Mark every unread notification read; returns how many changed."""
+    result = await db.execute(
+        update(Notification)
+        .where(Notification.user_id == user_id, Notification.is_read.is_(False))
+        .values(is_read=True)
+        .execution_options(synchronize_session=False)
+    )
+    await db.execute(
+        update(NotificationCounter)
+        .where(NotificationCounter.user_id == user_id)
+        .values(unread_count=0)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
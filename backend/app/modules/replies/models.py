@@ -3,7 +3,7 @@
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import DateTime, ForeignKey, String, Text
+from sqlalchemy import DateTime, ForeignKey, Index, String, Text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.core.db import Base
@@ -15,6 +15,10 @@ def _utcnow() -> datetime:
 
 class Reply(Base):
     __tablename__ = "replies"
+    __table_args__ = (
+        Index("ix_replies_request_created", "request_id", "created_at"),
+        Index("ix_replies_voice_file", "voice_file_id"),
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     request_id: Mapped[str] = mapped_column(String(36), ForeignKey("help_requests.id"), nullable=False)
@@ -3,9 +3,8 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.db import get_db
-from app.core.security import get_current_user, require_role
-from app.modules.auth.models import User
+from app.core.db import get_db, get_read_db
+from app.core.security import AuthenticatedUser, get_current_user, require_role
 from app.modules.replies import schemas, service
 
 router = APIRouter(prefix="/help-requests", tags=["replies"])
@@ -19,7 +18,7 @@ router = APIRouter(prefix="/help-requests", tags=["replies"])
 async def create_reply(
     request_id: str,
     payload: schemas.ReplyCreateRequest,
-    current_user: User = Depends(require_role("volunteer")),
+    current_user: AuthenticatedUser = Depends(require_role("volunteer")),
     db: AsyncSession = Depends(get_db),
 ) -> schemas.ReplyResponse:
     """Create a reply to a help request. Volunteer must be assigned."""
@@ -34,8 +33,8 @@ async def create_reply(
 @router.get("/{request_id}/replies", response_model=schemas.ReplyListResponse)
 async def list_replies(
     request_id: str,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
 ) -> schemas.ReplyListResponse:
     """List all replies for a help request."""
     replies = await service.list_replies(db, request_id)
@@ -7,6 +7,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.modules.assignments.models import Assignment
 from app.modules.help_requests.models import HelpRequest
+from app.modules.notifications.service import notify_reply
 from app.modules.replies.models import Reply
 from app.modules.replies.schemas import ReplyCreateRequest
 
@@ -52,6 +53,7 @@ async def create_reply(
         req.updated_at = datetime.now(timezone.utc)
 
     await db.flush()
+    await notify_reply(db, req.seeker_id, reply)
     return reply
 
 
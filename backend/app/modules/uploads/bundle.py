@@ -0,0 +1,118 @@
+"""Zip bundles of stored content, streamed as they are written.
+
+Media is already compressed, so entries are stored rather than deflated.
+The archive goes to a non-seekable sink, which makes ``zipfile`` write each
+entry's sizes and CRC in a data descriptor after its bytes; only one chunk of
+one file is held in memory at a time.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import time
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from app.core.config import settings
+from app.modules.uploads import service, variants
+from app.modules.uploads.models import UploadedFile
+
+# Smallest useful rendition per category for ``variant=thumb`` bundles.
+THUMB_VARIANTS = {"image": "thumb", "voice": "compact"}
+
+
+@dataclass
+class BundleEntry:
+    name: str
+    content: Path | bytes
+
+
+class _ZipSink(io.RawIOBase):
+    """Write-only, non-seekable buffer drained after every write."""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def iter_zip(entries: Iterable[BundleEntry]) -> Iterator[bytes]:
+    """Yield a zip archive of ``entries``, reading files in ``UPLOAD_CHUNK_SIZE`` steps."""
+    sink = _ZipSink()
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_STORED) as archive:
+        for entry in entries:
+            if isinstance(entry.content, bytes):
+                archive.writestr(entry.name, entry.content)
+            else:
+                mtime = entry.content.stat().st_mtime
+                info = zipfile.ZipInfo(entry.name, date_time=time.localtime(mtime)[:6])
+                with archive.open(info, "w") as dest, open(entry.content, "rb") as src:
+                    while chunk := src.read(settings.UPLOAD_CHUNK_SIZE):
+                        dest.write(chunk)
+                        if data := sink.drain():
+                            yield data
+            if data := sink.drain():
+                yield data
+    yield sink.drain()
+
+
+async def _resolve(record: UploadedFile, variant: str) -> tuple[Path, str, str]:
+    """Local file, MIME type and extension of ``record`` in the requested rendition."""
+    path = await service.get_upload_content_path(record)
+    name = THUMB_VARIANTS.get(record.category) if variant == "thumb" else None
+    if name is not None and record.sha256:
+        variant_path = await variants.ensure_variant(
+            path, record.sha256, record.category, record.mime_type, name
+        )
+        if variant_path is not None:
+            spec = variants.variant_specs()[name]
+            return variant_path, spec.mime_type, f".{spec.extension}"
+    return path, record.mime_type, Path(record.filename or "").suffix
+
+
+async def build_bundle(
+    attachments: list[tuple[str, str, UploadedFile | None]], variant: str
+) -> list[BundleEntry]:
+    """Entries for a bundle of ``(attachment_id, file_type, upload)`` triples.
+
+    Every stored file is resolved (and, for thumbs, rendered) before
+    streaming starts. ``manifest.json`` comes first and maps entry names to
+    attachments; attachments without stored content are listed with a null
+    ``entry``.
+    """
+    entries: list[BundleEntry] = []
+    manifest = []
+    for index, (attachment_id, file_type, record) in enumerate(attachments):
+        item = {"attachment_id": attachment_id, "file_type": file_type, "entry": None}
+        if record is not None:
+            item["file_id"] = record.id
+            try:
+                path, mime_type, extension = await _resolve(record, variant)
+            except FileNotFoundError:
+                pass
+            else:
+                entry_name = f"{index + 1:02d}-{file_type}-{record.id}{extension}"
+                entries.append(BundleEntry(entry_name, path))
+                item.update(entry=entry_name, mime_type=mime_type, size=path.stat().st_size)
+        manifest.append(item)
+
+    payload = json.dumps({"variant": variant, "items": manifest}, ensure_ascii=False)
+    return [BundleEntry("manifest.json", payload.encode()), *entries]
@@ -1,9 +1,9 @@
-"""Uploads ORM model."""
+"""Uploads ORM models."""
 
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String
+from sqlalchemy import JSON, DateTime, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.core.db import Base
@@ -15,6 +15,8 @@ def _utcnow() -> datetime:
 
 class UploadedFile(Base):
     __tablename__ = "uploaded_files"
+    # Orphan collection walks records oldest first.
+    __table_args__ = (Index("ix_uploaded_files_created", "created_at", "id"),)
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id: Mapped[str] = mapped_column(String(36), ForeignKey("users.id"), nullable=False)
@@ -23,4 +25,19 @@ class UploadedFile(Base):
     size: Mapped[int] = mapped_column(Integer, nullable=False)
     category: Mapped[str] = mapped_column(String(20), nullable=False)  # image | voice | video
     storage_path: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    sha256: Mapped[str | None] = mapped_column(String(64), ForeignKey("upload_blobs.sha256"), nullable=True)
+    duration_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)  # voice only
+    waveform: Mapped[list[int] | None] = mapped_column(JSON, nullable=True)  # voice only, 0-100 peaks
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=_utcnow)
+
+
+class UploadBlob(Base):
+    """Content-addressed stored bytes shared by every upload with the same SHA-256."""
+
+    __tablename__ = "upload_blobs"
+
+    sha256: Mapped[str] = mapped_column(String(64), primary_key=True)
+    size: Mapped[int] = mapped_column(Integer, nullable=False)
+    storage_path: Mapped[str] = mapped_column(String(500), nullable=False)
+    ref_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=_utcnow)
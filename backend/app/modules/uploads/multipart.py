@@ -0,0 +1,112 @@
+"""Streaming read of one file field from a multipart request body.
+
+Declaring an ``UploadFile`` parameter makes FastAPI spool the whole body
+before the handler runs, i.e. before any size check. This reader is driven
+by the handler instead: it feeds the raw body through the multipart parser
+as it arrives, skips other fields, and yields the wanted field's bytes, so
+the upload limits apply while the request is still being received.
+"""
+
+from __future__ import annotations
+
+from typing import AsyncIterable, AsyncIterator
+
+from python_multipart.multipart import MultipartParser, parse_options_header
+
+
+class _FieldParser:
+    """Callback state for `MultipartParser`; collects the data of ``field``."""
+
+    def __init__(self, boundary: bytes, field: str) -> None:
+        self.field = field.encode()
+        self.found = False
+        self.finished = False
+        self.content_type: str | None = None
+        self.data: list[bytes] = []
+        self._in_field = False
+        self._headers: dict[bytes, bytes] = {}
+        self._header_name = b""
+        self._header_value = b""
+        self._parser = MultipartParser(
+            boundary,
+            callbacks={
+                "on_part_begin": self._on_part_begin,
+                "on_header_field": self._on_header_field,
+                "on_header_value": self._on_header_value,
+                "on_header_end": self._on_header_end,
+                "on_headers_finished": self._on_headers_finished,
+                "on_part_data": self._on_part_data,
+                "on_part_end": self._on_part_end,
+            },
+        )
+
+    def feed(self, chunk: bytes) -> None:
+        self._parser.write(chunk)
+
+    def _on_part_begin(self) -> None:
+        self._headers = {}
+
+    def _on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_name += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def _on_header_end(self) -> None:
+        self._headers[self._header_name.lower()] = self._header_value
+        self._header_name = self._header_value = b""
+
+    def _on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._headers.get(b"content-disposition", b""))
+        self._in_field = not self.found and options.get(b"name") == self.field
+        if self._in_field:
+            self.found = True
+            content_type = self._headers.get(b"content-type")
+            self.content_type = content_type.decode("latin-1") if content_type else None
+
+    def _on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._in_field:
+            self.data.append(data[start:end])
+
+    def _on_part_end(self) -> None:
+        if self._in_field:
+            self._in_field = False
+            self.finished = True
+
+
+async def open_multipart_field(
+    body: AsyncIterable[bytes], content_type: str, field: str
+) -> tuple[str | None, AsyncIterator[bytes]]:
+    """Find ``field`` in a multipart ``body``; return its content type and bytes.
+
+    Reads only up to the field's headers before returning. Raises ValueError
+    for a malformed body or one without the field.
+    """
+    _, options = parse_options_header(content_type)
+    boundary = options.get(b"boundary")
+    if not boundary:
+        raise ValueError("Multipart body has no boundary")
+    parser = _FieldParser(boundary, field)
+    source = aiter(body)
+
+    async for chunk in source:
+        parser.feed(chunk)
+        if parser.found:
+            break
+    if not parser.found:
+        raise ValueError(f"Multipart body has no '{field}' field")
+
+    async def _chunks() -> AsyncIterator[bytes]:
+        while True:
+            if parser.data:
+                data, parser.data = b"".join(parser.data), []
+                if data:
+                    yield data
+            if parser.finished:
+                return
+            chunk = await anext(source, None)
+            if chunk is None:
+                raise ValueError(f"Multipart body ended inside the '{field}' field")
+            parser.feed(chunk)
+
+    return parser.content_type, _chunks()
@@ -0,0 +1,236 @@
+"""Collection of orphaned uploads.
+
+Two kinds of upload records are never cleaned up by request flows: presigned
+records whose content never arrived, and stored uploads that no help request,
+attachment or reply references. Both are found oldest first with anti-joins
+against the (indexed) referencing columns and deleted in bounded batches. Each
+batch is one transaction; storage is touched only after it commits, so a
+failed batch never loses content a surviving record still points at, and a
+blob is only deleted if no upload has acquired its hash again meanwhile.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import and_, delete, exists, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.db import async_session
+from app.core.metrics import register_metrics
+from app.modules.help_requests.models import HelpRequest, RequestAttachment
+from app.modules.replies.models import Reply
+from app.modules.uploads.models import UploadBlob, UploadedFile
+from app.modules.uploads.service import delete_released_content, partial_upload_path
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CollectionResult:
+    records: int = 0
+    pending_records: int = 0
+    blobs: int = 0
+    bytes_reclaimed: int = 0
+    dry_run: bool = False
+
+
+class OrphanCollectorStats:
+    """Counters for `/metrics`; dry runs only count as runs."""
+
+    def __init__(self) -> None:
+        self.runs = 0
+        self.records_deleted = 0
+        self.blobs_deleted = 0
+        self.bytes_reclaimed = 0
+        self.failures = 0
+        self.last_run_at: datetime | None = None
+
+    def record(self, result: CollectionResult) -> None:
+        self.runs += 1
+        self.last_run_at = datetime.now(timezone.utc)
+        if not result.dry_run:
+            self.records_deleted += result.records
+            self.blobs_deleted += result.blobs
+            self.bytes_reclaimed += result.bytes_reclaimed
+
+    def stats(self) -> dict:
+        return {
+            "runs": self.runs,
+            "records_deleted": self.records_deleted,
+            "blobs_deleted": self.blobs_deleted,
+            "bytes_reclaimed": self.bytes_reclaimed,
+            "failures": self.failures,
+            "last_run_at": self.last_run_at.isoformat() if self.last_run_at else None,
+        }
+
+
+collector_stats = OrphanCollectorStats()
+register_metrics("upload_gc", collector_stats.stats)
+
+
+def _unreferenced():
+    return and_(
+        ~exists().where(RequestAttachment.file_id == UploadedFile.id),
+        ~exists().where(HelpRequest.voice_file_id == UploadedFile.id),
+        ~exists().where(Reply.voice_file_id == UploadedFile.id),
+    )
+
+
+def _is_orphan(pending_cutoff: datetime, unattached_cutoff: datetime):
+    return and_(
+        or_(
+            and_(UploadedFile.storage_path.is_(None), UploadedFile.created_at < pending_cutoff),
+            and_(UploadedFile.storage_path.is_not(None), UploadedFile.created_at < unattached_cutoff),
+        ),
+        _unreferenced(),
+    )
+
+
+async def _collect_batch(
+    db: AsyncSession,
+    ids: list[str],
+    pending_cutoff: datetime,
+    unattached_cutoff: datetime,
+    result: CollectionResult,
+) -> tuple[list[tuple[str, str | None]], list[str]]:
+    """Delete one batch of candidates.
+
+    Candidates are re-checked by the DELETE itself, so a record attached since
+    it was selected survives. Returns the ``(storage_path, sha256)`` of files
+    no record uses any more and the IDs of deleted records that never got
+    content.
+    """
+    rows = (
+        await db.execute(
+            delete(UploadedFile)
+            .where(UploadedFile.id.in_(ids), _is_orphan(pending_cutoff, unattached_cutoff))
+            .returning(
+                UploadedFile.id, UploadedFile.sha256, UploadedFile.storage_path, UploadedFile.size
+            )
+            .execution_options(synchronize_session=False)
+        )
+    ).all()
+
+    freed: list[tuple[str, str | None]] = []
+    blob_refs: Counter[str] = Counter()
+    for file_id, sha256, storage_path, size in rows:
+        result.records += 1
+        if storage_path is None:
+            result.pending_records += 1
+            try:
+                result.bytes_reclaimed += partial_upload_path(file_id).stat().st_size
+            except FileNotFoundError:
+                pass
+        elif sha256 is not None:
+            blob_refs[sha256] += 1
+        else:
+            # Predates the blob store: the file belongs to this record alone.
+            freed.append((storage_path, None))
+            result.bytes_reclaimed += size
+
+    for sha256, refs in blob_refs.items():
+        blob = (
+            await db.execute(
+                update(UploadBlob)
+                .where(UploadBlob.sha256 == sha256)
+                .values(ref_count=UploadBlob.ref_count - refs)
+                .returning(UploadBlob.ref_count, UploadBlob.storage_path, UploadBlob.size)
+                .execution_options(synchronize_session=False)
+            )
+        ).one_or_none()
+        if blob is None or blob.ref_count > 0:
+            continue
+        await db.execute(
+            delete(UploadBlob)
+            .where(UploadBlob.sha256 == sha256, UploadBlob.ref_count <= 0)
+            .execution_options(synchronize_session=False)
+        )
+        freed.append((blob.storage_path, sha256))
+        result.blobs += 1
+        result.bytes_reclaimed += blob.size
+
+    return freed, [file_id for file_id, _, storage_path, _ in rows if storage_path is None]
+
+
+async def collect_orphan_uploads(
+    db: AsyncSession,
+    *,
+    dry_run: bool | None = None,
+    now: datetime | None = None,
+) -> CollectionResult:
+    """Delete orphaned upload records and the stored files only they used.
+
+    Commits after every batch of ``UPLOAD_GC_BATCH_SIZE`` records. A dry run
+    performs the same deletes and rolls each batch back, so the counts are
+    exactly what a real run would reclaim.
+    """
+    dry_run = settings.UPLOAD_GC_DRY_RUN if dry_run is None else dry_run
+    now = now or datetime.now(timezone.utc)
+    pending_cutoff = now - timedelta(seconds=settings.UPLOAD_GC_PENDING_TTL_SECONDS)
+    unattached_cutoff = now - timedelta(seconds=settings.UPLOAD_GC_UNATTACHED_TTL_SECONDS)
+    result = CollectionResult(dry_run=dry_run)
+
+    after: tuple[datetime, str] | None = None
+    while True:
+        query = (
+            select(UploadedFile.id, UploadedFile.created_at)
+            .where(
+                UploadedFile.created_at < max(pending_cutoff, unattached_cutoff),
+                _is_orphan(pending_cutoff, unattached_cutoff),
+            )
+            .order_by(UploadedFile.created_at, UploadedFile.id)
+            .limit(settings.UPLOAD_GC_BATCH_SIZE)
+        )
+        if after is not None:
+            query = query.where(
+                or_(
+                    UploadedFile.created_at > after[0],
+                    and_(UploadedFile.created_at == after[0], UploadedFile.id > after[1]),
+                )
+            )
+        candidates = (await db.execute(query)).all()
+        if not candidates:
+            break
+        after = (candidates[-1].created_at, candidates[-1].id)
+
+        freed, pending_ids = await _collect_batch(
+            db, [c.id for c in candidates], pending_cutoff, unattached_cutoff, result
+        )
+        if dry_run:
+            await db.rollback()
+            continue
+        await db.commit()
+
+        for file_id in pending_ids:
+            partial_upload_path(file_id).unlink(missing_ok=True)
+        await delete_released_content(db, freed)
+
+    collector_stats.record(result)
+    return result
+
+
+async def run_orphan_collector() -> None:
+    """Periodically collect orphaned uploads (runs for the app's lifetime)."""
+    while True:
+        await asyncio.sleep(settings.UPLOAD_GC_INTERVAL_SECONDS)
+        try:
+            async with async_session() as db:
+                result = await collect_orphan_uploads(db)
+        except Exception:
+            collector_stats.failures += 1
+            logger.warning("Orphan upload collection failed", exc_info=True)
+            continue
+        if result.records:
+            logger.info(
+                "%s %d orphaned uploads (%d blobs, %d bytes)",
+                "Would collect" if result.dry_run else "Collected",
+                result.records,
+                result.blobs,
+                result.bytes_reclaimed,
+            )
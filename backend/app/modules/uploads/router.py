@@ -1,21 +1,42 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
-from fastapi.responses import FileResponse
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from typing import Literal
+from urllib.parse import quote
+
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+)
+from fastapi.responses import FileResponse, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.db import get_db
-from app.core.security import get_current_user
-from app.modules.auth.models import User
-from app.modules.uploads import schemas, service
+from app.core.config import settings
+from app.core.db import get_db, get_read_db
+from app.core.security import AuthenticatedUser, get_current_user
+from app.modules.uploads import schemas, service, variants
+from app.modules.uploads.multipart import open_multipart_field
+from app.modules.uploads.storage import get_storage, local_accel_uri
 
 router = APIRouter(prefix="/uploads", tags=["uploads"])
 
+# Slack for multipart boundaries and part headers when checking Content-Length.
+MULTIPART_OVERHEAD_BYTES = 16 * 1024
+
+# Content behind a file ID is write-once, so clients may keep it indefinitely.
+CONTENT_CACHE_CONTROL = "private, max-age=31536000, immutable"
+
 
 @router.post("/presign", response_model=schemas.PresignResponse)
 async def presign_upload(
     payload: schemas.PresignRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> schemas.PresignResponse:
     """Get a presigned upload URL for image, voice, or video files."""
@@ -29,74 +50,465 @@ async def presign_upload(
     return schemas.PresignResponse(**result)
 
 
+@router.post("/presign:batch", response_model=schemas.PresignBatchResponse)
+async def presign_upload_batch(
+    payload: schemas.PresignBatchRequest,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> schemas.PresignBatchResponse:
+    """Get presigned upload URLs for all attachments of a request in one call."""
+    try:
+        results = await service.presign_uploads(
+            db,
+            current_user.id,
+            [(item.filename, item.mime_type, item.size) for item in payload.items],
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return schemas.PresignBatchResponse(
+        items=[schemas.PresignResponse(**result) for result in results]
+    )
+
+
+def _ensure_category_matches(record, content_type: str | None) -> None:
+    """Enforce coarse category consistency while tolerating client MIME variations.
+
+    (e.g. iOS can send `audio/m4a`, `image/jpg`, or generic values).
+    """
+    if not content_type:
+        return
+    normalized = content_type.split(";")[0].strip().lower()
+    actual_category = service.classify_mime_type(normalized)
+    if actual_category is None:
+        if normalized.startswith("image/"):
+            actual_category = "image"
+        elif normalized.startswith("audio/"):
+            actual_category = "voice"
+        elif normalized.startswith("video/"):
+            actual_category = "video"
+    if actual_category and actual_category != record.category:
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                f"MIME type mismatch: expected {record.mime_type} "
+                f"({record.category}), got {content_type}"
+            ),
+        )
+
+
 @router.put("/{file_id}/content", response_model=schemas.UploadContentResponse)
 async def upload_file_content(
     file_id: str,
-    content: UploadFile = File(...),
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    background_tasks: BackgroundTasks,
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> schemas.UploadContentResponse:
-    """Upload actual file bytes for a presigned file ID."""
+    """Upload actual file bytes for a presigned file ID.
+
+    Accepts either a multipart form field ``content`` or the raw bytes as the
+    request body (``Content-Type`` set to the file's MIME type). Both are
+    parsed as they arrive: the body is streamed straight to disk and rejected
+    as soon as it exceeds the limit, and an oversized ``Content-Length`` is
+    refused before anything is read.
+    """
     record = await service.get_uploaded_file(db, file_id)
     if not record:
         raise HTTPException(status_code=404, detail="Upload record not found")
     if record.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Cannot upload content for this file")
+    if record.storage_path:
+        # Content is immutable once stored; GET responses are cached as such.
+        raise HTTPException(status_code=409, detail="Content already uploaded")
+
+    content_type = request.headers.get("content-type", "")
+    is_multipart = content_type.lower().startswith("multipart/form-data")
 
-    # Enforce coarse category consistency while tolerating client MIME variations
-    # (e.g. iOS can send `audio/m4a`, `image/jpg`, or generic values).
-    if content.content_type:
-        normalized = content.content_type.split(";")[0].strip().lower()
-        actual_category = service.classify_mime_type(normalized)
-        if actual_category is None:
-            if normalized.startswith("image/"):
-                actual_category = "image"
-            elif normalized.startswith("audio/"):
-                actual_category = "voice"
-            elif normalized.startswith("video/"):
-                actual_category = "video"
-        if actual_category and actual_category != record.category:
+    # Reject obviously oversized bodies before reading anything.
+    declared_length = request.headers.get("content-length")
+    if declared_length and declared_length.isdigit():
+        max_allowed = service._max_size(record.category)
+        overhead = MULTIPART_OVERHEAD_BYTES if is_multipart else 0
+        if int(declared_length) > max_allowed + overhead:
             raise HTTPException(
-                status_code=400,
-                detail=(
-                    f"MIME type mismatch: expected {record.mime_type} "
-                    f"({record.category}), got {content.content_type}"
-                ),
+                status_code=413,
+                detail=f"File too large for {record.category}: exceeds {max_allowed} bytes",
             )
 
+    if is_multipart:
+        try:
+            part_type, chunks = await open_multipart_field(request.stream(), content_type, "content")
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        _ensure_category_matches(record, part_type)
+    else:
+        _ensure_category_matches(record, content_type)
+        chunks = request.stream()
+
     try:
-        file_bytes = await content.read()
         result = await service.save_upload_content(
             db,
             record=record,
-            uploaded_filename=content.filename,
-            file_bytes=file_bytes,
+            chunks=chunks,
         )
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-    return schemas.UploadContentResponse(**result)
+    return await _after_content_stored(db, record, result, background_tasks)
 
 
-@router.get("/{file_id}/content")
-async def get_file_content(
+async def _get_own_pending_upload(db: AsyncSession, file_id: str, user: AuthenticatedUser):
+    record = await service.get_uploaded_file(db, file_id)
+    if not record:
+        raise HTTPException(status_code=404, detail="Upload record not found")
+    if record.user_id != user.id:
+        raise HTTPException(status_code=403, detail="Cannot upload content for this file")
+    return record
+
+
+def _offset_conflict(e: service.UploadOffsetMismatchError) -> HTTPException:
+    return HTTPException(
+        status_code=409, detail=str(e), headers={"Upload-Offset": str(e.offset)}
+    )
+
+
+@router.head("/{file_id}/chunks")
+async def get_upload_offset(
+    file_id: str,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+) -> Response:
+    """Report how many bytes of a resumable upload the server has committed."""
+    record = await _get_own_pending_upload(db, file_id, current_user)
+    return Response(
+        status_code=200,
+        headers={
+            "Upload-Offset": str(service.committed_offset(record)),
+            "Upload-Length": str(record.size),
+            "Cache-Control": "no-store",
+        },
+    )
+
+
+@router.put("/{file_id}/chunks/{offset}", response_model=schemas.ChunkUploadResponse)
+async def upload_chunk(
+    file_id: str,
+    offset: int,
+    request: Request,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+) -> schemas.ChunkUploadResponse:
+    """Append the raw request body at byte ``offset`` of a resumable upload.
+
+    Resend from the committed offset (``HEAD .../chunks``) after a failure;
+    chunks overlapping already committed bytes are accepted idempotently.
+    """
+    record = await _get_own_pending_upload(db, file_id, current_user)
+    if record.storage_path:
+        raise HTTPException(status_code=409, detail="Content already uploaded")
+    if offset < 0:
+        raise HTTPException(status_code=400, detail="Offset must not be negative")
+
+    try:
+        committed = await service.append_upload_chunk(record, offset, request.stream())
+    except service.UploadOffsetMismatchError as e:
+        raise _offset_conflict(e)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return schemas.ChunkUploadResponse(file_id=record.id, offset=committed, length=record.size)
+
+
+@router.post("/{file_id}/chunks/complete", response_model=schemas.UploadContentResponse)
+async def complete_chunked_upload(
+    file_id: str,
+    background_tasks: BackgroundTasks,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> schemas.UploadContentResponse:
+    """Finalize a resumable upload once every byte has been committed.
+
+    Repeating the call after success returns the stored content's metadata.
+    """
+    record = await _get_own_pending_upload(db, file_id, current_user)
+    if record.storage_path:
+        return schemas.UploadContentResponse(**service.content_response(record))
+
+    try:
+        result = await service.complete_resumable_upload(db, record)
+    except service.UploadOffsetMismatchError as e:
+        raise _offset_conflict(e)
+
+    return await _after_content_stored(db, record, result, background_tasks)
+
+
+async def _after_content_stored(
+    db: AsyncSession, record, result: dict, background_tasks: BackgroundTasks
+) -> schemas.UploadContentResponse:
+    """Queue variant rendering (voice transcode included) for freshly stored content.
+
+    Voice metadata is filled in at once only when the blob was already
+    transcoded for an earlier upload; otherwise `GET /uploads/{file_id}`
+    returns it once the background transcode is done.
+    """
+    if record.category not in ("image", "voice"):
+        return schemas.UploadContentResponse(**result)
+    await service.apply_voice_metadata(db, record)
+    background_tasks.add_task(
+        variants.generate_variants,
+        await service.get_upload_content_path(record),
+        record.sha256,
+        record.category,
+        record.mime_type,
+    )
+    return schemas.UploadContentResponse(
+        **{**result, "duration_ms": record.duration_ms, "waveform": record.waveform}
+    )
+
+
+@router.get("/{file_id}", response_model=schemas.UploadContentResponse)
+async def get_upload(
     file_id: str,
-    _current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
-) -> FileResponse:
-    """Read uploaded file content by file ID."""
+) -> schemas.UploadContentResponse:
+    """Metadata of an own upload; voice ``duration_ms``/``waveform`` appear once transcoded."""
     record = await service.get_uploaded_file(db, file_id)
     if not record:
         raise HTTPException(status_code=404, detail="Upload record not found")
+    if record.user_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Cannot read this file")
+    if not record.storage_path:
+        raise HTTPException(status_code=404, detail="Uploaded content is not available")
+    await service.apply_voice_metadata(db, record)
+    return schemas.UploadContentResponse(**service.content_response(record))
+
+
+@router.delete("/{file_id}", status_code=204)
+async def delete_upload(
+    file_id: str,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> Response:
+    """Delete an unattached upload; its blob is collected once unreferenced."""
+    record = await service.get_uploaded_file(db, file_id)
+    if not record:
+        raise HTTPException(status_code=404, detail="Upload record not found")
+    if record.user_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Cannot delete this file")
 
     try:
-        file_path = service.get_upload_content_path(record)
-    except FileNotFoundError:
-        raise HTTPException(status_code=404, detail="Uploaded content is not available")
+        await service.delete_upload(db, record)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return Response(status_code=204)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an ``If-None-Match`` header against ``etag``."""
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def _is_not_modified(request: Request, etag: str, mtime: float | None) -> bool:
+    """Evaluate conditional GET headers (``If-None-Match`` wins over dates)."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and mtime is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            return False
+        return int(mtime) <= since.timestamp()
+    return False
+
+
+VariantName = Literal["thumb", "display", "normalized", "compact"]
+
+
+def _ensure_variant_allowed(variant: str | None, category: str | None) -> None:
+    if variant is not None and variant not in variants.CATEGORY_VARIANTS.get(category, ()):
+        raise HTTPException(
+            status_code=400, detail=f"Variant '{variant}' is not available for {category}"
+        )
+
+
+def _send_file(
+    request: Request,
+    path: Path | None,
+    *,
+    accel_uri: str,
+    etag: str,
+    mime_type: str,
+    filename: str | None,
+    cache_control: str,
+) -> Response:
+    """Answer with the file itself, or hand it to the front proxy to send.
+
+    ``path`` is None when the file is not on local disk, which only the
+    ``x-accel-redirect`` mode can serve.
+    """
+    stat_result = path.stat() if path is not None else None
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if stat_result is not None:
+        headers["Last-Modified"] = formatdate(stat_result.st_mtime, usegmt=True)
+    if _is_not_modified(request, etag, stat_result.st_mtime if stat_result else None):
+        return Response(status_code=304, headers=headers)
+
+    mode = settings.STORAGE_SERVE_MODE
+    if mode in ("x-accel-redirect", "x-sendfile"):
+        if filename:
+            headers["Content-Disposition"] = f"attachment; filename*=utf-8''{quote(filename)}"
+        if mode == "x-accel-redirect":
+            headers["X-Accel-Redirect"] = accel_uri
+        else:
+            headers["X-Sendfile"] = str(path.resolve())
+        return Response(media_type=mime_type, headers=headers)
 
-    filename = record.filename or file_path.name
     return FileResponse(
-        path=file_path,
-        media_type=record.mime_type,
+        path=path,
+        media_type=mime_type,
         filename=filename,
+        headers=headers,
+        stat_result=stat_result,
+    )
+
+
+async def _serve_content(
+    request: Request,
+    storage_key: str,
+    *,
+    etag: str,
+    sha256: str | None,
+    category: str,
+    mime_type: str,
+    filename: str | None,
+    variant: str | None,
+    cache_control: str,
+) -> Response:
+    """Serve stored content (or one of its variants) with validators and ranges.
+
+    With ``STORAGE_SERVE_MODE=x-accel-redirect`` an original is never read by
+    the app, not even fetched from remote storage; the proxy streams it.
+    """
+    storage = get_storage()
+    try:
+        if variant is not None and sha256:
+            source = await storage.local_path(storage_key)
+            variant_path = await variants.ensure_variant(source, sha256, category, mime_type, variant)
+            if variant_path is not None:
+                spec = variants.variant_specs()[variant]
+                if filename:
+                    filename = f"{Path(filename).stem}-{variant}.{spec.extension}"
+                return _send_file(
+                    request,
+                    variant_path,
+                    accel_uri=local_accel_uri(variant_path),
+                    etag=f'"{sha256}-{variant}"',
+                    mime_type=spec.mime_type,
+                    filename=filename,
+                    cache_control=cache_control,
+                )
+
+        path = None
+        if settings.STORAGE_SERVE_MODE != "x-accel-redirect":
+            path = await storage.local_path(storage_key)
+        accel_uri = storage.accel_uri(storage_key)
+    except (FileNotFoundError, ValueError):
+        raise HTTPException(status_code=404, detail="Uploaded content is not available")
+
+    return _send_file(
+        request,
+        path,
+        accel_uri=accel_uri,
+        etag=etag,
+        mime_type=mime_type,
+        filename=filename,
+        cache_control=cache_control,
+    )
+
+
+@router.get("/media/{file_id}")
+async def get_signed_content(
+    file_id: str,
+    request: Request,
+    path: str = Query(...),
+    type: str = Query(...),
+    expires: int = Query(...),
+    kid: str = Query(...),
+    sig: str = Query(...),
+    variant: VariantName | None = Query(None),
+) -> Response:
+    """Serve content through a signed, expiring URL without auth or DB access.
+
+    The URL itself is the credential, so responses may be cached publicly
+    (e.g. by a reverse proxy) until the signature expires.
+    """
+    try:
+        storage_key = service.verify_signed_content(file_id, path, type, expires, kid, sig)
+    except service.InvalidSignedUrlError as e:
+        raise HTTPException(status_code=403, detail=str(e))
+
+    category = service.classify_mime_type(type)
+    _ensure_variant_allowed(variant, category)
+    sha256 = service.blob_sha256(path)
+    # Content behind a file ID is write-once, so the ID alone is a valid
+    # validator for files stored before blobs were content-addressed.
+    etag = f'"{sha256}"' if sha256 else f'"{file_id}"'
+    max_age = max(0, expires - int(time.time()))
+    return await _serve_content(
+        request,
+        storage_key,
+        etag=etag,
+        sha256=sha256,
+        category=category,
+        mime_type=type,
+        filename=None,
+        variant=variant,
+        cache_control=f"public, max-age={max_age}, immutable",
+    )
+
+
+@router.get("/{file_id}/content")
+async def get_file_content(
+    file_id: str,
+    request: Request,
+    variant: VariantName | None = Query(None),
+    _current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+) -> Response:
+    """Read uploaded file content by file ID.
+
+    Images can be fetched as a ``thumb`` or ``display`` sized WebP, or as a
+    ``normalized`` JPEG when the original is in a format like HEIC; voice as a
+    ``compact`` low-bitrate, silence-trimmed AAC. Stored
+    content never changes, so responses carry a strong ETag and
+    ``Cache-Control: immutable``; conditional requests get 304 and ``Range``
+    requests get 206.
+    """
+    record = await service.get_uploaded_file(db, file_id)
+    if not record:
+        raise HTTPException(status_code=404, detail="Upload record not found")
+    _ensure_variant_allowed(variant, record.category)
+    if not record.storage_path:
+        raise HTTPException(status_code=404, detail="Uploaded content is not available")
+
+    return await _serve_content(
+        request,
+        record.storage_path,
+        etag=service.content_etag(record),
+        sha256=record.sha256,
+        category=record.category,
+        mime_type=record.mime_type,
+        filename=record.filename or Path(record.storage_path).name,
+        variant=variant,
+        cache_control=CONTENT_CACHE_CONTROL,
     )
@@ -1,6 +1,8 @@
 """Upload schemas."""
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+from app.core.config import settings
 
 
 class PresignRequest(BaseModel):
@@ -14,9 +16,21 @@ class PresignResponse(BaseModel):
     """Presigned upload response."""
     file_id: str
     upload_url: str
+    chunks_url: str
+    chunk_size: int
     category: str
 
 
+class PresignBatchRequest(BaseModel):
+    """Request presigned upload URLs for several files at once."""
+    items: list[PresignRequest] = Field(min_length=1, max_length=settings.UPLOAD_PRESIGN_BATCH_MAX)
+
+
+class PresignBatchResponse(BaseModel):
+    """Presigned uploads, in the order they were requested."""
+    items: list[PresignResponse]
+
+
 class UploadContentResponse(BaseModel):
     """Uploaded file metadata after content is stored."""
 
@@ -25,3 +39,16 @@ class UploadContentResponse(BaseModel):
     category: str
     mime_type: str
     size: int
+    sha256: str | None = None
+    deduplicated: bool = False
+    duration_ms: int | None = None
+    waveform: list[int] | None = None
+    signed_url: str | None = None
+
+
+class ChunkUploadResponse(BaseModel):
+    """Committed offset after a resumable chunk was appended."""
+
+    file_id: str
+    offset: int
+    length: int
@@ -2,14 +2,32 @@
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import logging
+import math
+import time
+import uuid
+import weakref
 from pathlib import Path
+from typing import AsyncIterable
+from urllib.parse import urlencode
 
 import aiofiles
-from sqlalchemy import select
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core import url_signing
 from app.core.config import settings
-from app.modules.uploads.models import UploadedFile
+from app.modules.uploads.models import UploadBlob, UploadedFile
+from app.modules.uploads.storage import get_storage
+from app.modules.uploads.variants import cached_voice_metadata, remove_variants
+
+logger = logging.getLogger(__name__)
+
+BLOB_DIR = "blobs"
+TMP_DIR = "tmp"
 
 
 def classify_mime_type(mime_type: str) -> str | None:
@@ -41,31 +59,20 @@ def _max_size(category: str) -> int:
     return 0
 
 
-def _safe_filename(filename: str) -> str:
-    """Keep filename safe for filesystem usage."""
-    normalized = filename.replace("\\", "_").replace("/", "_").strip()
-    return normalized or "upload.bin"
-
-
 def build_content_url(file_id: str) -> str:
     """Build API endpoint URL for reading upload content."""
     return f"/uploads/{file_id}/content"
 
 
 def ensure_upload_dir() -> Path:
-    """Create upload directory if needed and return it as Path."""
+    """Create the local upload directory (staging area) and return it as Path."""
     upload_dir = Path(settings.UPLOAD_DIR)
     upload_dir.mkdir(parents=True, exist_ok=True)
     return upload_dir
 
 
-async def presign_upload(
-    db: AsyncSession, user_id: str, filename: str, mime_type: str, size: int
-) -> dict:
-    """Validate and create a presigned upload record.
-
-    Returns dict with file_id, upload_url, and category.
-    """
+def _validate_presign(mime_type: str, size: int) -> str:
+    """Return the category of an upload after checking type and size limits."""
     category = classify_mime_type(mime_type)
     if category is None:
         raise ValueError(f"Unsupported file type: {mime_type}")
@@ -75,7 +82,27 @@ async def presign_upload(
         raise ValueError(
             f"File too large for {category}: {size} bytes exceeds {max_allowed} bytes"
         )
+    return category
+
+
+def _presign_response(record: UploadedFile) -> dict:
+    return {
+        "file_id": record.id,
+        "upload_url": build_content_url(record.id),
+        "chunks_url": build_chunks_url(record.id),
+        "chunk_size": settings.UPLOAD_RESUMABLE_CHUNK_SIZE,
+        "category": record.category,
+    }
+
 
+async def presign_upload(
+    db: AsyncSession, user_id: str, filename: str, mime_type: str, size: int
+) -> dict:
+    """Validate and create a presigned upload record.
+
+    Returns dict with file_id, upload_url, and category.
+    """
+    category = _validate_presign(mime_type, size)
     record = UploadedFile(
         user_id=user_id,
         filename=filename,
@@ -85,12 +112,38 @@ async def presign_upload(
     )
     db.add(record)
     await db.flush()
+    return _presign_response(record)
 
-    return {
-        "file_id": record.id,
-        "upload_url": build_content_url(record.id),
-        "category": category,
-    }
+
+async def presign_uploads(
+    db: AsyncSession, user_id: str, items: list[tuple[str, str, int]]
+) -> list[dict]:
+    """Validate and create several presigned upload records at once.
+
+    ``items`` are ``(filename, mime_type, size)`` tuples. Every item is
+    validated before anything is written, so the batch succeeds or fails as a
+    whole; the records go out in one multi-row INSERT.
+    """
+    categories = []
+    for index, (_, mime_type, size) in enumerate(items):
+        try:
+            categories.append(_validate_presign(mime_type, size))
+        except ValueError as e:
+            raise ValueError(f"items[{index}]: {e}") from None
+
+    records = [
+        UploadedFile(
+            user_id=user_id,
+            filename=filename,
+            mime_type=mime_type,
+            size=size,
+            category=category,
+        )
+        for (filename, mime_type, size), category in zip(items, categories)
+    ]
+    db.add_all(records)
+    await db.flush()
+    return [_presign_response(record) for record in records]
 
 
 async def get_uploaded_file(db: AsyncSession, file_id: str) -> UploadedFile | None:
@@ -99,52 +152,427 @@ async def get_uploaded_file(db: AsyncSession, file_id: str) -> UploadedFile | No
     return result.scalar_one_or_none()
 
 
-def _resolve_storage_path(record: UploadedFile) -> Path:
-    """Resolve absolute file path from persisted metadata."""
-    if not record.storage_path:
-        raise FileNotFoundError("Uploaded content is not available")
-    return ensure_upload_dir() / record.storage_path
+def blob_relative_path(sha256: str) -> Path:
+    """Fan-out location of a blob: ``blobs/ab/cd/abcd...``."""
+    return Path(BLOB_DIR) / sha256[:2] / sha256[2:4] / sha256
+
+
+async def _acquire_blob(db: AsyncSession, sha256: str, size: int, tmp_path: Path) -> tuple[str, bool]:
+    """Take a reference on the blob for ``sha256``, storing ``tmp_path`` if new.
+
+    Returns the blob's storage path and whether the content already existed.
+    The row is written before the file is stored so that, with SQLite's single
+    writer, a concurrent release of the same blob cannot delete it under us.
+    A fresh row always stores its own copy: a file left at the path may be
+    one a committed release is about to delete.
+    """
+    result = await db.execute(
+        update(UploadBlob)
+        .where(UploadBlob.sha256 == sha256)
+        .values(ref_count=UploadBlob.ref_count + 1)
+        .returning(UploadBlob.storage_path)
+        .execution_options(synchronize_session=False)
+    )
+    storage_path = result.scalar_one_or_none()
+    storage = get_storage()
+    if storage_path is None:
+        storage_path = blob_relative_path(sha256).as_posix()
+        try:
+            async with db.begin_nested():
+                db.add(UploadBlob(sha256=sha256, size=size, storage_path=storage_path, ref_count=1))
+        except IntegrityError:
+            return await _acquire_blob(db, sha256, size, tmp_path)
+    elif await storage.exists(storage_path):
+        tmp_path.unlink(missing_ok=True)
+        return storage_path, True
+    await storage.put(storage_path, tmp_path)
+    return storage_path, False
+
+
+async def _release_blob(
+    db: AsyncSession, sha256: str, storage_path: str
+) -> tuple[str, str | None] | None:
+    """Drop a blob reference, deleting the blob row once unreferenced.
+
+    Returns the ``(storage_path, sha256)`` of content nothing uses any more,
+    or None while the blob is still referenced. Storage is not touched: the
+    caller deletes the content with `delete_released_content` after commit,
+    so a rolled-back release never loses bytes. A file with no blob row
+    predates the blob store and belongs to its upload record alone; it is
+    returned without a hash.
+    """
+    result = await db.execute(
+        update(UploadBlob)
+        .where(UploadBlob.sha256 == sha256, UploadBlob.storage_path == storage_path)
+        .values(ref_count=UploadBlob.ref_count - 1)
+        .returning(UploadBlob.ref_count)
+        .execution_options(synchronize_session=False)
+    )
+    ref_count = result.scalar_one_or_none()
+    if ref_count is None:
+        return storage_path, None
+    if ref_count > 0:
+        return None
+    await db.execute(
+        delete(UploadBlob)
+        .where(UploadBlob.sha256 == sha256, UploadBlob.ref_count <= 0)
+        .execution_options(synchronize_session=False)
+    )
+    return storage_path, sha256
+
+
+async def delete_released_content(db: AsyncSession, freed: list[tuple[str, str | None]]) -> None:
+    """Delete stored files (and blob variants) released by a committed transaction.
+
+    A blob may be acquired again between the release committing and its file
+    being deleted. Each blob is deleted inside a write transaction that first
+    checks its row has not come back; the write takes SQLite's single write
+    lock, so an acquire either committed before (row found, file kept) or runs
+    after and, finding no row, stores its own copy.
+    """
+    storage = get_storage()
+    for storage_path, sha256 in freed:
+        if sha256 is None:
+            await storage.delete(storage_path)
+            continue
+        reacquired = await db.execute(
+            update(UploadBlob)
+            .where(UploadBlob.sha256 == sha256)
+            .values(ref_count=UploadBlob.ref_count)
+            .returning(UploadBlob.sha256)
+            .execution_options(synchronize_session=False)
+        )
+        try:
+            if reacquired.first() is None:
+                await storage.delete(storage_path)
+                remove_variants(sha256)
+        finally:
+            await db.commit()
 
 
 async def save_upload_content(
     db: AsyncSession,
     *,
     record: UploadedFile,
-    uploaded_filename: str | None,
-    file_bytes: bytes,
+    chunks: AsyncIterable[bytes],
 ) -> dict:
-    """Persist upload bytes to local storage and return metadata response."""
-    max_allowed = _max_size(record.category)
-    actual_size = len(file_bytes)
-    if actual_size > max_allowed:
-        raise ValueError(
-            f"File too large for {record.category}: {actual_size} bytes exceeds {max_allowed} bytes"
-        )
-
-    safe_name = _safe_filename(uploaded_filename or record.filename)
-    relative_path = Path(record.user_id) / f"{record.id}-{safe_name}"
-    final_path = ensure_upload_dir() / relative_path
-    final_path.parent.mkdir(parents=True, exist_ok=True)
-
-    async with aiofiles.open(final_path, "wb") as f:
-        await f.write(file_bytes)
+    """Stream upload bytes into the blob store and return metadata response.
 
-    record.storage_path = relative_path.as_posix()
-    record.size = actual_size
+    Bytes go to a temp file while the size limit is enforced and a SHA-256 is
+    computed. The record then references the blob for that hash: new content
+    is renamed into place, content that is already stored is kept as is and
+    the temp file dropped.
+    """
+    max_allowed = _max_size(record.category)
+    tmp_dir = ensure_upload_dir() / TMP_DIR
+    tmp_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = tmp_dir / f"{record.id}-{uuid.uuid4().hex}.part"
+
+    digest = hashlib.sha256()
+    actual_size = 0
+    try:
+        async with aiofiles.open(tmp_path, "wb") as f:
+            async for chunk in chunks:
+                actual_size += len(chunk)
+                if actual_size > max_allowed:
+                    raise ValueError(
+                        f"File too large for {record.category}: more than {max_allowed} bytes"
+                    )
+                digest.update(chunk)
+                await f.write(chunk)
+        return await _attach_blob(db, record, digest.hexdigest(), actual_size, tmp_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+async def _attach_blob(
+    db: AsyncSession, record: UploadedFile, sha256: str, size: int, tmp_path: Path
+) -> dict:
+    """Point ``record`` at the blob holding ``tmp_path``'s bytes; return the response."""
+    storage_path, deduplicated = await _acquire_blob(db, sha256, size, tmp_path)
+    record.storage_path = storage_path
+    record.size = size
+    record.sha256 = sha256
     await db.flush()
+    return {**content_response(record), "deduplicated": deduplicated}
 
+
+def content_response(record: UploadedFile) -> dict:
+    """Metadata of stored content, shaped like ``UploadContentResponse``."""
     return {
         "file_id": record.id,
         "file_url": build_content_url(record.id),
         "category": record.category,
         "mime_type": record.mime_type,
         "size": record.size,
+        "sha256": record.sha256,
+        "duration_ms": record.duration_ms,
+        "waveform": record.waveform,
+        "signed_url": signed_content_url(record),
     }
 
 
-def get_upload_content_path(record: UploadedFile) -> Path:
-    """Return content path of an uploaded file and ensure it exists."""
-    path = _resolve_storage_path(record)
-    if not path.exists() or not path.is_file():
+class UploadOffsetMismatchError(ValueError):
+    """A chunk or completion does not line up with the committed offset."""
+
+    def __init__(self, message: str, offset: int) -> None:
+        super().__init__(message)
+        self.offset = offset
+
+
+_upload_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+
+def _upload_lock(file_id: str) -> asyncio.Lock:
+    """Serialize chunk appends and completion of one resumable upload."""
+    lock = _upload_locks.get(file_id)
+    if lock is None:
+        lock = asyncio.Lock()
+        _upload_locks[file_id] = lock
+    return lock
+
+
+def build_chunks_url(file_id: str) -> str:
+    """Build API endpoint URL for resumable (chunked) upload of content."""
+    return f"/uploads/{file_id}/chunks"
+
+
+def partial_upload_path(file_id: str) -> Path:
+    """Where the bytes of an unfinished resumable upload accumulate."""
+    return ensure_upload_dir() / TMP_DIR / f"{file_id}.partial"
+
+
+def committed_offset(record: UploadedFile) -> int:
+    """Bytes of ``record``'s content the server already holds durably."""
+    if record.storage_path:
+        return record.size
+    try:
+        return partial_upload_path(record.id).stat().st_size
+    except FileNotFoundError:
+        return 0
+
+
+async def append_upload_chunk(
+    record: UploadedFile, offset: int, chunks: AsyncIterable[bytes]
+) -> int:
+    """Append a chunk that starts at byte ``offset``; return the new committed offset.
+
+    Bytes are appended as they arrive, so a dropped connection keeps whatever
+    made it to disk. A retried chunk that overlaps committed bytes only has its
+    new tail appended. The total may not exceed the size declared at presign.
+    """
+    limit = min(record.size, _max_size(record.category))
+    path = partial_upload_path(record.id)
+    async with _upload_lock(record.id):
+        current = committed_offset(record)
+        if offset > current:
+            raise UploadOffsetMismatchError(
+                f"Chunk starts at {offset} but only {current} bytes are committed", current
+            )
+        path.parent.mkdir(parents=True, exist_ok=True)
+        skip = current - offset
+        async with aiofiles.open(path, "ab") as f:
+            async for chunk in chunks:
+                if skip:
+                    dropped = min(skip, len(chunk))
+                    chunk = chunk[dropped:]
+                    skip -= dropped
+                if current + len(chunk) > limit:
+                    raise ValueError(
+                        f"Upload exceeds its declared size of {limit} bytes"
+                    )
+                await f.write(chunk)
+                current += len(chunk)
+        return current
+
+
+def _hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(settings.UPLOAD_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+async def complete_resumable_upload(db: AsyncSession, record: UploadedFile) -> dict:
+    """Move a fully received resumable upload into the blob store."""
+    path = partial_upload_path(record.id)
+    async with _upload_lock(record.id):
+        current = committed_offset(record)
+        if current != record.size:
+            raise UploadOffsetMismatchError(
+                f"Upload incomplete: {current} of {record.size} bytes committed", current
+            )
+        sha256 = await asyncio.to_thread(_hash_file, path)
+        return await _attach_blob(db, record, sha256, current, path)
+
+
+def sweep_stale_partial_uploads(max_age_seconds: float) -> int:
+    """Delete abandoned resumable uploads and crashed stream temp files."""
+    tmp_dir = ensure_upload_dir() / TMP_DIR
+    if not tmp_dir.is_dir():
+        return 0
+    cutoff = time.time() - max_age_seconds
+    removed = 0
+    for path in tmp_dir.iterdir():
+        try:
+            if path.is_file() and path.stat().st_mtime < cutoff:
+                path.unlink()
+                removed += 1
+        except FileNotFoundError:
+            continue
+    return removed
+
+
+async def run_partial_upload_sweeper() -> None:
+    """Periodically sweep stale partial uploads (runs for the app's lifetime)."""
+    while True:
+        await asyncio.sleep(settings.UPLOAD_SWEEP_INTERVAL_SECONDS)
+        try:
+            removed = await asyncio.to_thread(
+                sweep_stale_partial_uploads, settings.UPLOAD_RESUMABLE_TTL_SECONDS
+            )
+        except OSError:
+            logger.warning("Partial upload sweep failed", exc_info=True)
+            continue
+        if removed:
+            logger.info("Removed %d abandoned partial uploads", removed)
+
+
+async def apply_voice_metadata(db: AsyncSession, record: UploadedFile) -> None:
+    """Copy a transcoded voice blob's metadata onto ``record`` if it is ready.
+
+    Leading/trailing silence is trimmed, so ``duration_ms`` is the length of
+    what the listener actually hears. Until the background transcode has
+    finished (and for undecodable clips) the metadata stays null.
+    """
+    if record.category != "voice" or record.duration_ms is not None or not record.sha256:
+        return
+    metadata = await asyncio.to_thread(cached_voice_metadata, record.sha256)
+    if metadata is not None:
+        record.duration_ms = metadata["duration_ms"]
+        record.waveform = metadata["waveform"]
+        await db.flush()
+
+
+async def is_upload_referenced(db: AsyncSession, file_id: str) -> bool:
+    """Whether a help request, attachment or reply still uses ``file_id``."""
+    from app.modules.help_requests.models import HelpRequest, RequestAttachment
+    from app.modules.replies.models import Reply
+
+    for column in (HelpRequest.voice_file_id, RequestAttachment.file_id, Reply.voice_file_id):
+        found = await db.scalar(select(column).where(column == file_id).limit(1))
+        if found is not None:
+            return True
+    return False
+
+
+async def delete_upload(db: AsyncSession, record: UploadedFile) -> None:
+    """Delete an upload record and release its stored content.
+
+    Commits, then deletes content no other record uses.
+    """
+    if await is_upload_referenced(db, record.id):
+        raise ValueError("Upload is still attached to a help request or reply")
+
+    sha256, storage_path = record.sha256, record.storage_path
+    await db.delete(record)
+    await db.flush()
+    freed = None
+    if storage_path is not None:
+        if sha256 is None:
+            freed = (storage_path, None)
+        else:
+            freed = await _release_blob(db, sha256, storage_path)
+    await db.commit()
+
+    partial_upload_path(record.id).unlink(missing_ok=True)
+    if freed is not None:
+        await delete_released_content(db, [freed])
+
+
+class InvalidSignedUrlError(ValueError):
+    """A signed media URL is forged, tampered with or expired."""
+
+
+def _signed_message(file_id: str, storage_path: str, mime_type: str, expires: int) -> str:
+    return "\n".join((file_id, storage_path, mime_type, str(expires)))
+
+
+def build_signed_content_url(
+    file_id: str, storage_path: str, mime_type: str, now: float | None = None
+) -> str:
+    """Expiring URL for stored content that is verified by HMAC alone.
+
+    Expiry is rounded up to ``MEDIA_URL_EXPIRY_STEP_SECONDS`` so repeated
+    listings hand out the same URL for a while, which keeps client and proxy
+    caches warm.
+    """
+    step = settings.MEDIA_URL_EXPIRY_STEP_SECONDS
+    expires = math.ceil((time.time() if now is None else now) + settings.MEDIA_URL_TTL_SECONDS)
+    expires = -(-expires // step) * step
+    key_id, signature = url_signing.sign(_signed_message(file_id, storage_path, mime_type, expires))
+    query = urlencode({
+        "path": storage_path,
+        "type": mime_type,
+        "expires": expires,
+        "kid": key_id,
+        "sig": signature,
+    })
+    return f"/uploads/media/{file_id}?{query}"
+
+
+def signed_content_url(record: UploadedFile) -> str | None:
+    """Signed URL for a record's content, or None before content is stored."""
+    if not record.storage_path:
+        return None
+    return build_signed_content_url(record.id, record.storage_path, record.mime_type)
+
+
+def verify_signed_content(
+    file_id: str,
+    storage_path: str,
+    mime_type: str,
+    expires: int,
+    key_id: str,
+    signature: str,
+    now: float | None = None,
+) -> str:
+    """Check a signed URL's parameters and return the content's storage key."""
+    message = _signed_message(file_id, storage_path, mime_type, expires)
+    if not url_signing.verify(message, key_id, signature):
+        raise InvalidSignedUrlError("Invalid media URL signature")
+    if expires < (time.time() if now is None else now):
+        raise InvalidSignedUrlError("Media URL has expired")
+    return storage_path
+
+
+def blob_sha256(storage_path: str) -> str | None:
+    """SHA-256 of a blob-store path (``blobs/ab/cd/<sha256>``), else None."""
+    parts = Path(storage_path).parts
+    if len(parts) == 4 and parts[0] == BLOB_DIR:
+        return parts[3]
+    return None
+
+
+def content_etag(record: UploadedFile) -> str:
+    """Strong ETag for stored content.
+
+    Uses the SHA-256 recorded at upload time. Files stored before hashes were
+    recorded fall back to ID and size, which is still unique because content
+    behind a file ID is never rewritten.
+    """
+    if record.sha256:
+        return f'"{record.sha256}"'
+    return f'"{record.id}-{record.size}"'
+
+
+async def get_upload_content_path(record: UploadedFile) -> Path:
+    """Return a local file with an upload's content (fetched from storage if remote)."""
+    if not record.storage_path:
         raise FileNotFoundError("Uploaded content is not available")
-    return path
+    try:
+        return await get_storage().local_path(record.storage_path)
+    except (FileNotFoundError, ValueError):
+        raise FileNotFoundError("Uploaded content is not available") from None
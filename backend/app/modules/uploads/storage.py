@@ -0,0 +1,284 @@
+"""Storage backends for upload content.
+
+Content is addressed by a storage key: the ``storage_path`` persisted on
+upload records and blobs (e.g. ``blobs/ab/cd/<sha256>``). Uploads are always
+staged on local disk under ``UPLOAD_DIR/tmp`` and handed to the backend once
+complete, and media processing reads from a local file, so a remote backend
+keeps a read-through copy of the objects it was asked to open, bounded in
+size by a periodic least-recently-used prune.
+
+Serving is decided separately by ``STORAGE_SERVE_MODE``: the app can stream
+the bytes itself, or only authorize the request and tell a front proxy which
+file to send (``X-Accel-Redirect`` for nginx, ``X-Sendfile`` for others).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+import uuid
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from pathlib import Path, PurePosixPath
+from urllib.parse import quote
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = "cache"
+# Copies used this recently may be mid-response, so a prune leaves them alone.
+CACHE_PRUNE_GRACE_SECONDS = 60.0
+
+
+def _check_key(key: str) -> str:
+    """Reject keys that could escape the storage root."""
+    parts = PurePosixPath(key).parts
+    if not parts or key.startswith("/") or "\\" in key or any(p in ("", ".", "..") for p in parts):
+        raise ValueError(f"Invalid storage key: {key!r}")
+    return key
+
+
+def local_accel_uri(path: Path) -> str:
+    """``X-Accel-Redirect`` URI of a file under ``UPLOAD_DIR``."""
+    relative = path.resolve().relative_to(Path(settings.UPLOAD_DIR).resolve())
+    return settings.STORAGE_ACCEL_PREFIX + quote(relative.as_posix())
+
+
+class StorageBackend(ABC):
+    """Where stored content lives, addressed by storage key."""
+
+    name: str
+
+    @abstractmethod
+    async def put(self, key: str, source: Path) -> None:
+        """Store the local file ``source`` under ``key``; ``source`` is consumed."""
+
+    @abstractmethod
+    async def exists(self, key: str) -> bool:
+        """Whether content is stored under ``key``."""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Remove ``key`` (a no-op if it is already gone)."""
+
+    @abstractmethod
+    async def local_path(self, key: str) -> Path:
+        """A local file holding ``key``'s bytes; FileNotFoundError if missing."""
+
+    @abstractmethod
+    def accel_uri(self, key: str) -> str:
+        """Internal URI a front proxy resolves for ``X-Accel-Redirect``."""
+
+    def prune_cache(self, max_bytes: int) -> int:
+        """Trim local copies of remote content to ``max_bytes``; returns bytes freed.
+
+        Blocking. Backends that keep no copies have nothing to do.
+        """
+        return 0
+
+
+class LocalStorage(StorageBackend):
+    """Files under a directory on local disk (``UPLOAD_DIR``)."""
+
+    name = "local"
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+
+    def path(self, key: str) -> Path:
+        return self.root / _check_key(key)
+
+    async def put(self, key: str, source: Path) -> None:
+        dest = self.path(key)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(source, dest)
+
+    async def exists(self, key: str) -> bool:
+        return self.path(key).is_file()
+
+    async def delete(self, key: str) -> None:
+        self.path(key).unlink(missing_ok=True)
+
+    async def local_path(self, key: str) -> Path:
+        path = self.path(key)
+        if not path.is_file():
+            raise FileNotFoundError(key)
+        return path
+
+    def accel_uri(self, key: str) -> str:
+        return settings.STORAGE_ACCEL_PREFIX + quote(_check_key(key))
+
+
+class S3Storage(StorageBackend):
+    """Objects in an S3-compatible bucket (AWS, MinIO, R2, ...).
+
+    boto3 is blocking, so calls run in worker threads. Objects opened for
+    serving or media processing are cached under ``UPLOAD_DIR/cache``. The
+    content behind a key never changes, so copies need no invalidation; each
+    use refreshes a copy's mtime and `prune_cache` drops the stalest first.
+    """
+
+    name = "s3"
+
+    def __init__(
+        self,
+        bucket: str,
+        *,
+        cache_dir: Path,
+        endpoint_url: str | None = None,
+        region: str = "us-east-1",
+        access_key_id: str | None = None,
+        secret_access_key: str | None = None,
+        key_prefix: str = "",
+    ) -> None:
+        try:
+            import boto3
+        except ImportError as e:  # pragma: no cover - depends on the install
+            raise RuntimeError("STORAGE_BACKEND=s3 requires the 's3' extra (boto3)") from e
+        if not bucket:
+            raise RuntimeError("STORAGE_BACKEND=s3 requires S3_BUCKET")
+
+        self.bucket = bucket
+        self.key_prefix = key_prefix
+        self.cache_dir = cache_dir
+        self._client = boto3.client(
+            "s3",
+            endpoint_url=endpoint_url,
+            region_name=region,
+            aws_access_key_id=access_key_id,
+            aws_secret_access_key=secret_access_key,
+        )
+
+    def _object_key(self, key: str) -> str:
+        return self.key_prefix + _check_key(key)
+
+    def _cache_path(self, key: str) -> Path:
+        return self.cache_dir / _check_key(key)
+
+    def _is_missing(self, error: Exception) -> bool:
+        code = getattr(error, "response", {}).get("Error", {}).get("Code")
+        return code in ("404", "NoSuchKey", "NotFound")
+
+    async def put(self, key: str, source: Path) -> None:
+        await asyncio.to_thread(
+            self._client.upload_file, str(source), self.bucket, self._object_key(key)
+        )
+        source.unlink(missing_ok=True)
+
+    async def exists(self, key: str) -> bool:
+        from botocore.exceptions import ClientError
+
+        try:
+            await asyncio.to_thread(
+                self._client.head_object, Bucket=self.bucket, Key=self._object_key(key)
+            )
+        except ClientError as e:
+            if self._is_missing(e):
+                return False
+            raise
+        return True
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(
+            self._client.delete_object, Bucket=self.bucket, Key=self._object_key(key)
+        )
+        self._cache_path(key).unlink(missing_ok=True)
+
+    async def local_path(self, key: str) -> Path:
+        from botocore.exceptions import ClientError
+
+        path = self._cache_path(key)
+        try:
+            os.utime(path)
+            return path
+        except FileNotFoundError:
+            pass
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{uuid.uuid4().hex}.part")
+        try:
+            await asyncio.to_thread(
+                self._client.download_file, self.bucket, self._object_key(key), str(tmp)
+            )
+            os.replace(tmp, path)
+        except ClientError as e:
+            if self._is_missing(e):
+                raise FileNotFoundError(key) from e
+            raise
+        finally:
+            tmp.unlink(missing_ok=True)
+        return path
+
+    def accel_uri(self, key: str) -> str:
+        return settings.S3_ACCEL_PREFIX + quote(self._object_key(key))
+
+    def prune_cache(self, max_bytes: int) -> int:
+        if not self.cache_dir.is_dir():
+            return 0
+        copies = []
+        for path in self.cache_dir.rglob("*"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            if path.is_file() and not path.name.endswith(".part"):
+                copies.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in copies)
+        recent = time.time() - CACHE_PRUNE_GRACE_SECONDS
+        freed = 0
+        for mtime, size, path in sorted(copies):
+            if total - freed <= max_bytes or mtime > recent:
+                break
+            path.unlink(missing_ok=True)
+            freed += size
+        return freed
+
+
+@lru_cache(maxsize=4)
+def _build_storage(backend: str, upload_dir: str, s3_config: tuple) -> StorageBackend:
+    root = Path(upload_dir)
+    if backend == "local":
+        return LocalStorage(root)
+    if backend == "s3":
+        bucket, endpoint_url, region, access_key_id, secret_access_key, key_prefix = s3_config
+        return S3Storage(
+            bucket,
+            cache_dir=root / CACHE_DIR,
+            endpoint_url=endpoint_url,
+            region=region,
+            access_key_id=access_key_id,
+            secret_access_key=secret_access_key,
+            key_prefix=key_prefix,
+        )
+    raise RuntimeError(f"Unknown STORAGE_BACKEND: {backend!r}")
+
+
+async def run_cache_pruner() -> None:
+    """Periodically trim the backend's local copies (runs for the app's lifetime)."""
+    while True:
+        await asyncio.sleep(settings.S3_CACHE_SWEEP_INTERVAL_SECONDS)
+        try:
+            freed = await asyncio.to_thread(get_storage().prune_cache, settings.S3_CACHE_MAX_BYTES)
+        except OSError:
+            logger.warning("Storage cache prune failed", exc_info=True)
+            continue
+        if freed:
+            logger.info("Pruned %d bytes of cached storage copies", freed)
+
+
+def get_storage() -> StorageBackend:
+    """The backend selected by settings (rebuilt when they change)."""
+    return _build_storage(
+        settings.STORAGE_BACKEND,
+        settings.UPLOAD_DIR,
+        (
+            settings.S3_BUCKET,
+            settings.S3_ENDPOINT_URL,
+            settings.S3_REGION,
+            settings.S3_ACCESS_KEY_ID,
+            settings.S3_SECRET_ACCESS_KEY,
+            settings.S3_KEY_PREFIX,
+        ),
+    )
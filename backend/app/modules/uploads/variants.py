@@ -0,0 +1,325 @@
+"""Media derivatives: image thumbnails/display copies and compact voice audio.
+
+Variants are derived from a blob, so they are keyed by its SHA-256 and
+stored next to the blob store under ``variants/ab/cd/<sha256>/``. Rendering
+is CPU-bound and runs in a process pool, which is replaced if a decoder
+crashes a worker; every variant is written to a temp file and renamed into
+place, so concurrent renders of the same blob are safe.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import math
+import os
+import shutil
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.metrics import register_metrics
+
+logger = logging.getLogger(__name__)
+
+VARIANT_DIR = "variants"
+
+# Variants a client may request, per upload category.
+CATEGORY_VARIANTS = {
+    "image": ("thumb", "display", "normalized"),
+    "voice": ("compact",),
+}
+
+# Formats every client can decode natively; anything else gets a JPEG copy.
+WEB_SAFE_IMAGE_TYPES = {"image/jpeg", "image/jpg", "image/png", "image/webp", "image/gif"}
+
+
+@dataclass(frozen=True)
+class VariantSpec:
+    name: str
+    mime_type: str
+    extension: str
+    max_edge: int | None = None
+    format: str = ""
+    quality: int = 0
+
+
+def variant_specs() -> dict[str, VariantSpec]:
+    return {
+        "thumb": VariantSpec(
+            "thumb", "image/webp", "webp", settings.IMAGE_THUMB_MAX_EDGE, "WEBP", 70
+        ),
+        "display": VariantSpec(
+            "display", "image/webp", "webp", settings.IMAGE_DISPLAY_MAX_EDGE, "WEBP", 80
+        ),
+        "normalized": VariantSpec("normalized", "image/jpeg", "jpg", None, "JPEG", 90),
+        "compact": VariantSpec("compact", "audio/mp4", "m4a"),
+    }
+
+
+def variant_dir(sha256: str) -> Path:
+    return Path(settings.UPLOAD_DIR) / VARIANT_DIR / sha256[:2] / sha256[2:4] / sha256
+
+
+def variant_path(sha256: str, spec: VariantSpec) -> Path:
+    return variant_dir(sha256) / f"{spec.name}.{spec.extension}"
+
+
+def _voice_metadata_path(sha256: str) -> Path:
+    return variant_dir(sha256) / "compact.json"
+
+
+def variants_for(category: str, mime_type: str) -> list[str]:
+    """Variants produced for content of ``category`` and ``mime_type``."""
+    if category != "image":
+        return list(CATEGORY_VARIANTS.get(category, ()))
+    names = ["thumb", "display"]
+    if mime_type.split(";")[0].strip().lower() not in WEB_SAFE_IMAGE_TYPES:
+        names.append("normalized")
+    return names
+
+
+def _write_atomically(dest: str, write) -> None:
+    tmp = f"{dest}.{uuid.uuid4().hex}.part"
+    try:
+        write(tmp)
+        os.replace(tmp, dest)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def render_image_variants(source: str, targets: list[tuple[VariantSpec, str]]) -> None:
+    """Decode ``source`` once and write each variant (runs in a worker process).
+
+    EXIF orientation is applied to the pixels and no metadata is copied into
+    the outputs.
+    """
+    from PIL import Image, ImageOps
+
+    try:
+        from pillow_heif import register_heif_opener
+    except ImportError:  # HEIC/HEIF sources then fail to open
+        pass
+    else:
+        register_heif_opener()
+
+    with Image.open(source) as opened:
+        edges = [spec.max_edge for spec, _ in targets]
+        if None not in edges:
+            # Lets the JPEG decoder downscale by a power of two up front.
+            largest = max(edges)
+            opened.draft("RGB", (largest, largest))
+        image = ImageOps.exif_transpose(opened)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if image.has_transparency_data else "RGB")
+
+        for spec, dest in targets:
+            out = image.copy()
+            if spec.max_edge is not None:
+                out.thumbnail((spec.max_edge, spec.max_edge), Image.Resampling.LANCZOS)
+            if spec.format == "JPEG" and out.mode == "RGBA":
+                background = Image.new("RGB", out.size, (255, 255, 255))
+                background.paste(out, mask=out.getchannel("A"))
+                out = background
+            _write_atomically(
+                dest,
+                lambda tmp: out.save(tmp, format=spec.format, quality=spec.quality, optimize=True),
+            )
+
+
+def _trim_silence(samples: np.ndarray, rate: int) -> np.ndarray:
+    """Drop leading/trailing samples quieter than the silence threshold.
+
+    Keeps a little padding so words are not clipped; all-silent clips are
+    returned unchanged.
+    """
+    threshold = 32768 * 10 ** (settings.VOICE_SILENCE_THRESHOLD_DBFS / 20)
+    loud = np.flatnonzero(np.abs(samples.astype(np.int32)) > threshold)
+    if loud.size == 0:
+        return samples
+    pad = int(rate * settings.VOICE_SILENCE_PADDING_MS / 1000)
+    return samples[max(0, int(loud[0]) - pad): min(len(samples), int(loud[-1]) + 1 + pad)]
+
+
+def _waveform(samples: np.ndarray, buckets: int) -> list[int]:
+    """Peak level (0-100) of ``buckets`` equal slices of the clip."""
+    if not len(samples):
+        return [0] * buckets
+    # Slices shorter than one sample collapse onto the sample they start at.
+    starts = (np.arange(buckets) * (len(samples) / buckets)).astype(np.intp)
+    peaks = np.maximum.reduceat(np.abs(samples.astype(np.int32)), starts)
+    loudest = int(peaks.max()) or 1
+    return np.rint(peaks * 100 / loudest).astype(int).tolist()
+
+
+def transcode_voice(source: str, dest: str, metadata_dest: str) -> dict:
+    """Decode, trim and re-encode a voice clip as mono AAC (runs in a worker process).
+
+    Writes the compact audio plus a JSON sidecar with ``duration_ms`` and
+    ``waveform`` so later uploads of the same blob can reuse both.
+    """
+    import av
+
+    rate = settings.VOICE_COMPACT_SAMPLE_RATE
+    pcm = bytearray()
+    with av.open(source) as container:
+        resampler = av.AudioResampler(format="s16", layout="mono", rate=rate)
+        for frame in container.decode(audio=0):
+            for out in resampler.resample(frame):
+                pcm += bytes(out.planes[0])[: out.samples * 2]
+        for out in resampler.resample(None):
+            pcm += bytes(out.planes[0])[: out.samples * 2]
+
+    samples = _trim_silence(np.frombuffer(pcm, dtype=np.int16), rate)
+    metadata = {
+        "duration_ms": math.floor(len(samples) * 1000 / rate),
+        "waveform": _waveform(samples, settings.VOICE_WAVEFORM_BUCKETS),
+    }
+
+    def encode(tmp: str) -> None:
+        with av.open(tmp, "w", format="mp4", options={"movflags": "faststart"}) as output:
+            stream = output.add_stream("aac", rate=rate, layout="mono")
+            stream.bit_rate = settings.VOICE_COMPACT_BITRATE
+            to_encoder = av.AudioResampler(format="fltp", layout="mono", rate=rate)
+            block = rate  # one second of audio per frame handed to the encoder
+            for offset in range(0, len(samples), block):
+                chunk = samples[offset: offset + block].tobytes()
+                frame = av.AudioFrame(format="s16", layout="mono", samples=len(chunk) // 2)
+                frame.sample_rate = rate
+                frame.planes[0].update(chunk.ljust(frame.planes[0].buffer_size, b"\0"))
+                for converted in to_encoder.resample(frame):
+                    output.mux(stream.encode(converted))
+            output.mux(stream.encode(None))
+
+    _write_atomically(dest, encode)
+    _write_atomically(metadata_dest, lambda tmp: Path(tmp).write_text(json.dumps(metadata)))
+    return metadata
+
+
+class VariantRenderer:
+    """Lazily started process pool plus counters for `/metrics`."""
+
+    def __init__(self) -> None:
+        self._pool: ProcessPoolExecutor | None = None
+        self.rendered = 0
+        self.failed = 0
+        self.pool_restarts = 0
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=settings.MEDIA_WORKERS)
+        return self._pool
+
+    def _discard_pool(self, pool: ProcessPoolExecutor) -> None:
+        """Drop a broken pool; the next render starts a fresh one."""
+        if self._pool is pool:
+            self._pool = None
+            self.pool_restarts += 1
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    async def _run(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        pool = self._executor()
+        try:
+            result = await loop.run_in_executor(pool, fn, *args)
+        except Exception as e:
+            if isinstance(e, BrokenProcessPool):
+                self._discard_pool(pool)
+            self.failed += 1
+            raise
+        self.rendered += 1
+        return result
+
+    async def render(self, source: Path, sha256: str, names: list[str]) -> None:
+        specs = variant_specs()
+        missing = [name for name in names if not variant_path(sha256, specs[name]).is_file()]
+        if not missing:
+            return
+        variant_dir(sha256).mkdir(parents=True, exist_ok=True)
+
+        image_targets = [
+            (specs[name], str(variant_path(sha256, specs[name])))
+            for name in missing
+            if name != "compact"
+        ]
+        if image_targets:
+            await self._run(render_image_variants, str(source), image_targets)
+        if "compact" in missing:
+            await self._run(
+                transcode_voice,
+                str(source),
+                str(variant_path(sha256, specs["compact"])),
+                str(_voice_metadata_path(sha256)),
+            )
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "workers": settings.MEDIA_WORKERS if self._pool is not None else 0,
+            "rendered": self.rendered,
+            "failed": self.failed,
+            "pool_restarts": self.pool_restarts,
+        }
+
+
+renderer = VariantRenderer()
+register_metrics("media_variants", renderer.stats)
+
+
+async def generate_variants(source: Path, sha256: str, category: str, mime_type: str) -> None:
+    """Background task: render every variant for newly stored content."""
+    try:
+        await renderer.render(source, sha256, variants_for(category, mime_type))
+    except Exception:
+        logger.warning("Could not render variants for blob %s", sha256, exc_info=True)
+
+
+async def ensure_variant(
+    source: Path, sha256: str, category: str, mime_type: str, name: str
+) -> Path | None:
+    """Path of variant ``name``, rendering it now if no job has yet.
+
+    Returns None when the original should be served instead: a variant that
+    does not apply to this content (e.g. a normalized copy of an image that is
+    already web-safe), or content that cannot be decoded.
+    """
+    if name not in variants_for(category, mime_type):
+        return None
+    path = variant_path(sha256, variant_specs()[name])
+    if path.is_file():
+        return path
+    try:
+        await renderer.render(source, sha256, [name])
+    except Exception:
+        logger.warning("Could not render %s variant for blob %s", name, sha256, exc_info=True)
+        return None
+    return path
+
+
+def cached_voice_metadata(sha256: str) -> dict | None:
+    """``duration_ms`` and ``waveform`` of a voice blob, once it has been transcoded.
+
+    Never transcodes: returns None until the compact variant's render (queued
+    by `generate_variants`) has written its sidecar, or if the clip cannot be
+    decoded.
+    """
+    try:
+        return json.loads(_voice_metadata_path(sha256).read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def remove_variants(sha256: str) -> None:
+    """Delete every variant of a collected blob."""
+    shutil.rmtree(variant_dir(sha256), ignore_errors=True)
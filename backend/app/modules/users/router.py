@@ -3,9 +3,8 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.db import get_db
-from app.core.security import get_current_user
-from app.modules.auth.models import User
+from app.core.db import get_db, get_read_db
+from app.core.security import AuthenticatedUser, get_current_user
 from app.modules.users import schemas, service
 
 router = APIRouter(prefix="/users", tags=["users"])
@@ -13,8 +12,8 @@ router = APIRouter(prefix="/users", tags=["users"])
 
 @router.get("/me", response_model=schemas.UserProfileResponse)
 async def get_my_profile(
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
 ) -> schemas.UserProfileResponse:
     """Get current user profile with accessibility settings."""
     profile = await service.get_user_profile(db, current_user)
@@ -24,7 +23,7 @@ async def get_my_profile(
 @router.patch("/me/accessibility", response_model=schemas.AccessibilityResponse)
 async def update_my_accessibility(
     payload: schemas.AccessibilityUpdateRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> schemas.AccessibilityResponse:
     """Update current user accessibility settings."""
@@ -3,11 +3,12 @@
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.modules.auth.models import User, UserSettings
+from app.core.security import AuthenticatedUser
+from app.modules.auth.models import UserSettings
 from app.modules.users.schemas import AccessibilityUpdateRequest
 
 
-async def get_user_profile(db: AsyncSession, user: User) -> dict:
+async def get_user_profile(db: AsyncSession, user: AuthenticatedUser) -> dict:
     """Build the full user profile dict including accessibility settings."""
     result = await db.execute(
         select(UserSettings).where(UserSettings.user_id == user.id)
@@ -0,0 +1,166 @@
+"""Shared helpers: run the real app against a throwaway SQLite DB.
+
+``bench_client`` drives it in-process; ``uvicorn_server`` runs it under
+uvicorn in a subprocess for benchmarks that need real sockets or the
+server's own memory figures.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator
+
+import httpx
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.db import Base, create_engine_from_settings, get_db, get_read_db
+from app.main import app
+
+
+@asynccontextmanager
+async def bench_client(base_url: str = "http://bench") -> AsyncIterator[AsyncClient]:
+    """Yield an HTTP client bound to the app with DB and uploads in a temp dir.
+
+    The client's ``sessionmaker`` attribute opens write sessions on the same DB
+    for seeding data directly.
+    """
+    tmp_dir = tempfile.mkdtemp(prefix="seeforme-bench-")
+    previous_upload_dir = settings.UPLOAD_DIR
+    settings.UPLOAD_DIR = os.path.join(tmp_dir, "uploads")
+    db_url = f"sqlite+aiosqlite:///{os.path.join(tmp_dir, 'bench.db')}"
+    engine = create_engine_from_settings(db_url, echo=False)
+    read_engine = create_engine_from_settings(db_url, echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    write_sessions = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    read_sessions = async_sessionmaker(
+        read_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+    )
+
+    async def _get_db():
+        async with write_sessions() as session:
+            try:
+                yield session
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+
+    async def _get_read_db():
+        async with read_sessions() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = _get_db
+    app.dependency_overrides[get_read_db] = _get_read_db
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url=base_url) as client:
+            client.sessionmaker = write_sessions
+            yield client
+    finally:
+        app.dependency_overrides.clear()
+        await engine.dispose()
+        await read_engine.dispose()
+        settings.UPLOAD_DIR = previous_upload_dir
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+async def register(client: AsyncClient, email: str, role: str) -> dict[str, str]:
+    """Register a user and return bearer auth headers."""
+    resp = await client.post(
+        f"{settings.API_V1_PREFIX}/auth/register",
+        json={"email": email, "password": "password123", "role": role},
+    )
+    resp.raise_for_status()
+    return {"Authorization": f"Bearer {resp.json()['access_token']}"}
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile of ``samples`` (0 when empty)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def free_port() -> int:
+    """A TCP port on 127.0.0.1 that is free right now."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def proc_status_mb(pid: int, field: str = "VmRSS") -> float:
+    """A memory field of ``/proc/<pid>/status`` (e.g. VmRSS, VmHWM) in MB."""
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith(f"{field}:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+@dataclass
+class ServerProcess:
+    port: int
+    process: subprocess.Popen
+
+    @property
+    def pid(self) -> int:
+        return self.process.pid
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+
+@asynccontextmanager
+async def uvicorn_server(
+    env: dict[str, str] | None = None, *uvicorn_args: str
+) -> AsyncIterator[ServerProcess]:
+    """Run ``app.main:app`` under uvicorn with its DB and uploads in a temp dir.
+
+    ``env`` overrides settings in the server's environment. Yields once the
+    server answers ``/``; stops it and removes the temp dir on exit.
+    """
+    tmp_dir = tempfile.mkdtemp(prefix="seeforme-bench-")
+    port = free_port()
+    server_env = {
+        **os.environ,
+        "DEBUG": "false",
+        "DATABASE_URL": f"sqlite+aiosqlite:///{os.path.join(tmp_dir, 'bench.db')}",
+        "UPLOAD_DIR": os.path.join(tmp_dir, "uploads"),
+        **(env or {}),
+    }
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port),
+         "--log-level", "warning", "--timeout-graceful-shutdown", "2", *uvicorn_args],
+        env=server_env,
+    )
+    server = ServerProcess(port, process)
+    try:
+        async with httpx.AsyncClient(timeout=5) as client:
+            for _ in range(100):
+                try:
+                    await client.get(f"{server.url}/")
+                    break
+                except httpx.TransportError:
+                    await asyncio.sleep(0.1)
+        yield server
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            process.kill()
+        shutil.rmtree(tmp_dir, ignore_errors=True)
@@ -0,0 +1,71 @@
+"""Fire concurrent claims at one help request and check there is one winner.
+
+    DEBUG=false uv run python -m benchmarks.claim_race --volunteers 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from collections import Counter
+
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.modules.auth.models import User
+from benchmarks._harness import bench_client, percentile, register
+
+
+async def _run(volunteers: int) -> None:
+    async with bench_client() as client:
+        seeker_headers = await register(client, "race-seeker@test.com", "seeker")
+        resp = await client.post(
+            f"{settings.API_V1_PREFIX}/help-requests",
+            json={"text": "claim race", "mode": "hall"},
+            headers=seeker_headers,
+        )
+        request_id = resp.json()["id"]
+
+        # Create volunteers directly to keep bcrypt out of the measurement.
+        async with client.sessionmaker() as db:
+            users = [
+                User(role="volunteer", email=f"race-vol{i}@test.com", password_hash="x")
+                for i in range(volunteers)
+            ]
+            db.add_all(users)
+            await db.commit()
+        tokens = [create_access_token({"sub": u.id, "role": u.role}) for u in users]
+
+        latencies: list[float] = []
+
+        async def claim(token: str) -> int:
+            t0 = time.perf_counter()
+            r = await client.post(
+                f"{settings.API_V1_PREFIX}/help-requests/{request_id}/claim",
+                headers={"Authorization": f"Bearer {token}"},
+            )
+            latencies.append((time.perf_counter() - t0) * 1000)
+            return r.status_code
+
+        t0 = time.perf_counter()
+        codes = Counter(await asyncio.gather(*(claim(t) for t in tokens)))
+        elapsed = time.perf_counter() - t0
+
+    print(f"claims={volunteers} elapsed={elapsed:.2f}s statuses={dict(codes)}")
+    print(f"p50={percentile(latencies, 50):.1f}ms p99={percentile(latencies, 99):.1f}ms")
+    winners = codes.get(200, 0)
+    server_errors = sum(n for code, n in codes.items() if code >= 500)
+    assert winners == 1, f"expected exactly one winner, got {winners}"
+    assert server_errors == 0, f"got {server_errors} server errors"
+    print("OK: exactly one winner, no 5xx")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--volunteers", type=int, default=100)
+    args = parser.parse_args()
+    asyncio.run(_run(args.volunteers))
+
+
+if __name__ == "__main__":
+    main()
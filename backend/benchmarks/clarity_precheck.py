@@ -0,0 +1,71 @@
+"""Clarity pre-check latency at common phone-camera resolutions.
+
+Encodes a photo-like JPEG at each size, then times the reduced-scale
+grayscale decode plus the NumPy checks, and the checks alone; the last row
+is the 480px ``thumb`` variant the pre-check uses once it has been rendered:
+
+    uv run python -m benchmarks.clarity_precheck --repeat 30
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import time
+
+from PIL import Image, ImageFilter
+
+from app.core.config import settings
+from app.modules.image_analysis.clarity import assess_luminance, load_luminance
+from benchmarks._harness import percentile
+
+RESOLUTIONS = {
+    "1080p (2MP)": (1920, 1080),
+    "8MP": (3264, 2448),
+    "12MP": (4032, 3024),
+    "48MP": (8064, 6048),
+}
+
+
+def _photo(size: tuple[int, int], fmt: str = "JPEG") -> bytes:
+    small = Image.effect_noise((size[0] // 8, size[1] // 8), 60).convert("RGB")
+    image = small.resize(size, Image.Resampling.BICUBIC).filter(ImageFilter.GaussianBlur(1))
+    buf = io.BytesIO()
+    image.save(buf, format=fmt, quality=90 if fmt == "JPEG" else 70)
+    return buf.getvalue()
+
+
+def _time(fn, repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+    edge = settings.IMAGE_THUMB_MAX_EDGE
+
+    cases = {name: _photo(size) for name, size in RESOLUTIONS.items()}
+    thumb = Image.open(io.BytesIO(_photo(RESOLUTIONS["12MP"])))
+    thumb.thumbnail((edge, edge))
+    buf = io.BytesIO()
+    thumb.save(buf, format="WEBP", quality=70)
+    cases[f"thumb ({edge}px webp)"] = buf.getvalue()
+
+    print(f"grayscale decode to <= {edge}px, p50/p99 over {args.repeat} runs")
+    for name, data in cases.items():
+        gray = load_luminance(io.BytesIO(data), edge)
+        total = _time(lambda: assess_luminance(load_luminance(io.BytesIO(data), edge)), args.repeat)
+        checks = _time(lambda: assess_luminance(gray), args.repeat)
+        print(f"{name:>20}: decode+check p50={percentile(total, 50):6.2f}ms "
+              f"p99={percentile(total, 99):6.2f}ms  checks only p50={percentile(checks, 50):5.2f}ms "
+              f"({gray.shape[1]}x{gray.shape[0]})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Image-description throughput and latency against the batch size limit.
+
+Drives the micro-batching executor with a steady stream of describe calls
+(``--rate`` per second) using the local stand-in engine, whose simulated cost
+is a fixed per-batch overhead plus a smaller per-image cost (the shape of a
+CPU-hosted vision model). Each batch size limit gets a fresh burst:
+
+    uv run python -m benchmarks.describe_batching --rate 100 --requests 300
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import io
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from PIL import Image
+
+from app.core.config import settings
+from app.modules.image_analysis.batching import batcher
+from app.modules.image_analysis.engines import ImageInput
+from benchmarks._harness import percentile
+
+
+async def _burst(image: ImageInput, requests: int, rate: float) -> tuple[float, list[float]]:
+    latencies: list[float] = []
+
+    async def one() -> None:
+        t0 = time.perf_counter()
+        await batcher.describe(image)
+        latencies.append((time.perf_counter() - t0) * 1000)
+
+    t0 = time.perf_counter()
+    tasks = []
+    for _ in range(requests):
+        tasks.append(asyncio.create_task(one()))
+        await asyncio.sleep(1 / rate)
+    await asyncio.gather(*tasks)
+    return time.perf_counter() - t0, latencies
+
+
+async def _run(batch_sizes: list[int], requests: int, rate: float, wait_ms: float) -> None:
+    tmp_dir = tempfile.mkdtemp(prefix="seeforme-bench-")
+    path = Path(tmp_dir) / "photo.jpg"
+    buf = io.BytesIO()
+    Image.new("RGB", (1280, 960), (90, 120, 150)).save(buf, format="JPEG")
+    path.write_bytes(buf.getvalue())
+    image = ImageInput(str(path), "image/jpeg", "zh-CN")
+    try:
+        await batcher.describe(image)  # start the worker
+        print(f"engine cost {settings.IMAGE_DESCRIBE_LOCAL_BATCH_SECONDS * 1000:.0f}ms/batch + "
+              f"{settings.IMAGE_DESCRIBE_LOCAL_ITEM_SECONDS * 1000:.0f}ms/image, "
+              f"{settings.IMAGE_DESCRIBE_WORKERS} worker(s), {requests} requests at {rate:.0f}/s, "
+              f"wait {wait_ms:.0f}ms")
+        for size in batch_sizes:
+            settings.IMAGE_DESCRIBE_BATCH_MAX_ITEMS = size
+            settings.IMAGE_DESCRIBE_BATCH_WAIT_MS = wait_ms
+            batches, items = batcher.batches, batcher.items
+            elapsed, latencies = await _burst(image, requests, rate)
+            mean = (batcher.items - items) / max(1, batcher.batches - batches)
+            print(f"max batch {size:>3}: {requests / elapsed:6.1f} img/s  mean batch {mean:5.1f}  "
+                  f"p50={percentile(latencies, 50):7.1f}ms p99={percentile(latencies, 99):7.1f}ms")
+    finally:
+        batcher.shutdown()
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--batch-sizes", default="1,2,4,8,16")
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--rate", type=float, default=100.0, help="describe calls per second")
+    parser.add_argument("--wait-ms", type=float, default=settings.IMAGE_DESCRIBE_BATCH_WAIT_MS)
+    parser.add_argument("--batch-cost", type=float, default=0.04, help="seconds per batch")
+    parser.add_argument("--item-cost", type=float, default=0.005, help="seconds per image")
+    args = parser.parse_args()
+    # Read by the worker process when it starts, so set before the first call.
+    settings.IMAGE_DESCRIBE_LOCAL_BATCH_SECONDS = args.batch_cost
+    settings.IMAGE_DESCRIBE_LOCAL_ITEM_SECONDS = args.item_cost
+    settings.IMAGE_DESCRIBE_MAX_QUEUE = args.requests
+    settings.IMAGE_DESCRIBE_TIMEOUT_SECONDS = 600.0
+    sizes = [int(size) for size in args.batch_sizes.split(",")]
+    asyncio.run(_run(sizes, args.requests, args.rate, args.wait_ms))
+
+
+if __name__ == "__main__":
+    main()
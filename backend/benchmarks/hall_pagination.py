@@ -0,0 +1,111 @@
+"""Benchmark OFFSET vs keyset (cursor) pagination on the volunteer hall.
+
+Seeds a throwaway SQLite database and times fetching pages at increasing
+depth with both strategies:
+
+    uv run python -m benchmarks.hall_pagination --rows 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sqlite3
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.db import Base
+import app.modules.auth.models  # noqa: F401
+import app.modules.help_requests.models  # noqa: F401
+from app.modules.help_requests import service
+
+SEEKER_ID = "00000000-0000-0000-0000-000000000001"
+
+
+def _seed(db_path: str, rows: int) -> None:
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "INSERT INTO users (id, role, email, password_hash, is_active, created_at) "
+        "VALUES (?, 'seeker', 'bench@test.com', 'x', 1, ?)",
+        (SEEKER_ID, datetime(2025, 1, 1).isoformat(" ")),
+    )
+    base = datetime(2025, 1, 1)
+    batch: list[tuple] = []
+    for i in range(rows):
+        ts = (base + timedelta(seconds=i)).isoformat(" ", timespec="microseconds")
+        batch.append(
+            (str(uuid.uuid4()), SEEKER_ID, "hall", "open", "text-only-placeholder", i % 3, ts, ts)
+        )
+        if len(batch) >= 50_000:
+            conn.executemany(
+                "INSERT INTO help_requests (id, seeker_id, mode, status, voice_file_id, "
+                "priority, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                batch,
+            )
+            batch.clear()
+    if batch:
+        conn.executemany(
+            "INSERT INTO help_requests (id, seeker_id, mode, status, voice_file_id, "
+            "priority, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            batch,
+        )
+    conn.commit()
+    conn.execute("ANALYZE")
+    conn.close()
+
+
+async def _run(rows: int, page_size: int, depths: list[int]) -> None:
+    tmp_dir = tempfile.mkdtemp(prefix="seeforme-bench-")
+    db_path = os.path.join(tmp_dir, "bench.db")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    print(f"seeding {rows:,} help requests ...")
+    _seed(db_path, rows)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    print(f"{'page':>8} {'offset+count ms':>16} {'offset ms':>10} {'cursor ms':>10}")
+    for depth in depths:
+        async with session_factory() as db:
+            t0 = time.perf_counter()
+            await service.get_hall_requests(db, depth, page_size, "open")
+            offset_count_ms = (time.perf_counter() - t0) * 1000
+
+            t0 = time.perf_counter()
+            _, _, next_cursor = await service.get_hall_requests(
+                db, depth, page_size, "open", with_total=False
+            )
+            offset_ms = (time.perf_counter() - t0) * 1000
+
+            # Cursor pointing at the same depth as the OFFSET page.
+            t0 = time.perf_counter()
+            await service.get_hall_requests(
+                db, page_size=page_size, status_filter="open", cursor=next_cursor, with_total=False
+            )
+            cursor_ms = (time.perf_counter() - t0) * 1000
+
+        print(f"{depth:>8} {offset_count_ms:>16.2f} {offset_ms:>10.2f} {cursor_ms:>10.2f}")
+
+    await engine.dispose()
+    os.remove(db_path)
+    os.rmdir(tmp_dir)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--page-size", type=int, default=20)
+    args = parser.parse_args()
+    max_page = max(1, args.rows // args.page_size - 1)
+    depths = sorted({d for d in (1, 10, 100, 1_000, 10_000, max_page) if d <= max_page})
+    asyncio.run(_run(args.rows, args.page_size, depths))
+
+
+if __name__ == "__main__":
+    main()
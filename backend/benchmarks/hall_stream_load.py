@@ -0,0 +1,98 @@
+"""Hold thousands of idle hall SSE connections on one uvicorn worker.
+
+Starts the app under uvicorn in a subprocess, opens N `/help-requests/hall/stream`
+connections, reports server RSS, then creates one help request and measures
+how long it takes for every connection to receive the `created` event:
+
+    uv run python -m benchmarks.hall_stream_load --connections 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import resource
+import time
+
+import httpx
+
+from benchmarks._harness import proc_status_mb, uvicorn_server
+
+PREFIX = "/api/v1"
+
+
+async def _open_stream(port: int, token: str) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(
+        (
+            f"GET {PREFIX}/help-requests/hall/stream HTTP/1.1\r\n"
+            f"Host: 127.0.0.1\r\nAuthorization: Bearer {token}\r\n"
+            "Accept: text/event-stream\r\n\r\n"
+        ).encode()
+    )
+    await writer.drain()
+    await reader.readuntil(b"retry: 3000\n\n")
+    return reader, writer
+
+
+async def _run(connections: int, batch: int) -> None:
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (min(hard, max(soft, connections * 2 + 256)), hard))
+
+    streams = []
+    async with uvicorn_server({"HALL_STREAM_HEARTBEAT_SECONDS": "30"}, "--backlog", "8192") as server:
+        try:
+            async with httpx.AsyncClient(base_url=f"{server.url}{PREFIX}", timeout=30) as client:
+                tokens = {}
+                for role in ("seeker", "volunteer"):
+                    resp = await client.post("/auth/register", json={
+                        "email": f"stream-{role}@test.com", "password": "password123", "role": role,
+                    })
+                    tokens[role] = resp.json()["access_token"]
+
+                baseline = proc_status_mb(server.pid)
+                t0 = time.perf_counter()
+                for start in range(0, connections, batch):
+                    count = min(batch, connections - start)
+                    streams += await asyncio.gather(
+                        *(_open_stream(server.port, tokens["volunteer"]) for _ in range(count))
+                    )
+                connect_s = time.perf_counter() - t0
+                held = proc_status_mb(server.pid)
+                print(f"connections={len(streams)} connect={connect_s:.1f}s")
+                print(
+                    f"server RSS: idle={baseline:.1f}MB held={held:.1f}MB "
+                    f"per-conn={(held - baseline) * 1024 / max(1, len(streams)):.1f}KB"
+                )
+
+                async def wait_created(reader: asyncio.StreamReader) -> float:
+                    await reader.readuntil(b"event: created")
+                    return time.perf_counter()
+
+                waiters = [asyncio.create_task(wait_created(r)) for r, _ in streams]
+                t0 = time.perf_counter()
+                await client.post(
+                    "/help-requests",
+                    json={"text": "fan-out probe", "mode": "hall"},
+                    headers={"Authorization": f"Bearer {tokens['seeker']}"},
+                )
+                arrivals = await asyncio.wait_for(asyncio.gather(*waiters), timeout=120)
+                print(
+                    f"fan-out to all {len(arrivals)} connections: "
+                    f"{(max(arrivals) - t0) * 1000:.0f}ms (first {(min(arrivals) - t0) * 1000:.0f}ms)"
+                )
+        finally:
+            for _, writer in streams:
+                writer.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--connections", type=int, default=5000)
+    parser.add_argument("--batch", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(_run(args.connections, args.batch))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Bytes a volunteer downloads to render one hall page, originals vs variants.
+
+Seeds hall requests that each carry a phone-sized photo, fetches one hall
+page, then downloads every attachment as the original, the ``display``
+variant and the ``thumb`` variant:
+
+    uv run python -m benchmarks.image_variants --page-size 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import io
+import time
+
+from PIL import Image, ImageFilter
+
+from app.core.config import settings
+from app.modules.uploads.variants import renderer
+from benchmarks._harness import bench_client, register
+
+PREFIX = settings.API_V1_PREFIX
+
+
+def _phone_photo(seed: int, size: tuple[int, int] = (4032, 3024)) -> bytes:
+    """A noisy, softly blurred photo-like JPEG of roughly phone-camera size."""
+    small = Image.effect_noise((size[0] // 8, size[1] // 8), 60 + seed % 20).convert("RGB")
+    image = small.resize(size, Image.Resampling.BICUBIC).filter(ImageFilter.GaussianBlur(1))
+    buf = io.BytesIO()
+    image.save(buf, format="JPEG", quality=90)
+    return buf.getvalue()
+
+
+async def _run(page_size: int) -> None:
+    async with bench_client() as client:
+        seeker = await register(client, "variants-seeker@test.com", "seeker")
+        volunteer = await register(client, "variants-volunteer@test.com", "volunteer")
+
+        t0 = time.perf_counter()
+        for i in range(page_size):
+            photo = _phone_photo(i)
+            resp = await client.post(f"{PREFIX}/uploads/presign", headers=seeker, json={
+                "filename": f"IMG_{i:04d}.jpg", "mime_type": "image/jpeg", "size": len(photo),
+            })
+            file_id = resp.json()["file_id"]
+            resp = await client.put(
+                f"{PREFIX}/uploads/{file_id}/content",
+                content=photo,
+                headers={**seeker, "Content-Type": "image/jpeg"},
+            )
+            resp.raise_for_status()
+            await client.post(f"{PREFIX}/help-requests", headers=seeker, json={
+                "text": f"what is this #{i}", "mode": "hall", "image_file_ids": [file_id],
+            })
+        print(f"seeded {page_size} photo requests (incl. variant rendering) "
+              f"in {time.perf_counter() - t0:.1f}s, rendered={renderer.rendered}")
+
+        resp = await client.get(
+            f"{PREFIX}/help-requests/hall",
+            params={"page_size": page_size, "with_total": False},
+            headers=volunteer,
+        )
+        urls = [
+            attachment["file_url"]
+            for item in resp.json()["items"]
+            for attachment in item["attachments"]
+            if attachment["file_type"] == "image"
+        ]
+
+        for variant in (None, "display", "thumb"):
+            params = {"variant": variant} if variant else {}
+            total = 0
+            t0 = time.perf_counter()
+            for url in urls:
+                r = await client.get(f"{PREFIX}{url}", params=params, headers=volunteer)
+                r.raise_for_status()
+                total += len(r.content)
+            elapsed = (time.perf_counter() - t0) * 1000
+            print(f"{variant or 'original':>9}: {len(urls)} images "
+                  f"{total / 1024 / 1024:7.2f} MB/page  fetch={elapsed:.0f}ms")
+    renderer.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--page-size", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(_run(args.page_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Benchmark unrelated-endpoint latency during a login storm.
+
+Fires concurrent logins while a poller hits `/users/me`, once with bcrypt
+running inline on the event loop (the old behaviour) and once on the
+bounded hashing pool, and prints the poller's latency percentiles:
+
+    DEBUG=false uv run python -m benchmarks.login_storm --logins 200 --concurrency 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+from app.core import security
+from app.core.config import settings
+from benchmarks._harness import bench_client, percentile, register
+
+
+async def _inline(fn, *args):
+    return fn(*args)
+
+
+async def _storm(inline: bool, logins: int, concurrency: int) -> dict:
+    original_run = security.password_hash_pool.run
+    if inline:
+        security.password_hash_pool.run = _inline
+    try:
+        async with bench_client() as client:
+            headers = await register(client, "storm-seeker@test.com", "seeker")
+            done = asyncio.Event()
+            latencies: list[float] = []
+            statuses: dict[int, int] = {}
+
+            async def poller() -> None:
+                while not done.is_set():
+                    t0 = time.perf_counter()
+                    await client.get(f"{settings.API_V1_PREFIX}/users/me", headers=headers)
+                    latencies.append((time.perf_counter() - t0) * 1000)
+                    await asyncio.sleep(0.01)
+
+            semaphore = asyncio.Semaphore(concurrency)
+
+            async def login() -> None:
+                async with semaphore:
+                    resp = await client.post(
+                        f"{settings.API_V1_PREFIX}/auth/login",
+                        json={"account": "storm-seeker@test.com", "password": "password123"},
+                    )
+                    statuses[resp.status_code] = statuses.get(resp.status_code, 0) + 1
+
+            poll_task = asyncio.create_task(poller())
+            t0 = time.perf_counter()
+            await asyncio.gather(*(login() for _ in range(logins)))
+            elapsed = time.perf_counter() - t0
+            done.set()
+            await poll_task
+    finally:
+        security.password_hash_pool.run = original_run
+
+    return {"latencies": latencies, "statuses": statuses, "elapsed": elapsed}
+
+
+async def _run(logins: int, concurrency: int) -> None:
+    print(f"{'mode':>8} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} {'storm s':>8}  statuses")
+    for label, inline in (("inline", True), ("pool", False)):
+        result = await _storm(inline, logins, concurrency)
+        lat = result["latencies"]
+        print(
+            f"{label:>8} {percentile(lat, 50):>8.1f} {percentile(lat, 99):>8.1f} "
+            f"{max(lat, default=0):>8.1f} {result['elapsed']:>8.2f}  {result['statuses']}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(_run(args.logins, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
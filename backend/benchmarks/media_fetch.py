@@ -0,0 +1,88 @@
+"""Media-fetch throughput: authenticated content path vs signed URLs.
+
+Uploads a hall page worth of small images, then fetches them repeatedly with
+bounded concurrency through ``/uploads/{id}/content`` (JWT + user + upload
+lookups) and through the signed ``/uploads/media/{id}`` URLs handed out in
+request listings (HMAC check only):
+
+    uv run python -m benchmarks.media_fetch --images 20 --rounds 25
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import time
+
+from app.core.config import settings
+from benchmarks._harness import bench_client, percentile, register
+
+PREFIX = settings.API_V1_PREFIX
+
+
+async def _fetch_all(client, urls: list[str], headers: dict, concurrency: int) -> list[float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def fetch(url: str) -> None:
+        async with semaphore:
+            t0 = time.perf_counter()
+            resp = await client.get(url, headers=headers)
+            resp.raise_for_status()
+            latencies.append((time.perf_counter() - t0) * 1000)
+
+    await asyncio.gather(*(fetch(url) for url in urls))
+    return latencies
+
+
+async def _run(images: int, rounds: int, concurrency: int) -> None:
+    async with bench_client() as client:
+        seeker = await register(client, "media-seeker@test.com", "seeker")
+        volunteer = await register(client, "media-volunteer@test.com", "volunteer")
+        for i in range(images):
+            body = os.urandom(24 * 1024)
+            resp = await client.post(f"{PREFIX}/uploads/presign", headers=seeker, json={
+                "filename": f"p{i}.png", "mime_type": "image/png", "size": len(body),
+            })
+            file_id = resp.json()["file_id"]
+            await client.put(
+                f"{PREFIX}/uploads/{file_id}/content",
+                content=body,
+                headers={**seeker, "Content-Type": "image/png"},
+            )
+            await client.post(f"{PREFIX}/help-requests", headers=seeker, json={
+                "text": f"photo {i}", "mode": "hall", "image_file_ids": [file_id],
+            })
+
+        page = await client.get(
+            f"{PREFIX}/help-requests/hall",
+            params={"page_size": images, "with_total": False},
+            headers=volunteer,
+        )
+        attachments = [a for item in page.json()["items"] for a in item["attachments"]]
+        paths = {
+            "authenticated": ([f"{PREFIX}{a['file_url']}" for a in attachments], volunteer),
+            "signed": ([f"{PREFIX}{a['signed_url']}" for a in attachments], {}),
+        }
+
+        for name, (urls, headers) in paths.items():
+            await _fetch_all(client, urls, headers, concurrency)  # warm-up
+            t0 = time.perf_counter()
+            latencies = await _fetch_all(client, urls * rounds, headers, concurrency)
+            elapsed = time.perf_counter() - t0
+            print(f"{name:>13}: {len(latencies) / elapsed:7.0f} req/s  "
+                  f"p50={percentile(latencies, 50):.1f}ms p99={percentile(latencies, 99):.1f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--images", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=25)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+    asyncio.run(_run(args.images, args.rounds, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
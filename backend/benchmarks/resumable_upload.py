@@ -0,0 +1,128 @@
+"""Single-request vs resumable chunked uploads over a simulated lossy link.
+
+Connection drops are modelled as a Poisson process over bytes sent (``--loss``
+drops per MB on average). A single-request upload restarts from zero after a
+drop; a resumable upload asks ``HEAD .../chunks`` for the committed offset
+and continues. Resumable uploads really run against the app, including the
+truncated chunk that was in flight when the link dropped. Time-to-post is
+derived from the bytes sent and round trips at the given bandwidth and RTT:
+
+    uv run python -m benchmarks.resumable_upload --size-mb 50 --loss 0.03
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import random
+
+from app.core.config import settings
+from benchmarks._harness import bench_client, register
+
+PREFIX = settings.API_V1_PREFIX
+MB = 1024 * 1024
+MAX_ATTEMPTS = 200
+
+
+def _next_drop(rng: random.Random, loss_per_mb: float) -> float:
+    return rng.expovariate(loss_per_mb) * MB if loss_per_mb > 0 else float("inf")
+
+
+def _single_request(size: int, loss_per_mb: float, rng: random.Random) -> tuple[int, int, bool]:
+    """Bytes sent and requests made until one whole PUT gets through."""
+    sent = requests = 0
+    while requests < MAX_ATTEMPTS:
+        requests += 1
+        drop_at = _next_drop(rng, loss_per_mb)
+        if drop_at >= size:
+            return sent + size, requests, True
+        sent += int(drop_at)
+    return sent, requests, False
+
+
+async def _resumable(client, headers, content: bytes, chunk_size: int,
+                     loss_per_mb: float, rng: random.Random) -> tuple[int, int]:
+    resp = await client.post(f"{PREFIX}/uploads/presign", headers=headers, json={
+        "filename": "clip.mp4", "mime_type": "video/mp4", "size": len(content),
+    })
+    chunks_url = f"{PREFIX}{resp.json()['chunks_url']}"
+    sent = requests = offset = 0
+    until_drop = _next_drop(rng, loss_per_mb)
+    while offset < len(content):
+        body = content[offset: offset + chunk_size]
+        requests += 1
+        if until_drop < len(body):
+            # The link dropped mid-chunk: the server got a prefix of the body.
+            sent += int(until_drop)
+            await client.put(f"{chunks_url}/{offset}", content=body[: int(until_drop)], headers=headers)
+            requests += 1
+            head = await client.head(chunks_url, headers=headers)
+            offset = int(head.headers["upload-offset"])
+            until_drop = _next_drop(rng, loss_per_mb)
+            continue
+        until_drop -= len(body)
+        sent += len(body)
+        resp = await client.put(f"{chunks_url}/{offset}", content=body, headers=headers)
+        offset = resp.json()["offset"]
+    requests += 1
+    resp = await client.post(f"{chunks_url}/complete", headers=headers)
+    assert resp.json()["sha256"] == hashlib.sha256(content).hexdigest()
+    return sent, requests
+
+
+def _seconds(sent: int, requests: int, bandwidth_mbps: float, rtt_ms: float) -> float:
+    return sent * 8 / (bandwidth_mbps * 1_000_000) + requests * rtt_ms / 1000
+
+
+async def _run(args: argparse.Namespace) -> None:
+    size = args.size_mb * MB
+    rng = random.Random(args.seed)
+    content = rng.randbytes(size)
+    previous_max = settings.MAX_VIDEO_SIZE
+    settings.MAX_VIDEO_SIZE = max(previous_max, size)
+    totals = {"single": [0, 0, 0.0, 0], "resumable": [0, 0, 0.0, 0]}
+    try:
+        async with bench_client() as client:
+            headers = await register(client, "resumable@test.com", "seeker")
+            for _ in range(args.trials):
+                sent, requests, ok = _single_request(size, args.loss, rng)
+                row = totals["single"]
+                row[0] += sent
+                row[1] += requests
+                row[2] += _seconds(sent, requests, args.bandwidth_mbps, args.rtt_ms)
+                row[3] += 0 if ok else 1
+
+                sent, requests = await _resumable(
+                    client, headers, content, args.chunk_mb * MB, args.loss, rng
+                )
+                row = totals["resumable"]
+                row[0] += sent
+                row[1] += requests
+                row[2] += _seconds(sent, requests, args.bandwidth_mbps, args.rtt_ms)
+    finally:
+        settings.MAX_VIDEO_SIZE = previous_max
+
+    print(f"{args.trials} uploads of {args.size_mb}MB, {args.loss} drops/MB, "
+          f"{args.bandwidth_mbps}Mbps, rtt={args.rtt_ms}ms, chunk={args.chunk_mb}MB")
+    for name, (sent, requests, seconds, gave_up) in totals.items():
+        n = args.trials
+        print(f"{name:>9}: sent={sent / n / MB:7.1f}MB/upload "
+              f"(retry overhead {sent / n / size - 1:6.1%}) requests={requests / n:6.1f} "
+              f"time-to-post={seconds / n:6.1f}s" + (f" gave_up={gave_up}" if gave_up else ""))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size-mb", type=int, default=50)
+    parser.add_argument("--chunk-mb", type=int, default=1)
+    parser.add_argument("--loss", type=float, default=0.03, help="connection drops per MB sent")
+    parser.add_argument("--bandwidth-mbps", type=float, default=4.0)
+    parser.add_argument("--rtt-ms", type=float, default=250.0)
+    parser.add_argument("--trials", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
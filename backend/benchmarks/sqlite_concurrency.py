@@ -0,0 +1,112 @@
+"""Benchmark mixed hall reads and request creation against SQLite.
+
+Runs the same workload twice, with the default rollback journal and with the
+tuned engine profile from settings (WAL, busy_timeout, mmap, ...), and prints
+throughput and "database is locked" failures:
+
+    uv run python -m benchmarks.sqlite_concurrency --seconds 10 --readers 16 --writers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.db import Base, create_engine_from_settings
+from app.modules.auth.models import User
+import app.modules.help_requests.models  # noqa: F401
+from app.modules.help_requests import service
+from app.modules.help_requests.schemas import HelpRequestCreateRequest
+
+
+def _legacy_pragmas(dbapi_connection, _record) -> None:
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=DELETE")
+    cursor.execute("PRAGMA busy_timeout=0")
+    cursor.close()
+
+
+async def _workload(tuned: bool, seconds: float, readers: int, writers: int) -> dict:
+    tmp_dir = tempfile.mkdtemp(prefix="seeforme-bench-")
+    db_path = os.path.join(tmp_dir, "bench.db")
+    previous = settings.SQLITE_TUNING_ENABLED
+    settings.SQLITE_TUNING_ENABLED = tuned
+    engine = create_engine_from_settings(
+        f"sqlite+aiosqlite:///{db_path}",
+        echo=False,
+        pool_size=readers + writers,
+        max_overflow=0,
+    )
+    settings.SQLITE_TUNING_ENABLED = previous
+    if not tuned:
+        event.listen(engine.sync_engine, "connect", _legacy_pragmas)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with session_factory() as db:
+        seeker = User(role="seeker", email="bench@test.com", password_hash="x")
+        db.add(seeker)
+        await db.commit()
+        seeker_id = seeker.id
+
+    counters = {"reads": 0, "writes": 0, "locked": 0}
+    deadline = time.perf_counter() + seconds
+
+    async def reader() -> None:
+        while time.perf_counter() < deadline:
+            try:
+                async with session_factory() as db:
+                    await service.get_hall_requests(db, 1, 20, "open", with_total=False)
+                counters["reads"] += 1
+            except OperationalError:
+                counters["locked"] += 1
+
+    async def writer() -> None:
+        payload = HelpRequestCreateRequest(text="bench request", mode="hall")
+        while time.perf_counter() < deadline:
+            try:
+                async with session_factory() as db:
+                    await service.create_help_request(db, seeker_id, payload)
+                    await db.commit()
+                counters["writes"] += 1
+            except OperationalError:
+                counters["locked"] += 1
+
+    await asyncio.gather(*(reader() for _ in range(readers)), *(writer() for _ in range(writers)))
+    await engine.dispose()
+    for name in os.listdir(tmp_dir):
+        os.remove(os.path.join(tmp_dir, name))
+    os.rmdir(tmp_dir)
+    return counters
+
+
+async def _run(seconds: float, readers: int, writers: int) -> None:
+    print(f"{'profile':>10} {'reads/s':>10} {'writes/s':>10} {'locked':>8}")
+    for label, tuned in (("default", False), ("tuned", True)):
+        result = await _workload(tuned, seconds, readers, writers)
+        print(
+            f"{label:>10} {result['reads'] / seconds:>10.1f} "
+            f"{result['writes'] / seconds:>10.1f} {result['locked']:>8}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--readers", type=int, default=16)
+    parser.add_argument("--writers", type=int, default=4)
+    args = parser.parse_args()
+    asyncio.run(_run(args.seconds, args.readers, args.writers))
+
+
+if __name__ == "__main__":
+    main()
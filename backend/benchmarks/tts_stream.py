@@ -0,0 +1,95 @@
+"""Time to first audio byte: whole-reply synthesis vs sentence streaming.
+
+Uses the local TTS stand-in with a simulated engine latency (fixed cost per
+call plus a per-character cost). For each round a fresh multi-sentence reply
+is synthesized whole (what ``/synthesize`` does before its ``audio_url`` can
+be fetched) and as the chunk stream behind ``/synthesize/stream``; a final
+round repeats a reply whose sentences are already cached. Timed at the
+service layer because httpx's in-process ASGI transport buffers responses:
+
+    uv run python -m benchmarks.tts_stream --latency 0.08 --per-char 0.01
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import shutil
+import tempfile
+import time
+
+from app.core.config import settings
+from app.core.result_cache import close_result_caches
+from app.modules.ai_assist import service, streaming
+from benchmarks._harness import percentile
+
+SENTENCES = [
+    "你好，我是志愿者小李。",
+    "照片里是一张超市的价签。",
+    "最上面一行写着商品名称，是全脂牛奶。",
+    "规格是一升装，保质期到下个月十五号。",
+    "原价是十二块八，现在促销价九块九。",
+    "价签右下角还有一个会员价，是八块五。",
+    "如果你要买的话，货架在你右手边第二层。",
+    "还有别的需要帮忙的吗？",
+]
+
+
+async def _whole(text: str) -> tuple[float, float]:
+    t0 = time.perf_counter()
+    digest, _ = await service.synthesize(text, "zh-CN", 1.0)
+    await service.get_synthesized_audio(digest)
+    elapsed = (time.perf_counter() - t0) * 1000
+    return elapsed, elapsed
+
+
+async def _streamed(text: str) -> tuple[float, float]:
+    t0 = time.perf_counter()
+    stream = await streaming.open_speech_stream(text, "zh-CN", 1.0)
+    first = None
+    async for _ in stream.chunks:
+        if first is None:
+            first = time.perf_counter() - t0
+    return first * 1000, (time.perf_counter() - t0) * 1000
+
+
+async def _run(rounds: int, latency: float, per_char: float, concurrency: int) -> None:
+    settings.TTS_LOCAL_LATENCY_SECONDS = latency
+    settings.TTS_LOCAL_LATENCY_PER_CHAR_SECONDS = per_char
+    settings.TTS_STREAM_CONCURRENCY = concurrency
+    tmp_dir = tempfile.mkdtemp(prefix="seeforme-bench-")
+    settings.RESULT_CACHE_PATH = f"{tmp_dir}/results.db"
+    try:
+        results: dict[str, list[tuple[float, float]]] = {"whole": [], "streamed": []}
+        for i in range(rounds):
+            # Distinct text per round so every sentence is a cache miss; whole-reply
+            # results are cached under the full text, so they don't warm the sentences.
+            text = "".join(f"{s[:-1]}（{i}-{n}）{s[-1]}" for n, s in enumerate(SENTENCES))
+            results["whole"].append(await _whole(text))
+            results["streamed"].append(await _streamed(text))
+        results["streamed (cached)"] = [await _streamed(text) for _ in range(rounds)]
+    finally:
+        close_result_caches()
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    print(f"{len(text)} chars, {len(SENTENCES)} sentences, engine latency "
+          f"{latency * 1000:.0f}ms + {per_char * 1000:.0f}ms/char, window {concurrency}")
+    for name, samples in results.items():
+        ttfb = [s[0] for s in samples]
+        total = [s[1] for s in samples]
+        print(f"{name:>18}: first byte p50={percentile(ttfb, 50):7.1f}ms "
+              f"p99={percentile(ttfb, 99):7.1f}ms  complete p50={percentile(total, 50):7.1f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.08, help="seconds per engine call")
+    parser.add_argument("--per-char", type=float, default=0.01, help="extra seconds per character")
+    parser.add_argument("--concurrency", type=int, default=settings.TTS_STREAM_CONCURRENCY)
+    args = parser.parse_args()
+    asyncio.run(_run(args.rounds, args.latency, args.per_char, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
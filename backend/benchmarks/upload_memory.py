@@ -0,0 +1,78 @@
+"""Peak server memory while many large uploads stream in concurrently.
+
+Starts the app under uvicorn in a subprocess, presigns N video uploads and
+PUTs them all at once as raw request bodies generated on the fly, then
+reports the server's peak RSS (VmHWM) against its idle baseline:
+
+    uv run python -m benchmarks.upload_memory --uploads 20 --size-mb 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from benchmarks._harness import proc_status_mb, uvicorn_server
+
+PREFIX = "/api/v1"
+
+
+async def _body(size: int, chunk_size: int = 1024 * 1024):
+    chunk = b"\0" * chunk_size
+    sent = 0
+    while sent < size:
+        piece = chunk[: min(chunk_size, size - sent)]
+        sent += len(piece)
+        yield piece
+
+
+async def _run(uploads: int, size_mb: int) -> None:
+    size = size_mb * 1024 * 1024
+    env = {"MAX_VIDEO_SIZE": str(max(size, 50 * 1024 * 1024))}
+    async with uvicorn_server(env) as server:
+        async with httpx.AsyncClient(base_url=f"{server.url}{PREFIX}", timeout=300) as client:
+            resp = await client.post("/auth/register", json={
+                "email": "upload-bench@test.com", "password": "password123", "role": "seeker",
+            })
+            headers = {"Authorization": f"Bearer {resp.json()['access_token']}"}
+
+            file_ids = []
+            for i in range(uploads):
+                resp = await client.post("/uploads/presign", headers=headers, json={
+                    "filename": f"clip-{i}.mp4", "mime_type": "video/mp4", "size": size,
+                })
+                resp.raise_for_status()
+                file_ids.append(resp.json()["file_id"])
+
+            baseline = proc_status_mb(server.pid, "VmRSS")
+            t0 = time.perf_counter()
+            results = await asyncio.gather(*(
+                client.put(
+                    f"/uploads/{file_id}/content",
+                    content=_body(size),
+                    headers={**headers, "Content-Type": "video/mp4", "Content-Length": str(size)},
+                )
+                for file_id in file_ids
+            ))
+            elapsed = time.perf_counter() - t0
+            ok = sum(1 for r in results if r.status_code == 200)
+            peak = proc_status_mb(server.pid, "VmHWM")
+            print(f"uploads={uploads} x {size_mb}MB ok={ok} elapsed={elapsed:.1f}s "
+                  f"throughput={uploads * size_mb / elapsed:.0f}MB/s")
+            print(f"server RSS: idle={baseline:.1f}MB peak={peak:.1f}MB "
+                  f"growth={peak - baseline:.1f}MB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--uploads", type=int, default=20)
+    parser.add_argument("--size-mb", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(_run(args.uploads, args.size_mb))
+
+
+if __name__ == "__main__":
+    main()
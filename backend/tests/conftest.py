@@ -11,7 +11,8 @@ from httpx import ASGITransport, AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from app.core.config import settings
-from app.core.db import Base, get_db
+from app.core.db import Base, get_db, get_read_db
+from app.core.result_cache import close_result_caches
 
 # Import ALL models so Base.metadata knows about every table BEFORE create_all
 import app.modules.auth.models  # noqa: F401
@@ -21,6 +22,8 @@ import app.modules.replies.models  # noqa: F401
 import app.modules.feedback.models  # noqa: F401
 import app.modules.uploads.models  # noqa: F401
 import app.modules.moderation.models  # noqa: F401
+import app.modules.notifications.models  # noqa: F401
+import app.modules.ai_assist.models  # noqa: F401
 
 # Use a test-specific SQLite file
 TEST_DB_PATH = os.path.join(os.path.dirname(__file__), "test.db")
@@ -109,8 +112,20 @@ async def client() -> AsyncGenerator[AsyncClient, None]:
                     await session.rollback()
                     raise
 
+        read_session_factory = async_sessionmaker(
+            engine,
+            class_=AsyncSession,
+            autoflush=False,
+            expire_on_commit=False,
+        )
+
+        async def _override_get_read_db():
+            async with read_session_factory() as session:
+                yield session
+
         test_app = _build_app()
         test_app.dependency_overrides[get_db] = _override_get_db
+        test_app.dependency_overrides[get_read_db] = _override_get_read_db
 
         transport = ASGITransport(app=test_app)
         async with AsyncClient(transport=transport, base_url="http://test") as ac:
@@ -122,6 +137,7 @@ async def client() -> AsyncGenerator[AsyncClient, None]:
             await conn.run_sync(Base.metadata.drop_all)
     finally:
         await engine.dispose()
+        close_result_caches()
         settings.UPLOAD_DIR = previous_upload_dir
         shutil.rmtree(TEST_UPLOAD_DIR, ignore_errors=True)
         try:
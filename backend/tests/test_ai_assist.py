@@ -1,8 +1,10 @@
-"""Tests for AI assist: transcribe and synthesize endpoints."""
+"""Tests for AI assist: transcribe and synthesize endpoints, transcription jobs."""
 
 import pytest
 from httpx import AsyncClient
 
+from app.modules.ai_assist.engines import SpeechToTextEngine
+
 
 async def _register_and_get_token(client: AsyncClient, email: str, role: str) -> str:
     resp = await client.post("/api/v1/auth/register", json={
@@ -57,3 +59,297 @@ async def test_synthesize_requires_auth(client: AsyncClient):
         "text": "hello",
     })
     assert resp.status_code == 403 or resp.status_code == 401
+
+
+async def _upload_voice(client: AsyncClient, token: str, content: bytes) -> str:
+    presign = await client.post("/api/v1/uploads/presign", json={
+        "filename": "voice.m4a", "mime_type": "audio/x-m4a", "size": len(content),
+    }, headers=_auth(token))
+    file_id = presign.json()["file_id"]
+    put = await client.put(
+        f"/api/v1/uploads/{file_id}/content",
+        content=content,
+        headers={**_auth(token), "Content-Type": "audio/x-m4a"},
+    )
+    assert put.status_code == 200
+    return file_id
+
+
+class _FailingEngine(SpeechToTextEngine):
+    name = "failing"
+
+    async def transcribe(self, audio, mime_type, language):
+        raise RuntimeError("engine unavailable")
+
+
+@pytest.mark.asyncio
+async def test_voice_request_is_transcribed_in_background(client: AsyncClient):
+    """Creating a voice request queues jobs; a worker fills in transcribed_text."""
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+    from app.modules.ai_assist.jobs import worker_pool
+    from tests.conftest import TEST_DATABASE_URL
+
+    seeker = await _register_and_get_token(client, "stt-seeker@test.com", "seeker")
+    volunteer = await _register_and_get_token(client, "stt-vol@test.com", "volunteer")
+    other = await _register_and_get_token(client, "stt-other@test.com", "seeker")
+    first = await _upload_voice(client, seeker, b"first-voice" * 50)
+    second = await _upload_voice(client, seeker, b"second-voice" * 50)
+
+    created = await client.post("/api/v1/help-requests", json={
+        "voice_file_ids": [first, second, "not-an-upload"],
+    }, headers=_auth(seeker))
+    assert created.status_code == 201
+    request_id = created.json()["id"]
+    assert created.json()["transcribed_text"] is None
+
+    listed = await client.get(
+        "/api/v1/ai-assist/jobs", params={"request_id": request_id}, headers=_auth(seeker)
+    )
+    assert listed.status_code == 200
+    jobs = listed.json()["items"]
+    assert [job["file_id"] for job in jobs] == [first, second]
+    assert {job["status"] for job in jobs} == {"queued"}
+
+    engine = create_async_engine(TEST_DATABASE_URL)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    try:
+        assert await worker_pool.process_next_job(session_factory)
+        assert await worker_pool.process_next_job(session_factory)
+        assert not await worker_pool.process_next_job(session_factory)
+    finally:
+        await engine.dispose()
+
+    job = await client.get(f"/api/v1/ai-assist/jobs/{jobs[0]['id']}", headers=_auth(seeker))
+    assert job.status_code == 200
+    assert job.json()["status"] == "succeeded"
+    assert job.json()["attempts"] == 1
+    assert job.json()["engine"] == "local"
+    assert job.json()["text"].startswith("[Local transcription ")
+    second_text = (
+        await client.get(f"/api/v1/ai-assist/jobs/{jobs[1]['id']}", headers=_auth(volunteer))
+    ).json()["text"]
+    assert second_text != job.json()["text"]
+
+    detail = await client.get(f"/api/v1/help-requests/{request_id}", headers=_auth(seeker))
+    assert detail.json()["transcribed_text"] == f"{job.json()['text']}\n{second_text}"
+
+    forbidden = await client.get(f"/api/v1/ai-assist/jobs/{jobs[0]['id']}", headers=_auth(other))
+    assert forbidden.status_code == 403
+    missing = await client.get("/api/v1/ai-assist/jobs/no-such-job", headers=_auth(seeker))
+    assert missing.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_transcription_jobs_retry_then_fail(client: AsyncClient, monkeypatch):
+    """Engine errors are retried up to STT_MAX_ATTEMPTS; missing content fails at once."""
+    from sqlalchemy import delete
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+    from app.core.config import settings
+    from app.modules.ai_assist import jobs as jobs_module
+    from app.modules.uploads.models import UploadedFile
+    from tests.conftest import TEST_DATABASE_URL
+
+    monkeypatch.setattr(settings, "STT_MAX_ATTEMPTS", 2)
+    monkeypatch.setattr(settings, "STT_RETRY_BACKOFF_SECONDS", 0.0)
+    monkeypatch.setattr(settings, "STT_ENGINE", "tests.test_ai_assist:_FailingEngine")
+
+    seeker = await _register_and_get_token(client, "stt-retry@test.com", "seeker")
+    flaky = await _upload_voice(client, seeker, b"flaky-voice" * 50)
+    gone = await _upload_voice(client, seeker, b"gone-voice" * 50)
+    created = await client.post("/api/v1/help-requests", json={
+        "voice_file_ids": [flaky, gone],
+    }, headers=_auth(seeker))
+    request_id = created.json()["id"]
+
+    engine = create_async_engine(TEST_DATABASE_URL)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    try:
+        async with session_factory() as db:
+            await db.execute(delete(UploadedFile).where(UploadedFile.id == gone))
+            await db.commit()
+        while await jobs_module.worker_pool.process_next_job(session_factory):
+            pass
+    finally:
+        await engine.dispose()
+
+    jobs = (
+        await client.get(
+            "/api/v1/ai-assist/jobs", params={"request_id": request_id}, headers=_auth(seeker)
+        )
+    ).json()["items"]
+    assert [(job["status"], job["attempts"]) for job in jobs] == [("failed", 2), ("failed", 1)]
+    assert jobs[0]["error"] == "engine unavailable"
+    assert jobs[1]["error"] == "Voice upload not found"
+    assert jobs[0]["finished_at"] is not None
+
+    detail = await client.get(f"/api/v1/help-requests/{request_id}", headers=_auth(seeker))
+    assert detail.json()["transcribed_text"] is None
+
+
+@pytest.mark.asyncio
+async def test_expired_leases_count_as_attempts(client: AsyncClient, monkeypatch):
+    """A job whose worker keeps dying is failed once its attempts are spent."""
+    from datetime import datetime, timedelta, timezone
+
+    from sqlalchemy import update
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+    from app.core.config import settings
+    from app.modules.ai_assist import jobs as jobs_module
+    from app.modules.ai_assist.models import TranscriptionJob
+    from tests.conftest import TEST_DATABASE_URL
+
+    monkeypatch.setattr(settings, "STT_MAX_ATTEMPTS", 2)
+
+    seeker = await _register_and_get_token(client, "stt-lease@test.com", "seeker")
+    voice = await _upload_voice(client, seeker, b"crashing-voice" * 50)
+    created = await client.post("/api/v1/help-requests", json={
+        "voice_file_ids": [voice],
+    }, headers=_auth(seeker))
+    request_id = created.json()["id"]
+
+    engine = create_async_engine(TEST_DATABASE_URL)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    try:
+        for attempt in (1, 2):
+            async with session_factory() as db:
+                claimed = await jobs_module._claim_next(db, datetime.now(timezone.utc))
+                assert claimed.attempts == attempt
+                # The worker dies mid-job: its lease simply runs out.
+                await db.execute(
+                    update(TranscriptionJob)
+                    .where(TranscriptionJob.id == claimed.id)
+                    .values(run_after=datetime.now(timezone.utc) - timedelta(seconds=1))
+                )
+                await db.commit()
+
+        failed_before = jobs_module.worker_pool.failed
+        assert await jobs_module.worker_pool.process_next_job(session_factory) is False
+        assert jobs_module.worker_pool.failed == failed_before + 1
+    finally:
+        await engine.dispose()
+
+    jobs = (
+        await client.get(
+            "/api/v1/ai-assist/jobs", params={"request_id": request_id}, headers=_auth(seeker)
+        )
+    ).json()["items"]
+    assert [(job["status"], job["attempts"]) for job in jobs] == [("failed", 2)]
+    assert jobs[0]["error"] == "Lease expired on the final attempt"
+    assert jobs[0]["finished_at"] is not None
+
+
+@pytest.mark.asyncio
+async def test_synthesized_audio_is_cached_and_addressable(client: AsyncClient):
+    """Repeated phrases reuse audio, across processes too, behind a stable URL."""
+    from app.core import result_cache
+
+    token = await _register_and_get_token(client, "tts-cache@test.com", "seeker")
+    payload = {"text": "请稍等，志愿者马上到", "language": "zh-CN", "speed": 1.0}
+
+    def counts() -> dict:
+        return result_cache.cache_stats.stats().get(
+            "tts:local", {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+        )
+
+    before = counts()
+    first = (await client.post("/api/v1/ai-assist/synthesize", json=payload, headers=_auth(token))).json()
+    second = (await client.post("/api/v1/ai-assist/synthesize", json=payload, headers=_auth(token))).json()
+    assert first == second
+    assert first["audio_url"].startswith("/ai-assist/audio/")
+
+    # A fresh cache object (as after a restart) still finds the result on disk.
+    result_cache.close_result_caches()
+    third = (await client.post("/api/v1/ai-assist/synthesize", json=payload, headers=_auth(token))).json()
+    assert third == first
+    after = counts()
+    assert (after["misses"] - before["misses"], after["memory_hits"] - before["memory_hits"]) == (1, 1)
+    assert after["disk_hits"] - before["disk_hits"] == 1
+
+    faster = await client.post(
+        "/api/v1/ai-assist/synthesize", json={**payload, "speed": 1.5}, headers=_auth(token)
+    )
+    assert faster.json()["audio_url"] != first["audio_url"]
+
+    audio = await client.get(f"/api/v1{first['audio_url']}", headers=_auth(token))
+    assert audio.status_code == 200
+    assert audio.headers["content-type"] == "audio/wav"
+    assert audio.content[:4] == b"RIFF"
+
+    missing = await client.get("/api/v1/ai-assist/audio/" + "0" * 64, headers=_auth(token))
+    assert missing.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_long_speech_is_addressable_without_disk_cache(client: AsyncClient, monkeypatch):
+    """Memory-only caching keeps audio over the per-value cap, or its URL would 404."""
+    from app.core import result_cache
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "RESULT_CACHE_PATH", "")
+    token = await _register_and_get_token(client, "tts-memory@test.com", "seeker")
+    payload = {"text": "志愿者正在赶来，请在原地稍等片刻。" * 12, "language": "zh-CN", "speed": 1.0}
+    try:
+        data = (
+            await client.post("/api/v1/ai-assist/synthesize", json=payload, headers=_auth(token))
+        ).json()
+        audio = await client.get(f"/api/v1{data['audio_url']}", headers=_auth(token))
+    finally:
+        result_cache.close_result_caches()
+
+    assert audio.status_code == 200
+    assert len(audio.content) > settings.RESULT_CACHE_MEMORY_MAX_VALUE_BYTES
+
+
+@pytest.mark.asyncio
+async def test_synthesize_stream_is_sentence_by_sentence(client: AsyncClient, monkeypatch):
+    """Streamed speech is one playable WAV whose sentences reuse cached audio."""
+    import io
+    import wave
+
+    from app.core import result_cache
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "TTS_STREAM_CONCURRENCY", 2)
+    token = await _register_and_get_token(client, "tts-stream@test.com", "seeker")
+    text = "你好！前面有台阶，请小心。Turn left here. 到了"
+
+    def misses() -> int:
+        return result_cache.cache_stats.stats().get("tts:local", {"misses": 0})["misses"]
+
+    before = misses()
+    async with client.stream(
+        "POST", "/api/v1/ai-assist/synthesize/stream", json={"text": text}, headers=_auth(token)
+    ) as resp:
+        assert resp.status_code == 200
+        assert resp.headers["content-type"] == "audio/wav"
+        assert resp.headers["x-speech-segments"] == "4"
+        body = b"".join([chunk async for chunk in resp.aiter_bytes()])
+    assert misses() - before == 4
+
+    # Lengths in the streamed header are unknown; patch them so wave can read it.
+    patched = bytearray(body)
+    patched[4:8] = (len(body) - 8).to_bytes(4, "little")
+    patched[40:44] = (len(body) - 44).to_bytes(4, "little")
+    with wave.open(io.BytesIO(bytes(patched))) as wav:
+        seconds = wav.getnframes() / wav.getframerate()
+    spoken = len(text.replace(" 到了", "到了"))  # the space between sentences is dropped
+    assert seconds == pytest.approx(spoken * 0.15, abs=0.01)
+
+    # A reply sharing a sentence only synthesizes the new one.
+    before = misses()
+    async with client.stream(
+        "POST",
+        "/api/v1/ai-assist/synthesize/stream",
+        json={"text": "前面有台阶，请小心。再见"},
+        headers=_auth(token),
+    ) as resp:
+        await resp.aread()
+    assert misses() - before == 1
+
+    empty = await client.post(
+        "/api/v1/ai-assist/synthesize/stream", json={"text": "  "}, headers=_auth(token)
+    )
+    assert empty.status_code == 422
@@ -0,0 +1,69 @@
+"""Tests for claiming help requests."""
+
+import asyncio
+
+import pytest
+from httpx import AsyncClient
+
+
+async def _register_and_get_token(client: AsyncClient, email: str, role: str) -> str:
+    resp = await client.post("/api/v1/auth/register", json={
+        "email": email,
+        "password": "password123",
+        "role": role,
+    })
+    return resp.json()["access_token"]
+
+
+def _auth(token: str) -> dict:
+    return {"Authorization": f"Bearer {token}"}
+
+
+async def _create_request(client: AsyncClient, seeker_token: str) -> str:
+    resp = await client.post("/api/v1/help-requests", json={
+        "text": "Please read this label",
+        "mode": "hall",
+    }, headers=_auth(seeker_token))
+    return resp.json()["id"]
+
+
+@pytest.mark.asyncio
+async def test_second_claim_conflicts(client: AsyncClient):
+    """Claiming an already-claimed request returns 409."""
+    seeker_token = await _register_and_get_token(client, "claim_seeker@test.com", "seeker")
+    first_token = await _register_and_get_token(client, "claim_vol1@test.com", "volunteer")
+    second_token = await _register_and_get_token(client, "claim_vol2@test.com", "volunteer")
+    request_id = await _create_request(client, seeker_token)
+
+    first = await client.post(f"/api/v1/help-requests/{request_id}/claim", headers=_auth(first_token))
+    second = await client.post(f"/api/v1/help-requests/{request_id}/claim", headers=_auth(second_token))
+
+    assert first.status_code == 200
+    assert second.status_code == 409
+    assert second.json()["code"] == 1005
+
+
+@pytest.mark.asyncio
+async def test_concurrent_claims_have_single_winner(client: AsyncClient):
+    """Racing volunteers produce exactly one winner and no server errors."""
+    seeker_token = await _register_and_get_token(client, "race_seeker@test.com", "seeker")
+    tokens = [
+        await _register_and_get_token(client, f"race_vol{i}@test.com", "volunteer")
+        for i in range(5)
+    ]
+    request_id = await _create_request(client, seeker_token)
+
+    responses = await asyncio.gather(*(
+        client.post(f"/api/v1/help-requests/{request_id}/claim", headers=_auth(token))
+        for token in tokens
+    ))
+    codes = sorted(resp.status_code for resp in responses)
+    assert codes == [200, 409, 409, 409, 409]
+
+
+@pytest.mark.asyncio
+async def test_claim_missing_request(client: AsyncClient):
+    """Claiming an unknown request is still a client error."""
+    token = await _register_and_get_token(client, "claim_missing@test.com", "volunteer")
+    resp = await client.post("/api/v1/help-requests/does-not-exist/claim", headers=_auth(token))
+    assert resp.status_code == 400
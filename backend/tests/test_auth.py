@@ -76,3 +76,84 @@ async def test_login_invalid_password(client: AsyncClient):
         "password": "wrongpassword",
     })
     assert resp.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_current_user_is_served_from_cache(client: AsyncClient):
+    """Repeated authenticated calls should hit the user cache."""
+    from app.core.security import user_cache
+
+    resp = await client.post("/api/v1/auth/register", json={
+        "email": "cached@test.com",
+        "password": "password123",
+        "role": "seeker",
+    })
+    headers = {"Authorization": f"Bearer {resp.json()['access_token']}"}
+
+    first = await client.get("/api/v1/users/me", headers=headers)
+    hits_before = user_cache.hits
+    second = await client.get("/api/v1/users/me", headers=headers)
+
+    assert first.status_code == 200
+    assert second.status_code == 200
+    assert second.json() == first.json()
+    assert user_cache.hits == hits_before + 1
+
+
+@pytest.mark.asyncio
+async def test_role_or_active_change_invalidates_cached_user(client: AsyncClient):
+    """Committed role/active changes evict the cached identity; rolled-back ones do not."""
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+    from app.core.security import AuthenticatedUser, user_cache
+    from app.modules.auth.models import User
+    from tests.conftest import TEST_DATABASE_URL
+
+    cached = AuthenticatedUser(id="cache-user-1", role="seeker")
+    engine = create_async_engine(TEST_DATABASE_URL)
+    try:
+        async with AsyncSession(engine, expire_on_commit=False) as db:
+            user = User(id=cached.id, role="seeker", password_hash="x", is_active=True)
+            db.add(user)
+            await db.commit()
+
+            user_cache.set(cached.id, cached)
+            user.is_active = False
+            await db.flush()
+            assert user_cache.get(cached.id) == cached
+            await db.commit()
+            assert user_cache.get(cached.id) is None
+
+            user_cache.set(cached.id, cached)
+            user.role = "volunteer"
+            await db.flush()
+            await db.rollback()
+            assert user_cache.get(cached.id) == cached
+
+            user = await db.get(User, cached.id)
+            user.role = "volunteer"
+            await db.commit()
+            assert user_cache.get(cached.id) is None
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_password_hashing_sheds_load_when_saturated(client: AsyncClient):
+    """A full hashing queue should fail fast with 503 and Retry-After."""
+    from app.core.security import password_hash_pool
+
+    previous = password_hash_pool.max_pending
+    password_hash_pool.max_pending = 0
+    try:
+        resp = await client.post("/api/v1/auth/register", json={
+            "email": "storm@test.com",
+            "password": "password123",
+            "role": "seeker",
+        })
+    finally:
+        password_hash_pool.max_pending = previous
+
+    assert resp.status_code == 503
+    assert resp.headers["retry-after"] == str(password_hash_pool.retry_after)
+    assert resp.json()["code"] == 1008
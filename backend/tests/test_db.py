@@ -0,0 +1,68 @@
+"""Tests for database engine configuration."""
+
+import os
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.core.config import settings
+from app.core.db import create_engine_from_settings, create_read_engine_from_settings
+
+PROFILE_DB_PATH = os.path.join(os.path.dirname(__file__), "test_profile.db")
+
+
+@pytest.mark.asyncio
+async def test_sqlite_engine_profile_applies_pragmas():
+    """Every new SQLite connection should run with the configured pragmas."""
+    engine = create_engine_from_settings(f"sqlite+aiosqlite:///{PROFILE_DB_PATH}", echo=False)
+    try:
+        async with engine.connect() as conn:
+            journal_mode = (await conn.execute(text("PRAGMA journal_mode"))).scalar()
+            synchronous = (await conn.execute(text("PRAGMA synchronous"))).scalar()
+            busy_timeout = (await conn.execute(text("PRAGMA busy_timeout"))).scalar()
+            cache_size = (await conn.execute(text("PRAGMA cache_size"))).scalar()
+            temp_store = (await conn.execute(text("PRAGMA temp_store"))).scalar()
+
+        assert journal_mode.lower() == settings.SQLITE_JOURNAL_MODE.lower()
+        assert synchronous == 1  # NORMAL
+        assert busy_timeout == settings.SQLITE_BUSY_TIMEOUT_MS
+        assert cache_size == settings.SQLITE_CACHE_SIZE
+        assert temp_store == 2  # MEMORY
+        assert engine.pool.size() == settings.DB_POOL_SIZE
+    finally:
+        await engine.dispose()
+        _remove_profile_db()
+
+
+@pytest.mark.asyncio
+async def test_read_engine_is_separate_and_query_only():
+    """The read engine gets its own pool and refuses writes."""
+    url = f"sqlite+aiosqlite:///{PROFILE_DB_PATH}"
+    previous = settings.READ_DATABASE_URL
+    settings.READ_DATABASE_URL = url
+    write_engine = create_engine_from_settings(url, echo=False)
+    read_engine = create_read_engine_from_settings(write_engine)
+    try:
+        assert read_engine is not write_engine
+        async with write_engine.begin() as conn:
+            await conn.execute(text("CREATE TABLE probe (id INTEGER PRIMARY KEY)"))
+            await conn.execute(text("INSERT INTO probe (id) VALUES (1)"))
+
+        async with read_engine.connect() as conn:
+            assert (await conn.execute(text("SELECT count(*) FROM probe"))).scalar() == 1
+            with pytest.raises(OperationalError):
+                await conn.execute(text("INSERT INTO probe (id) VALUES (2)"))
+    finally:
+        settings.READ_DATABASE_URL = previous
+        await read_engine.dispose()
+        await write_engine.dispose()
+        _remove_profile_db()
+
+
+def _remove_profile_db() -> None:
+    for suffix in ("", "-wal", "-shm"):
+        try:
+            os.remove(PROFILE_DB_PATH + suffix)
+        except OSError:
+            pass
@@ -0,0 +1,151 @@
+"""Tests for the hall event broker and the events published by services."""
+
+import pytest
+from httpx import AsyncClient
+
+from app.core.pubsub import Broker, broker
+from app.modules.help_requests.service import HALL_EVENTS_TOPIC
+
+
+async def _register_and_get_token(client: AsyncClient, email: str, role: str) -> str:
+    resp = await client.post("/api/v1/auth/register", json={
+        "email": email,
+        "password": "password123",
+        "role": role,
+    })
+    return resp.json()["access_token"]
+
+
+def _auth(token: str) -> dict:
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _drain(subscription) -> list[dict]:
+    events = []
+    while not subscription.queue.empty():
+        events.append(subscription.queue.get_nowait())
+    return events
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_is_dropped():
+    """A full queue detaches the subscriber instead of blocking publishers."""
+    local_broker = Broker()
+    slow = local_broker.subscribe("topic", maxsize=2)
+    fast = local_broker.subscribe("topic", maxsize=10)
+
+    for i in range(3):
+        local_broker.publish("topic", {"n": i})
+
+    assert slow.dropped is True
+    assert fast.dropped is False
+    assert [e["n"] for e in _drain(fast)] == [0, 1, 2]
+    assert local_broker.subscriber_count("topic") == 1
+    assert local_broker.stats()["dropped_subscribers"] == 1
+
+
+@pytest.mark.asyncio
+async def test_hall_lifecycle_publishes_events(client: AsyncClient):
+    """Create, claim and cancel are announced to hall subscribers after commit."""
+    seeker_token = await _register_and_get_token(client, "stream_seeker@test.com", "seeker")
+    volunteer_token = await _register_and_get_token(client, "stream_vol@test.com", "volunteer")
+
+    subscription = broker.subscribe(HALL_EVENTS_TOPIC)
+    try:
+        first = await client.post("/api/v1/help-requests", json={
+            "text": "stream me", "mode": "hall",
+        }, headers=_auth(seeker_token))
+        second = await client.post("/api/v1/help-requests", json={
+            "text": "cancel me", "mode": "hall",
+        }, headers=_auth(seeker_token))
+        await client.post(
+            f"/api/v1/help-requests/{first.json()['id']}/claim", headers=_auth(volunteer_token)
+        )
+        await client.post(
+            f"/api/v1/help-requests/{second.json()['id']}/cancel", headers=_auth(seeker_token)
+        )
+        # A losing claim rolls back and must not be announced.
+        await client.post(
+            f"/api/v1/help-requests/{first.json()['id']}/claim", headers=_auth(volunteer_token)
+        )
+
+        events = [(e["type"], e["request_id"]) for e in _drain(subscription)]
+    finally:
+        subscription.close()
+
+    assert events == [
+        ("created", first.json()["id"]),
+        ("created", second.json()["id"]),
+        ("claimed", first.json()["id"]),
+        ("cancelled", second.json()["id"]),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_hall_stream_endpoint(client: AsyncClient, monkeypatch):
+    """The SSE endpoint is volunteer-only, frames events, pings and ends on reset."""
+    import asyncio
+    import json
+
+    from app.core.config import settings
+    from app.core.db import get_read_db
+    from app.core.security import user_cache
+
+    monkeypatch.setattr(settings, "HALL_STREAM_QUEUE_SIZE", 2)
+    monkeypatch.setattr(settings, "HALL_STREAM_HEARTBEAT_SECONDS", 0.01)
+    seeker_token = await _register_and_get_token(client, "sse_seeker@test.com", "seeker")
+    volunteer_token = await _register_and_get_token(client, "sse_vol@test.com", "volunteer")
+    url = "/api/v1/help-requests/hall/stream"
+
+    assert (await client.get(url)).status_code in (401, 403)
+    assert (await client.get(url, headers=_auth(seeker_token))).status_code == 403
+
+    app = client._transport.app
+    open_read_db = app.dependency_overrides[get_read_db]
+    read_sessions = []
+
+    async def _tracked_read_db():
+        async for session in open_read_db():
+            read_sessions.append(session)
+            yield session
+
+    monkeypatch.setitem(app.dependency_overrides, get_read_db, _tracked_read_db)
+    user_cache.clear()  # make the role check query the database
+
+    async def wait_for(condition) -> None:
+        for _ in range(200):
+            if condition():
+                return
+            await asyncio.sleep(0.01)
+        raise AssertionError("timed out")
+
+    stream = asyncio.create_task(client.get(url, headers=_auth(volunteer_token)))
+    try:
+        await wait_for(lambda: broker.subscriber_count(HALL_EVENTS_TOPIC) == 1)
+        # The auth lookup's session is released instead of being held open.
+        assert len(read_sessions) == 1
+        assert not read_sessions[0].in_transaction()
+
+        await asyncio.sleep(0.05)  # idle: heartbeats
+        created = await client.post("/api/v1/help-requests", json={
+            "text": "live", "mode": "hall",
+        }, headers=_auth(seeker_token))
+        await asyncio.sleep(0.05)
+        for n in range(3):  # overflow the 2-slot queue in one go
+            broker.publish(HALL_EVENTS_TOPIC, {"type": "created", "request_id": f"burst-{n}"})
+        resp = await asyncio.wait_for(stream, 5)
+    finally:
+        stream.cancel()
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/event-stream")
+    assert resp.headers["cache-control"] == "no-cache"
+    frames = [frame for frame in resp.text.split("\n\n") if frame]
+    assert frames[0] == "retry: 3000"
+    assert ": ping" in frames
+    events = [frame.split("\n") for frame in frames if frame.startswith("event:")]
+    assert events[0][0] == "event: created"
+    payload = json.loads(events[0][1].removeprefix("data: "))
+    assert (payload["type"], payload["request_id"]) == ("created", created.json()["id"])
+    assert events[-1] == ["event: reset", "data: {}"]
+    assert broker.subscriber_count(HALL_EVENTS_TOPIC) == 0
@@ -189,3 +189,117 @@ async def test_request_attachments_include_file_url(client: AsyncClient):
     data = create_resp.json()
     assert any(att["file_url"] == "/uploads/img-file-1/content" for att in data["attachments"])
     assert any(att["file_url"] == "/uploads/voice-file-1/content" for att in data["attachments"])
+
+
+@pytest.mark.asyncio
+async def test_hall_cursor_pagination(client: AsyncClient):
+    """Cursor mode should walk the hall without gaps or duplicates."""
+    seeker_token = await _register_and_get_token(client, "cursor_seeker@test.com", "seeker")
+    volunteer_token = await _register_and_get_token(client, "cursor_vol@test.com", "volunteer")
+
+    created_ids = []
+    for i in range(5):
+        resp = await client.post(
+            "/api/v1/help-requests",
+            json={"text": f"cursor request {i}", "mode": "hall", "priority": i % 2},
+            headers=_auth(seeker_token),
+        )
+        created_ids.append(resp.json()["id"])
+
+    first = await client.get(
+        "/api/v1/help-requests/hall?page_size=2&with_total=false",
+        headers=_auth(volunteer_token),
+    )
+    assert first.status_code == 200
+    body = first.json()
+    assert body["total"] is None
+    seen = [item["id"] for item in body["items"]]
+    cursor = body["next_cursor"]
+    assert cursor
+
+    while cursor:
+        resp = await client.get(
+            "/api/v1/help-requests/hall",
+            params={"page_size": 2, "cursor": cursor},
+            headers=_auth(volunteer_token),
+        )
+        assert resp.status_code == 200
+        body = resp.json()
+        seen.extend(item["id"] for item in body["items"])
+        cursor = body["next_cursor"]
+
+    assert sorted(seen) == sorted(created_ids)
+    assert len(seen) == len(set(seen))
+    assert body["total"] == 5
+
+
+@pytest.mark.asyncio
+async def test_mine_rejects_invalid_cursor(client: AsyncClient):
+    """A malformed cursor should be a 400, not a server error."""
+    token = await _register_and_get_token(client, "bad_cursor@test.com", "seeker")
+
+    resp = await client.get(
+        "/api/v1/help-requests/mine?cursor=not-a-cursor",
+        headers=_auth(token),
+    )
+    assert resp.status_code == 400
+
+
+async def _upload(client: AsyncClient, token: str, filename: str, mime_type: str, content: bytes) -> str:
+    presign = await client.post("/api/v1/uploads/presign", json={
+        "filename": filename, "mime_type": mime_type, "size": len(content),
+    }, headers=_auth(token))
+    file_id = presign.json()["file_id"]
+    await client.put(
+        f"/api/v1/uploads/{file_id}/content",
+        content=content,
+        headers={**_auth(token), "Content-Type": mime_type},
+    )
+    return file_id
+
+
+@pytest.mark.asyncio
+async def test_media_bundle_streams_attachments_as_zip(client: AsyncClient):
+    """All attachments arrive in one zip, as originals or thumbnails."""
+    import io
+    import json
+    import zipfile
+
+    Image = pytest.importorskip("PIL.Image")
+
+    seeker = await _register_and_get_token(client, "bundle-seeker@test.com", "seeker")
+    volunteer = await _register_and_get_token(client, "bundle-vol@test.com", "volunteer")
+    other = await _register_and_get_token(client, "bundle-other@test.com", "seeker")
+
+    buffer = io.BytesIO()
+    Image.new("RGB", (1200, 900), (20, 120, 200)).save(buffer, format="JPEG")
+    photo = buffer.getvalue()
+    photo_id = await _upload(client, seeker, "label.jpg", "image/jpeg", photo)
+    png_id = await _upload(client, seeker, "note.png", "image/png", b"not-really-a-png")
+    create = await client.post("/api/v1/help-requests", json={
+        "text": "what is this?", "mode": "hall", "image_file_ids": [photo_id, png_id, "missing"],
+    }, headers=_auth(seeker))
+    url = f"/api/v1/help-requests/{create.json()['id']}/media-bundle"
+
+    resp = await client.get(url, headers=_auth(volunteer))
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/zip"
+    archive = zipfile.ZipFile(io.BytesIO(resp.content))
+    assert archive.testzip() is None
+    manifest = json.loads(archive.read("manifest.json"))
+    entries = {item.get("file_id"): item["entry"] for item in manifest["items"]}
+    assert archive.read(entries[photo_id]) == photo
+    assert archive.read(entries[png_id]) == b"not-really-a-png"
+    assert [item["entry"] for item in manifest["items"] if "file_id" not in item] == [None]
+
+    thumbs = await client.get(url, params={"variant": "thumb"}, headers=_auth(volunteer))
+    archive = zipfile.ZipFile(io.BytesIO(thumbs.content))
+    manifest = json.loads(archive.read("manifest.json"))
+    entries = {item.get("file_id"): item for item in manifest["items"]}
+    thumb = Image.open(io.BytesIO(archive.read(entries[photo_id]["entry"])))
+    assert thumb.format == "WEBP" and max(thumb.size) == 480
+    # Undecodable images fall back to the original bytes.
+    assert archive.read(entries[png_id]["entry"]) == b"not-really-a-png"
+
+    forbidden = await client.get(url, headers=_auth(other))
+    assert forbidden.status_code == 403
@@ -1,8 +1,12 @@
 """Tests for image analysis: describe endpoint."""
 
+import time
+
 import pytest
 from httpx import AsyncClient
 
+from app.modules.image_analysis.engines import ImageDescriber, ImageDescription
+
 
 async def _register_and_get_token(client: AsyncClient, email: str, role: str) -> str:
     resp = await client.post("/api/v1/auth/register", json={
@@ -55,3 +59,269 @@ async def test_describe_image_requires_auth(client: AsyncClient):
         "image_file_id": "test-image-000",
     })
     assert resp.status_code == 403 or resp.status_code == 401
+
+
+def _jpeg(width: int, height: int) -> bytes:
+    import io
+
+    from PIL import Image
+
+    buf = io.BytesIO()
+    # Detailed and evenly exposed, so it passes the clarity pre-check.
+    Image.effect_noise((width, height), 64).convert("RGB").save(buf, format="JPEG", quality=95)
+    return buf.getvalue()
+
+
+async def _upload_image(client: AsyncClient, token: str, content: bytes) -> str:
+    presign = await client.post("/api/v1/uploads/presign", json={
+        "filename": "photo.jpg", "mime_type": "image/jpeg", "size": len(content),
+    }, headers=_auth(token))
+    file_id = presign.json()["file_id"]
+    put = await client.put(
+        f"/api/v1/uploads/{file_id}/content",
+        content=content,
+        headers={**_auth(token), "Content-Type": "image/jpeg"},
+    )
+    assert put.status_code == 200
+    return file_id
+
+
+@pytest.mark.asyncio
+async def test_describe_results_are_cached_by_content(client: AsyncClient):
+    """The same picture is described once per language, whoever uploaded it."""
+    from app.core.result_cache import cache_stats
+
+    def counts() -> dict:
+        return cache_stats.stats().get("describe:local", {"memory_hits": 0, "misses": 0})
+
+    first = await _register_and_get_token(client, "img-cache1@test.com", "seeker")
+    second = await _register_and_get_token(client, "img-cache2@test.com", "seeker")
+    photo = _jpeg(64, 48)
+    first_id = await _upload_image(client, first, photo)
+    second_id = await _upload_image(client, second, photo)
+
+    before = counts()
+    resp = await client.post("/api/v1/image-analysis/describe", json={
+        "image_file_id": first_id,
+    }, headers=_auth(first))
+    assert resp.status_code == 200
+    assert "64x48" in resp.json()["description"]
+
+    again = await client.post("/api/v1/image-analysis/describe", json={
+        "image_file_id": second_id,
+    }, headers=_auth(second))
+    assert again.json() == resp.json()
+
+    english = await client.post("/api/v1/image-analysis/describe", json={
+        "image_file_id": second_id, "language": "en-US",
+    }, headers=_auth(second))
+    assert "(en-US)" in english.json()["description"]
+
+    after = counts()
+    assert after["misses"] - before["misses"] == 2
+    assert after["memory_hits"] - before["memory_hits"] == 1
+
+
+class _SlowDescriber(ImageDescriber):
+    name = "slow"
+
+    def describe_batch(self, images):
+        time.sleep(0.5)
+        return [ImageDescription(description="slow") for _ in images]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_describes_share_one_batch(client: AsyncClient, monkeypatch):
+    """Photos posted together are described in one worker call."""
+    import asyncio
+
+    from app.core.config import settings
+    from app.modules.image_analysis.batching import batcher
+
+    monkeypatch.setattr(settings, "IMAGE_DESCRIBE_BATCH_WAIT_MS", 200.0)
+    token = await _register_and_get_token(client, "img-batch@test.com", "seeker")
+    sizes = [(40, 30), (50, 30), (60, 30)]
+    file_ids = [await _upload_image(client, token, _jpeg(*size)) for size in sizes]
+
+    before = batcher.stats()
+    responses = await asyncio.gather(*(
+        client.post("/api/v1/image-analysis/describe", json={
+            "image_file_id": file_id,
+        }, headers=_auth(token))
+        for file_id in file_ids
+    ))
+    after = batcher.stats()
+
+    for (width, height), resp in zip(sizes, responses):
+        assert resp.status_code == 200
+        assert f"{width}x{height}" in resp.json()["description"]
+    assert after["batches"] - before["batches"] == 1
+    assert after["items"] - before["items"] == 3
+    assert after["queue_depth"] == 0
+
+
+@pytest.mark.asyncio
+async def test_describe_times_out_with_retry_hint(client: AsyncClient, monkeypatch):
+    """A request outliving IMAGE_DESCRIBE_TIMEOUT_SECONDS gets 503 + Retry-After."""
+    from app.core.config import settings
+    from app.modules.image_analysis.batching import batcher
+
+    monkeypatch.setattr(settings, "IMAGE_DESCRIBE_ENGINE", "tests.test_image_analysis:_SlowDescriber")
+    monkeypatch.setattr(settings, "IMAGE_DESCRIBE_TIMEOUT_SECONDS", 0.1)
+    monkeypatch.setattr(settings, "IMAGE_DESCRIBE_BATCH_WAIT_MS", 0.0)
+    token = await _register_and_get_token(client, "img-timeout@test.com", "seeker")
+    file_id = await _upload_image(client, token, _jpeg(32, 32))
+
+    timeouts = batcher.timeouts
+    resp = await client.post("/api/v1/image-analysis/describe", json={
+        "image_file_id": file_id,
+    }, headers=_auth(token))
+    assert resp.status_code == 503
+    assert resp.headers["retry-after"] == "1"
+    assert batcher.timeouts == timeouts + 1
+
+
+class _CrashingDescriber(ImageDescriber):
+    """Kills its worker process on 13-pixel-wide images, like a segfaulting model."""
+
+    name = "crashing"
+
+    def describe_batch(self, images):
+        import os
+
+        from PIL import Image
+
+        results = []
+        for image in images:
+            with Image.open(image.path) as opened:
+                if opened.width == 13:
+                    os._exit(1)
+                results.append(ImageDescription(description=f"{opened.width} wide"))
+        return results
+
+
+@pytest.mark.asyncio
+async def test_crashed_worker_is_replaced(client: AsyncClient, monkeypatch):
+    """A worker dying on one photo fails only that photo; later calls get a fresh pool."""
+    import asyncio
+
+    from app.core.config import settings
+    from app.modules.image_analysis.batching import batcher
+
+    monkeypatch.setattr(settings, "IMAGE_DESCRIBE_ENGINE", "tests.test_image_analysis:_CrashingDescriber")
+    monkeypatch.setattr(settings, "IMAGE_DESCRIBE_BATCH_WAIT_MS", 200.0)
+    token = await _register_and_get_token(client, "img-crash@test.com", "seeker")
+    crashing = await _upload_image(client, token, _jpeg(13, 20))
+    healthy = await _upload_image(client, token, _jpeg(41, 20))
+    later = await _upload_image(client, token, _jpeg(42, 20))
+
+    restarts = batcher.pool_restarts
+    crashed, described = await asyncio.gather(*(
+        client.post("/api/v1/image-analysis/describe", json={
+            "image_file_id": file_id,
+        }, headers=_auth(token))
+        for file_id in (crashing, healthy)
+    ))
+    assert crashed.status_code == 503
+    assert described.status_code == 200
+    assert described.json()["description"] == "41 wide"
+    # Once for the shared batch, once when the crashing photo was retried alone.
+    assert batcher.pool_restarts == restarts + 2
+
+    resp = await client.post("/api/v1/image-analysis/describe", json={
+        "image_file_id": later,
+    }, headers=_auth(token))
+    assert resp.status_code == 200
+    assert resp.json()["description"] == "42 wide"
+    assert batcher.stats()["pool_restarts"] == restarts + 2
+
+
+def _photo(kind: str) -> bytes:
+    import io
+
+    from PIL import Image, ImageFilter
+
+    sharp = Image.effect_noise((640, 480), 64).convert("RGB")
+    image = {
+        "sharp": sharp,
+        "blurry": sharp.filter(ImageFilter.GaussianBlur(2)),
+        "black": Image.new("RGB", (640, 480), (3, 3, 3)),
+        "dim": sharp.point(lambda v: v // 5),
+    }[kind]
+    buf = io.BytesIO()
+    image.save(buf, format="JPEG", quality=95)
+    return buf.getvalue()
+
+
+@pytest.mark.asyncio
+async def test_clarity_precheck_flags_unusable_photos(client: AsyncClient):
+    """Dark or blurry photos get retake advice; unusable ones skip the describer."""
+    from app.modules.image_analysis.batching import batcher
+
+    token = await _register_and_get_token(client, "img-clarity@test.com", "seeker")
+    ids = {kind: await _upload_image(client, token, _photo(kind)) for kind in ("sharp", "blurry", "black", "dim")}
+
+    async def clarity(kind: str, language: str = "zh-CN") -> dict:
+        resp = await client.post("/api/v1/image-analysis/clarity", json={
+            "image_file_id": ids[kind], "language": language,
+        }, headers=_auth(token))
+        assert resp.status_code == 200
+        return resp.json()
+
+    sharp = await clarity("sharp")
+    assert (sharp["is_clear"], sharp["usable"], sharp["clarity_note"]) == (True, True, None)
+    blurry = await clarity("blurry", "en-US")
+    assert (blurry["issue"], blurry["usable"]) == ("blurry", True)
+    assert "blurry" in blurry["clarity_note"]
+    assert (await clarity("dim"))["issue"] == "dark"
+    black = await clarity("black")
+    assert (black["issue"], black["usable"]) == ("dark", False)
+    assert black["clarity_note"].startswith("照片太暗")
+
+    items = batcher.items
+    described = await client.post("/api/v1/image-analysis/describe", json={
+        "image_file_id": ids["black"],
+    }, headers=_auth(token))
+    assert described.json()["is_clear"] is False
+    assert described.json()["clarity_note"] == black["clarity_note"]
+    assert batcher.items == items
+
+    soft = await client.post("/api/v1/image-analysis/describe", json={
+        "image_file_id": ids["blurry"],
+    }, headers=_auth(token))
+    assert "640x480" in soft.json()["description"]
+    assert soft.json()["is_clear"] is False
+    assert batcher.items == items + 1
+
+    missing = await client.post("/api/v1/image-analysis/clarity", json={
+        "image_file_id": "no-such-image",
+    }, headers=_auth(token))
+    assert missing.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_unusable_limits_are_settings_and_always_name_an_issue(client: AsyncClient, monkeypatch):
+    """Unusable limits past the plain ones still yield an issue and a retake note."""
+    from app.core.config import settings
+
+    token = await _register_and_get_token(client, "img-unusable@test.com", "seeker")
+    image_id = await _upload_image(client, token, _photo("sharp"))
+    first = await client.post("/api/v1/image-analysis/describe", json={
+        "image_file_id": image_id, "language": "en-US",
+    }, headers=_auth(token))
+    assert first.json()["is_clear"] is True
+
+    monkeypatch.setattr(settings, "IMAGE_CLARITY_BLUR_THRESHOLD", 0.0)
+    monkeypatch.setattr(settings, "IMAGE_CLARITY_UNUSABLE_BLUR_SCORE", 1e12)
+    report = await client.post("/api/v1/image-analysis/clarity", json={
+        "image_file_id": image_id, "language": "en-US",
+    }, headers=_auth(token))
+    assert (report.json()["issue"], report.json()["usable"]) == ("blurry", False)
+
+    # The limits are part of the cache key, so the earlier result is not reused.
+    described = await client.post("/api/v1/image-analysis/describe", json={
+        "image_file_id": image_id, "language": "en-US",
+    }, headers=_auth(token))
+    assert described.json()["is_clear"] is False
+    assert described.json()["description"] == report.json()["clarity_note"]
+    assert "blurry" in described.json()["description"]
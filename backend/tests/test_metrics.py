@@ -0,0 +1,24 @@
+"""Tests for the `/metrics` endpoint."""
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+
+@pytest.mark.asyncio
+async def test_metrics_require_token(monkeypatch):
+    """`/metrics` is disabled without a token and served only to its holders."""
+    from app.core.config import settings
+    from app.main import app
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        monkeypatch.setattr(settings, "METRICS_TOKEN", None)
+        assert (await ac.get("/metrics")).status_code == 404
+
+        monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-secret")
+        assert (await ac.get("/metrics")).status_code == 401
+        wrong = await ac.get("/metrics", headers={"Authorization": "Bearer guess"})
+        assert wrong.status_code == 401
+
+        resp = await ac.get("/metrics", headers={"Authorization": "Bearer scrape-secret"})
+        assert resp.status_code == 200
+        assert "user_cache" in resp.json()
@@ -73,7 +73,7 @@ async def test_seeker_notifications_include_reply(client: AsyncClient) -> None:
 
 @pytest.mark.asyncio
 async def test_volunteer_notification_feed_is_empty(client: AsyncClient) -> None:
-    """Volunteer feed is currently empty by design."""
+    """Volunteer feed is empty until a seeker leaves feedback."""
     volunteer_token = await _register_and_get_token(
         client, "notice_vol_empty@test.com", "volunteer"
     )
@@ -83,3 +83,89 @@ async def test_volunteer_notification_feed_is_empty(client: AsyncClient) -> None
     )
     assert notification_resp.status_code == 200
     assert notification_resp.json()["items"] == []
+
+
+@pytest.mark.asyncio
+async def test_unread_counter_tracks_fan_out_and_reads(client: AsyncClient) -> None:
+    """Claim/reply notify the seeker, feedback notifies the volunteer."""
+    seeker_token = await _register_and_get_token(client, "unread_seeker@test.com", "seeker")
+    volunteer_token = await _register_and_get_token(client, "unread_vol@test.com", "volunteer")
+
+    create_resp = await client.post(
+        "/api/v1/help-requests",
+        json={"text": "帮我看看这是什么", "mode": "hall"},
+        headers=_auth(seeker_token),
+    )
+    request_id = create_resp.json()["id"]
+    await client.post(f"/api/v1/help-requests/{request_id}/claim", headers=_auth(volunteer_token))
+    await client.post(
+        f"/api/v1/help-requests/{request_id}/replies",
+        json={"reply_type": "text", "text": "这是一瓶酱油。"},
+        headers=_auth(volunteer_token),
+    )
+
+    count_resp = await client.get("/api/v1/notifications/unread-count", headers=_auth(seeker_token))
+    assert count_resp.json() == {"unread": 2}
+
+    items = (await client.get("/api/v1/notifications", headers=_auth(seeker_token))).json()["items"]
+    assert [item["type"] for item in items] == ["reply", "claim"]
+    assert all(item["is_read"] is False for item in items)
+
+    read_resp = await client.post(
+        f"/api/v1/notifications/{items[0]['id']}/read", headers=_auth(seeker_token)
+    )
+    assert read_resp.status_code == 200
+    assert read_resp.json()["unread"] == 1
+
+    unread_items = (
+        await client.get("/api/v1/notifications?unread_only=true", headers=_auth(seeker_token))
+    ).json()["items"]
+    assert [item["type"] for item in unread_items] == ["claim"]
+
+    await client.post("/api/v1/notifications/read-all", headers=_auth(seeker_token))
+    count_resp = await client.get("/api/v1/notifications/unread-count", headers=_auth(seeker_token))
+    assert count_resp.json() == {"unread": 0}
+
+    await client.post(
+        f"/api/v1/help-requests/{request_id}/feedback",
+        json={"resolved": True},
+        headers=_auth(seeker_token),
+    )
+    volunteer_items = (
+        await client.get("/api/v1/notifications", headers=_auth(volunteer_token))
+    ).json()["items"]
+    assert [item["type"] for item in volunteer_items] == ["feedback"]
+
+
+@pytest.mark.asyncio
+async def test_unread_counter_without_dialect_upsert(client: AsyncClient, monkeypatch) -> None:
+    """Dialects without ON CONFLICT bump the counter with update-then-insert."""
+    from app.modules.notifications import service
+
+    monkeypatch.setattr(service, "_UPSERT_INSERTS", {})
+    seeker_token = await _register_and_get_token(client, "portable_seeker@test.com", "seeker")
+    volunteer_token = await _register_and_get_token(client, "portable_vol@test.com", "volunteer")
+
+    create_resp = await client.post(
+        "/api/v1/help-requests",
+        json={"text": "这个药怎么吃", "mode": "hall"},
+        headers=_auth(seeker_token),
+    )
+    request_id = create_resp.json()["id"]
+    await client.post(f"/api/v1/help-requests/{request_id}/claim", headers=_auth(volunteer_token))
+    await client.post(
+        f"/api/v1/help-requests/{request_id}/replies",
+        json={"reply_type": "text", "text": "饭后一片。"},
+        headers=_auth(volunteer_token),
+    )
+
+    count_resp = await client.get("/api/v1/notifications/unread-count", headers=_auth(seeker_token))
+    assert count_resp.json() == {"unread": 2}
+
+
+@pytest.mark.asyncio
+async def test_mark_read_unknown_notification(client: AsyncClient) -> None:
+    """Marking someone else's or a missing notification is a 404."""
+    token = await _register_and_get_token(client, "unread_missing@test.com", "seeker")
+    resp = await client.post("/api/v1/notifications/missing/read", headers=_auth(token))
+    assert resp.status_code == 404
@@ -0,0 +1,136 @@
+"""Query-plan regression checks: hot service queries must not full-scan tables."""
+
+import os
+import re
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.db import Base
+from app.modules.assignments import service as assignments_service
+from app.modules.assignments.models import Assignment
+from app.modules.auth import service as auth_service
+from app.modules.auth.models import User
+from app.modules.help_requests import service as help_requests_service
+from app.modules.help_requests.models import HelpRequest, RequestAttachment
+from app.modules.notifications import service as notifications_service
+from app.modules.replies import service as replies_service
+from app.modules.replies.models import Reply
+from app.modules.uploads import service as uploads_service
+from app.modules.uploads.orphans import collect_orphan_uploads
+
+PLAN_DB_PATH = os.path.join(os.path.dirname(__file__), "test_plans.db")
+FULL_SCAN = re.compile(r"^SCAN (?!CONSTANT ROW)\S+$")
+
+
+@pytest_asyncio.fixture
+async def plan_db():
+    """Seeded SQLite DB plus a recorder of every SELECT the services issue."""
+    try:
+        os.remove(PLAN_DB_PATH)
+    except OSError:
+        pass
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{PLAN_DB_PATH}", echo=False)
+    captured: list[tuple[str, tuple]] = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, tuple(parameters or ())))
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    async with session_factory() as db:
+        seeker = User(id="seeker-1", role="seeker", email="s@test.com", password_hash="x")
+        volunteer = User(id="vol-1", role="volunteer", phone="13800000000", password_hash="x")
+        db.add_all([seeker, volunteer])
+        for i in range(50):
+            req = HelpRequest(
+                id=f"req-{i:03d}",
+                seeker_id=seeker.id,
+                mode="hall",
+                status="open" if i % 2 else "claimed",
+                voice_file_id="text-only-placeholder",
+                priority=i % 3,
+                created_at=base + timedelta(minutes=i),
+            )
+            db.add(req)
+            db.add(RequestAttachment(request_id=req.id, file_id=f"file-{i}", file_type="image"))
+            if i % 2 == 0:
+                db.add(Assignment(request_id=req.id, volunteer_id=volunteer.id))
+                db.add(Reply(request_id=req.id, volunteer_id=volunteer.id, reply_type="text", text="ok"))
+        await db.commit()
+
+    captured.clear()
+    yield session_factory, captured
+
+    await engine.dispose()
+    try:
+        os.remove(PLAN_DB_PATH)
+    except OSError:
+        pass
+
+
+async def _full_scans(session_factory, captured) -> list[str]:
+    """Run EXPLAIN QUERY PLAN on every captured SELECT; return offending plans."""
+    statements = list(captured)
+    captured.clear()
+    offenders: list[str] = []
+    async with session_factory() as db:
+        conn = await db.connection()
+        for statement, params in statements:
+            rows = (await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", params)).all()
+            scans = [row[-1] for row in rows if FULL_SCAN.match(row[-1])]
+            if scans:
+                offenders.append(f"{scans} <- {' '.join(statement.split())}")
+    return offenders
+
+
+@pytest.mark.asyncio
+async def test_help_request_listings_use_indexes(plan_db):
+    """Hall and seeker listings (offset, cursor and count) are index-backed."""
+    session_factory, captured = plan_db
+    async with session_factory() as db:
+        _, _, cursor = await help_requests_service.get_hall_requests(db, 1, 10)
+        await help_requests_service.get_hall_requests(db, 2, 10, "open")
+        await help_requests_service.get_hall_requests(db, page_size=10, cursor=cursor)
+        _, _, cursor = await help_requests_service.get_seeker_requests(db, "seeker-1", 1, 10)
+        await help_requests_service.get_seeker_requests(db, "seeker-1", 1, 10, "open")
+        await help_requests_service.get_seeker_requests(db, "seeker-1", page_size=10, cursor=cursor)
+        await help_requests_service.get_request_by_id(db, "req-001")
+
+    assert await _full_scans(session_factory, captured) == []
+
+
+@pytest.mark.asyncio
+async def test_detail_and_auth_queries_use_indexes(plan_db):
+    """Replies, assignments, notifications, uploads and user lookups are index-backed."""
+    session_factory, captured = plan_db
+    async with session_factory() as db:
+        await replies_service.list_replies(db, "req-000")
+        await assignments_service.get_assignment_by_request(db, "req-000")
+        await notifications_service.list_notifications(db, user_id="seeker-1")
+        await notifications_service.list_notifications(db, user_id="seeker-1", unread_only=True)
+        await notifications_service.get_unread_count(db, "seeker-1")
+        await uploads_service.get_uploaded_file(db, "file-1")
+        await auth_service.authenticate_user(db, "missing@test.com", "wrong-password")
+
+    assert await _full_scans(session_factory, captured) == []
+
+
+@pytest.mark.asyncio
+async def test_orphan_upload_scan_uses_indexes(plan_db):
+    """Orphan candidates come from index range scans and indexed anti-joins."""
+    session_factory, captured = plan_db
+    async with session_factory() as db:
+        await collect_orphan_uploads(db, dry_run=True)
+        await uploads_service.is_upload_referenced(db, "file-1")
+
+    assert await _full_scans(session_factory, captured) == []
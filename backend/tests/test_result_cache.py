@@ -0,0 +1,61 @@
+"""Tests for the content-addressed inference result cache."""
+
+import asyncio
+
+import pytest
+
+from app.core.result_cache import ResultCache, ResultKey, _DiskTier
+
+
+def _key(n: int) -> ResultKey:
+    return ResultKey.build(f"{n:064x}", "tts:test", "1", "zh-CN", speed=1.0)
+
+
+def test_result_key_covers_every_input():
+    """Engine version, language and parameters all change the key."""
+    base = ResultKey.build("ab" * 32, "tts:local", "1", "zh-CN", speed=1.0, voice="a")
+    assert base.digest == ResultKey.build("ab" * 32, "tts:local", "1", "zh-CN", voice="a", speed=1.0).digest
+    variants = [
+        ResultKey.build("cd" * 32, "tts:local", "1", "zh-CN", speed=1.0, voice="a"),
+        ResultKey.build("ab" * 32, "tts:local", "2", "zh-CN", speed=1.0, voice="a"),
+        ResultKey.build("ab" * 32, "tts:local", "1", "en-US", speed=1.0, voice="a"),
+        ResultKey.build("ab" * 32, "tts:local", "1", "zh-CN", speed=1.5, voice="a"),
+    ]
+    assert len({base.digest, *(k.digest for k in variants)}) == 5
+
+
+def test_disk_tier_evicts_least_recently_used(tmp_path):
+    """Once over budget, the least recently read entries go first."""
+    disk = _DiskTier(tmp_path / "results.db", max_bytes=1000)
+    for n in range(4):
+        disk.put(f"k{n}", "tts:test", bytes(200))
+    assert disk.get("k0") is not None  # k1 is now the oldest
+    disk.put("k4", "tts:test", bytes(300))
+
+    assert disk.get("k1") is None
+    assert all(disk.get(k) is not None for k in ("k0", "k2", "k3", "k4"))
+    assert disk.put("huge", "tts:test", bytes(2000)) is None
+    assert disk.get("huge") is None
+    disk.close()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_compute_once(tmp_path):
+    """Callers waiting on the same key share one computation."""
+    cache = ResultCache(16, 1024, _DiskTier(tmp_path / "results.db", 1 << 20))
+    calls = 0
+
+    async def compute() -> bytes:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return b"audio"
+
+    results = await asyncio.gather(*(cache.get_or_compute(_key(1), compute) for _ in range(5)))
+    assert results == [b"audio"] * 5
+    assert calls == 1
+    assert await cache.lookup(_key(1).digest) == b"audio"
+
+    big = ResultCache(16, 4, _DiskTier(tmp_path / "results.db", 1 << 20))
+    assert await big.get(_key(1)) == b"audio"  # from disk; too big for memory
+    assert len(big._memory) == 0
@@ -195,3 +195,843 @@ async def test_upload_content_accepts_ios_mime_alias(client: AsyncClient):
         headers=_auth(token),
     )
     assert upload_resp.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_upload_raw_body_streams_and_hashes(client: AsyncClient):
+    """Raw request bodies are accepted and the SHA-256 is returned."""
+    import hashlib
+
+    token = await _register_and_get_token(client, "upload11@test.com", "seeker")
+    presign_resp = await client.post(
+        "/api/v1/uploads/presign",
+        json={"filename": "photo.png", "mime_type": "image/png", "size": 1024},
+        headers=_auth(token),
+    )
+    file_id = presign_resp.json()["file_id"]
+
+    content_bytes = b"\x89PNG" + b"x" * 300_000
+    upload_resp = await client.put(
+        f"/api/v1/uploads/{file_id}/content",
+        content=content_bytes,
+        headers={**_auth(token), "Content-Type": "image/png"},
+    )
+    assert upload_resp.status_code == 200
+    data = upload_resp.json()
+    assert data["size"] == len(content_bytes)
+    assert data["sha256"] == hashlib.sha256(content_bytes).hexdigest()
+
+    read_resp = await client.get(f"/api/v1/uploads/{file_id}/content", headers=_auth(token))
+    assert read_resp.content == content_bytes
+
+
+@pytest.mark.asyncio
+async def test_upload_content_rejects_oversized_body(client: AsyncClient):
+    """Bodies above the category limit are rejected and nothing is stored."""
+    token = await _register_and_get_token(client, "upload12@test.com", "seeker")
+    presign_resp = await client.post(
+        "/api/v1/uploads/presign",
+        json={"filename": "photo.jpg", "mime_type": "image/jpeg", "size": 1024},
+        headers=_auth(token),
+    )
+    file_id = presign_resp.json()["file_id"]
+
+    async def oversized():
+        for _ in range(6):
+            yield b"x" * (1024 * 1024)
+
+    upload_resp = await client.put(
+        f"/api/v1/uploads/{file_id}/content",
+        content=oversized(),
+        headers={**_auth(token), "Content-Type": "image/jpeg"},
+    )
+    assert upload_resp.status_code == 400
+
+    read_resp = await client.get(f"/api/v1/uploads/{file_id}/content", headers=_auth(token))
+    assert read_resp.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_multipart_upload_is_parsed_as_it_streams(client: AsyncClient):
+    """Multipart bodies are read incrementally and held to the same limits."""
+    token = await _register_and_get_token(client, "upload30@test.com", "seeker")
+
+    async def presign(size: int) -> str:
+        resp = await client.post(
+            "/api/v1/uploads/presign",
+            json={"filename": "photo.jpg", "mime_type": "image/jpeg", "size": size},
+            headers=_auth(token),
+        )
+        return resp.json()["file_id"]
+
+    boundary = "test-boundary-7f3a"
+    headers = {**_auth(token), "Content-Type": f"multipart/form-data; boundary={boundary}"}
+
+    def part(name: str, body: bytes, content_type: str | None = None) -> bytes:
+        head = f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; filename="f"\r\n'
+        if content_type:
+            head += f"Content-Type: {content_type}\r\n"
+        return head.encode() + b"\r\n" + body + b"\r\n"
+
+    async def trickle(body: bytes, size: int = 7):
+        for start in range(0, len(body), size):
+            yield body[start:start + size]
+
+    content_bytes = bytes(range(256)) * 8
+    body = part("note", b"ignored") + part("content", content_bytes, "image/jpeg")
+    body += f"--{boundary}--\r\n".encode()
+    file_id = await presign(len(content_bytes))
+    stored = await client.put(
+        f"/api/v1/uploads/{file_id}/content", content=trickle(body), headers=headers
+    )
+    assert stored.status_code == 200
+    assert stored.json()["size"] == len(content_bytes)
+    read_resp = await client.get(f"/api/v1/uploads/{file_id}/content", headers=_auth(token))
+    assert read_resp.content == content_bytes
+
+    async def oversized():
+        yield part("content", b"", "image/jpeg")[:-2]
+        for _ in range(6):
+            yield b"x" * (1024 * 1024)
+
+    file_id = await presign(1024)
+    resp = await client.put(f"/api/v1/uploads/{file_id}/content", content=oversized(), headers=headers)
+    assert resp.status_code == 400
+
+    declared = {**headers, "Content-Length": str(6 * 1024 * 1024)}
+    resp = await client.put(f"/api/v1/uploads/{file_id}/content", content=b"", headers=declared)
+    assert resp.status_code == 413
+
+    mismatched = part("content", b"audio", "audio/mp4") + f"--{boundary}--\r\n".encode()
+    resp = await client.put(f"/api/v1/uploads/{file_id}/content", content=mismatched, headers=headers)
+    assert resp.status_code == 400
+    missing = part("note", b"no file here") + f"--{boundary}--\r\n".encode()
+    resp = await client.put(f"/api/v1/uploads/{file_id}/content", content=missing, headers=headers)
+    assert resp.status_code == 400
+    assert (await client.get(f"/api/v1/uploads/{file_id}/content", headers=_auth(token))).status_code == 404
+
+
+async def _store_image(client: AsyncClient, token: str, content_bytes: bytes):
+    presign_resp = await client.post(
+        "/api/v1/uploads/presign",
+        json={"filename": "photo.jpg", "mime_type": "image/jpeg", "size": len(content_bytes)},
+        headers=_auth(token),
+    )
+    upload_resp = await client.put(
+        f"/api/v1/uploads/{presign_resp.json()['file_id']}/content",
+        content=content_bytes,
+        headers={**_auth(token), "Content-Type": "image/jpeg"},
+    )
+    assert upload_resp.status_code == 200
+    return upload_resp
+
+
+async def _upload_image(client: AsyncClient, token: str, content_bytes: bytes) -> str:
+    return (await _store_image(client, token, content_bytes)).json()["file_id"]
+
+
+@pytest.mark.asyncio
+async def test_content_conditional_and_range_requests(client: AsyncClient):
+    """Content carries strong validators, honours 304 and serves byte ranges."""
+    import hashlib
+
+    token = await _register_and_get_token(client, "upload13@test.com", "seeker")
+    content_bytes = bytes(range(256)) * 4
+    file_id = await _upload_image(client, token, content_bytes)
+    url = f"/api/v1/uploads/{file_id}/content"
+
+    full = await client.get(url, headers=_auth(token))
+    assert full.status_code == 200
+    etag = full.headers["etag"]
+    assert etag == f'"{hashlib.sha256(content_bytes).hexdigest()}"'
+    assert "immutable" in full.headers["cache-control"]
+    assert full.headers["accept-ranges"] == "bytes"
+
+    not_modified = await client.get(url, headers={**_auth(token), "If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.headers["etag"] == etag
+
+    since = await client.get(
+        url, headers={**_auth(token), "If-Modified-Since": full.headers["last-modified"]}
+    )
+    assert since.status_code == 304
+
+    stale = await client.get(url, headers={**_auth(token), "If-None-Match": '"other"'})
+    assert stale.status_code == 200
+
+    partial = await client.get(url, headers={**_auth(token), "Range": "bytes=10-19"})
+    assert partial.status_code == 206
+    assert partial.content == content_bytes[10:20]
+    assert partial.headers["content-range"] == f"bytes 10-19/{len(content_bytes)}"
+
+
+@pytest.mark.asyncio
+async def test_upload_content_is_write_once(client: AsyncClient):
+    """Stored content cannot be overwritten."""
+    token = await _register_and_get_token(client, "upload14@test.com", "seeker")
+    file_id = await _upload_image(client, token, b"first")
+
+    resp = await client.put(
+        f"/api/v1/uploads/{file_id}/content",
+        content=b"second",
+        headers={**_auth(token), "Content-Type": "image/jpeg"},
+    )
+    assert resp.status_code == 409
+
+
+@pytest.mark.asyncio
+async def test_identical_uploads_share_one_blob(client: AsyncClient):
+    """Repeat content is stored once and collected when its last record goes."""
+    from pathlib import Path
+
+    from app.core.config import settings
+
+    token = await _register_and_get_token(client, "upload15@test.com", "seeker")
+    content_bytes = b"same-photo-bytes" * 100
+
+    first_id = await _upload_image(client, token, content_bytes)
+    presign_resp = await client.post(
+        "/api/v1/uploads/presign",
+        json={"filename": "retry.jpg", "mime_type": "image/jpeg", "size": len(content_bytes)},
+        headers=_auth(token),
+    )
+    second_id = presign_resp.json()["file_id"]
+    second = await client.put(
+        f"/api/v1/uploads/{second_id}/content",
+        files={"content": ("retry.jpg", content_bytes, "image/jpeg")},
+        headers=_auth(token),
+    )
+    assert second.status_code == 200
+    assert second.json()["deduplicated"] is True
+
+    sha256 = second.json()["sha256"]
+    blob_path = Path(settings.UPLOAD_DIR) / "blobs" / sha256[:2] / sha256[2:4] / sha256
+    assert blob_path.read_bytes() == content_bytes
+
+    assert (await client.delete(f"/api/v1/uploads/{first_id}", headers=_auth(token))).status_code == 204
+    assert blob_path.exists()
+    read_resp = await client.get(f"/api/v1/uploads/{second_id}/content", headers=_auth(token))
+    assert read_resp.content == content_bytes
+
+    assert (await client.delete(f"/api/v1/uploads/{second_id}", headers=_auth(token))).status_code == 204
+    assert not blob_path.exists()
+    missing = await client.get(f"/api/v1/uploads/{second_id}/content", headers=_auth(token))
+    assert missing.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_rolled_back_release_keeps_content(client: AsyncClient):
+    """Releasing a blob touches storage only once the release commits."""
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+    from app.modules.uploads import service
+    from tests.conftest import TEST_DATABASE_URL
+
+    token = await _register_and_get_token(client, "upload28@test.com", "seeker")
+    content_bytes = b"rollback-photo" * 100
+    file_id = await _upload_image(client, token, content_bytes)
+
+    engine = create_async_engine(TEST_DATABASE_URL)
+    try:
+        async with AsyncSession(engine) as db:
+            record = await service.get_uploaded_file(db, file_id)
+            freed = await service._release_blob(db, record.sha256, record.storage_path)
+            assert freed == (record.storage_path, record.sha256)
+            await db.rollback()
+    finally:
+        await engine.dispose()
+
+    read_resp = await client.get(f"/api/v1/uploads/{file_id}/content", headers=_auth(token))
+    assert read_resp.status_code == 200
+    assert read_resp.content == content_bytes
+
+
+def _jpeg_with_orientation(width: int, height: int, orientation: int) -> bytes:
+    import io
+
+    from PIL import Image
+
+    image = Image.new("RGB", (width, height), (200, 30, 30))
+    exif = Image.Exif()
+    exif[0x0112] = orientation
+    exif[0x010F] = "TestCam"
+    buf = io.BytesIO()
+    image.save(buf, format="JPEG", exif=exif.tobytes())
+    return buf.getvalue()
+
+
+@pytest.mark.asyncio
+async def test_image_variants_are_oriented_resized_and_stripped(client: AsyncClient):
+    """Thumb/display variants are small WebPs with orientation applied and no EXIF."""
+    import io
+
+    from PIL import Image
+
+    token = await _register_and_get_token(client, "upload16@test.com", "seeker")
+    # Orientation 6 = rotate 90° clockwise for display, so the result is portrait.
+    original = _jpeg_with_orientation(2000, 1000, 6)
+    file_id = await _upload_image(client, token, original)
+    url = f"/api/v1/uploads/{file_id}/content"
+
+    thumb = await client.get(url, params={"variant": "thumb"}, headers=_auth(token))
+    assert thumb.status_code == 200
+    assert thumb.headers["content-type"] == "image/webp"
+    assert thumb.headers["etag"].endswith('-thumb"')
+    assert len(thumb.content) < len(original)
+    with Image.open(io.BytesIO(thumb.content)) as image:
+        assert image.format == "WEBP"
+        assert image.size == (240, 480)
+        assert not image.getexif()
+
+    display = await client.get(url, params={"variant": "display"}, headers=_auth(token))
+    with Image.open(io.BytesIO(display.content)) as image:
+        assert image.size == (640, 1280)
+
+    # JPEG is web-safe, so the normalized variant is just the original.
+    normalized = await client.get(url, params={"variant": "normalized"}, headers=_auth(token))
+    assert normalized.content == original
+
+
+@pytest.mark.asyncio
+async def test_variant_pool_is_replaced_after_a_worker_crash(client: AsyncClient):
+    """A decoder killing its worker does not break rendering for later uploads."""
+    import os
+    from concurrent.futures.process import BrokenProcessPool
+
+    from app.modules.uploads.variants import renderer
+
+    restarts = renderer.pool_restarts
+    with pytest.raises(BrokenProcessPool):
+        await renderer._run(os._exit, 1)
+    assert renderer.stats()["pool_restarts"] == restarts + 1
+
+    token = await _register_and_get_token(client, "upload-crash@test.com", "seeker")
+    file_id = await _upload_image(client, token, _jpeg_with_orientation(300, 200, 1))
+    thumb = await client.get(
+        f"/api/v1/uploads/{file_id}/content", params={"variant": "thumb"}, headers=_auth(token)
+    )
+    assert thumb.status_code == 200
+    assert thumb.headers["content-type"] == "image/webp"
+    assert renderer.pool_restarts == restarts + 1
+
+
+@pytest.mark.asyncio
+async def test_heic_upload_gets_normalized_jpeg(client: AsyncClient):
+    """HEIC photos are also served as a plain JPEG for clients that can't decode them."""
+    import io
+
+    pillow_heif = pytest.importorskip("pillow_heif")
+    from PIL import Image
+
+    pillow_heif.register_heif_opener()
+    buf = io.BytesIO()
+    Image.new("RGB", (64, 48), (0, 120, 200)).save(buf, format="HEIF")
+    heic_bytes = buf.getvalue()
+
+    token = await _register_and_get_token(client, "upload17@test.com", "seeker")
+    presign_resp = await client.post(
+        "/api/v1/uploads/presign",
+        json={"filename": "IMG_0001.HEIC", "mime_type": "image/heic", "size": len(heic_bytes)},
+        headers=_auth(token),
+    )
+    file_id = presign_resp.json()["file_id"]
+    await client.put(
+        f"/api/v1/uploads/{file_id}/content",
+        content=heic_bytes,
+        headers={**_auth(token), "Content-Type": "image/heic"},
+    )
+
+    resp = await client.get(
+        f"/api/v1/uploads/{file_id}/content",
+        params={"variant": "normalized"},
+        headers=_auth(token),
+    )
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "image/jpeg"
+    with Image.open(io.BytesIO(resp.content)) as image:
+        assert image.format == "JPEG"
+        assert image.size == (64, 48)
+
+
+def _wav_with_silence(lead_s: float, tone_s: float, tail_s: float, rate: int = 16000) -> bytes:
+    import array
+    import io
+    import math
+    import wave
+
+    samples = array.array("h", [0] * int(lead_s * rate))
+    samples.extend(
+        int(12000 * math.sin(2 * math.pi * 440 * i / rate)) for i in range(int(tone_s * rate))
+    )
+    samples.extend([0] * int(tail_s * rate))
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(samples.tobytes())
+    return buf.getvalue()
+
+
+@pytest.mark.asyncio
+async def test_voice_upload_is_trimmed_and_transcoded(client: AsyncClient):
+    """Voice uploads get duration/waveform metadata and a compact AAC variant."""
+    pytest.importorskip("av")
+
+    token = await _register_and_get_token(client, "upload18@test.com", "seeker")
+    wav = _wav_with_silence(1.0, 2.0, 1.5)
+    presign_resp = await client.post(
+        "/api/v1/uploads/presign",
+        json={"filename": "note.wav", "mime_type": "audio/wav", "size": len(wav)},
+        headers=_auth(token),
+    )
+    file_id = presign_resp.json()["file_id"]
+    upload_resp = await client.put(
+        f"/api/v1/uploads/{file_id}/content",
+        content=wav,
+        headers={**_auth(token), "Content-Type": "audio/wav"},
+    )
+    assert upload_resp.status_code == 200
+    assert upload_resp.json()["duration_ms"] is None  # transcoded after the response
+
+    data = (await client.get(f"/api/v1/uploads/{file_id}", headers=_auth(token))).json()
+    # 2s of speech plus 150ms padding either side; the silence is gone.
+    assert 2000 <= data["duration_ms"] <= 2400
+    assert len(data["waveform"]) == 48
+    assert max(data["waveform"]) == 100
+
+    # The same clip again reuses the finished transcode straight away.
+    repeat = await client.post(
+        "/api/v1/uploads/presign",
+        json={"filename": "again.wav", "mime_type": "audio/wav", "size": len(wav)},
+        headers=_auth(token),
+    )
+    repeat_resp = await client.put(
+        f"/api/v1/uploads/{repeat.json()['file_id']}/content",
+        content=wav,
+        headers={**_auth(token), "Content-Type": "audio/wav"},
+    )
+    assert repeat_resp.json()["deduplicated"] is True
+    assert repeat_resp.json()["duration_ms"] == data["duration_ms"]
+    assert repeat_resp.json()["waveform"] == data["waveform"]
+
+    compact = await client.get(
+        f"/api/v1/uploads/{file_id}/content",
+        params={"variant": "compact"},
+        headers=_auth(token),
+    )
+    assert compact.status_code == 200
+    assert compact.headers["content-type"] == "audio/mp4"
+    assert len(compact.content) < len(wav) / 4
+
+    wrong = await client.get(
+        f"/api/v1/uploads/{file_id}/content",
+        params={"variant": "thumb"},
+        headers=_auth(token),
+    )
+    assert wrong.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_resumable_chunked_upload(client: AsyncClient):
+    """Chunks append at offsets, survive a dropped chunk, and finalize into content."""
+    import hashlib
+
+    token = await _register_and_get_token(client, "upload19@test.com", "seeker")
+    content_bytes = bytes(range(256)) * 400  # 100 KiB
+    presign_resp = await client.post(
+        "/api/v1/uploads/presign",
+        json={"filename": "clip.mp4", "mime_type": "video/mp4", "size": len(content_bytes)},
+        headers=_auth(token),
+    )
+    presigned = presign_resp.json()
+    chunks_url = f"/api/v1{presigned['chunks_url']}"
+
+    head = await client.head(chunks_url, headers=_auth(token))
+    assert head.headers["upload-offset"] == "0"
+    assert head.headers["upload-length"] == str(len(content_bytes))
+
+    first = await client.put(f"{chunks_url}/0", content=content_bytes[:40_000], headers=_auth(token))
+    assert first.json()["offset"] == 40_000
+
+    # Connection drops halfway through the second chunk: only part of it lands.
+    await client.put(f"{chunks_url}/40000", content=content_bytes[40_000:55_000], headers=_auth(token))
+    head = await client.head(chunks_url, headers=_auth(token))
+    assert head.headers["upload-offset"] == "55000"
+
+    gap = await client.put(f"{chunks_url}/90000", content=content_bytes[90_000:], headers=_auth(token))
+    assert gap.status_code == 409
+    assert gap.headers["upload-offset"] == "55000"
+
+    early = await client.post(f"{chunks_url}/complete", headers=_auth(token))
+    assert early.status_code == 409
+
+    # Blind retry of the whole second chunk overlaps committed bytes; that's fine.
+    retry = await client.put(f"{chunks_url}/40000", content=content_bytes[40_000:], headers=_auth(token))
+    assert retry.json()["offset"] == len(content_bytes)
+
+    done = await client.post(f"{chunks_url}/complete", headers=_auth(token))
+    assert done.status_code == 200
+    assert done.json()["sha256"] == hashlib.sha256(content_bytes).hexdigest()
+    again = await client.post(f"{chunks_url}/complete", headers=_auth(token))
+    assert again.json()["sha256"] == done.json()["sha256"]
+
+    read_resp = await client.get(f"/api/v1/uploads/{presigned['file_id']}/content", headers=_auth(token))
+    assert read_resp.content == content_bytes
+
+
+@pytest.mark.asyncio
+async def test_sweep_removes_stale_partial_uploads(client: AsyncClient):
+    """Abandoned partial uploads older than the TTL are deleted."""
+    import os
+
+    from app.modules.uploads import service
+
+    token = await _register_and_get_token(client, "upload20@test.com", "seeker")
+    presign_resp = await client.post(
+        "/api/v1/uploads/presign",
+        json={"filename": "clip.mp4", "mime_type": "video/mp4", "size": 1000},
+        headers=_auth(token),
+    )
+    file_id = presign_resp.json()["file_id"]
+    await client.put(f"/api/v1/uploads/{file_id}/chunks/0", content=b"x" * 100, headers=_auth(token))
+
+    partial = service.partial_upload_path(file_id)
+    assert service.sweep_stale_partial_uploads(3600) == 0
+    os.utime(partial, (0, 0))
+    assert service.sweep_stale_partial_uploads(3600) == 1
+    assert not partial.exists()
+
+
+@pytest.mark.asyncio
+async def test_presign_batch(client: AsyncClient):
+    """Batch presign returns one upload per item, in order, all or nothing."""
+    token = await _register_and_get_token(client, "upload21@test.com", "seeker")
+
+    resp = await client.post("/api/v1/uploads/presign:batch", json={"items": [
+        {"filename": "a.jpg", "mime_type": "image/jpeg", "size": 1024},
+        {"filename": "b.m4a", "mime_type": "audio/x-m4a", "size": 2048},
+        {"filename": "c.mp4", "mime_type": "video/mp4", "size": 4096},
+    ]}, headers=_auth(token))
+    assert resp.status_code == 200
+    items = resp.json()["items"]
+    assert [item["category"] for item in items] == ["image", "voice", "video"]
+    assert len({item["file_id"] for item in items}) == 3
+
+    upload_resp = await client.put(
+        f"/api/v1{items[0]['upload_url']}",
+        content=b"jpeg-bytes",
+        headers={**_auth(token), "Content-Type": "image/jpeg"},
+    )
+    assert upload_resp.status_code == 200
+
+    bad = await client.post("/api/v1/uploads/presign:batch", json={"items": [
+        {"filename": "a.jpg", "mime_type": "image/jpeg", "size": 1024},
+        {"filename": "x.exe", "mime_type": "application/octet-stream", "size": 10},
+    ]}, headers=_auth(token))
+    assert bad.status_code == 400
+
+    too_many = await client.post("/api/v1/uploads/presign:batch", json={"items": [
+        {"filename": f"{i}.jpg", "mime_type": "image/jpeg", "size": 1} for i in range(10)
+    ]}, headers=_auth(token))
+    assert too_many.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_signed_media_url(client: AsyncClient):
+    """Signed URLs serve content without auth and reject tampering and expiry."""
+    from urllib.parse import parse_qs, urlencode, urlsplit
+
+    from app.modules.uploads import service
+
+    token = await _register_and_get_token(client, "upload22@test.com", "seeker")
+    content_bytes = b"signed-photo" * 50
+    file_id = await _upload_image(client, token, content_bytes)
+
+    help_resp = await client.post(
+        "/api/v1/help-requests",
+        json={"text": "look", "mode": "hall", "image_file_ids": [file_id]},
+        headers=_auth(token),
+    )
+    detail = await client.get(f"/api/v1/help-requests/{help_resp.json()['id']}", headers=_auth(token))
+    signed_url = detail.json()["attachments"][0]["signed_url"]
+    assert signed_url.startswith(f"/uploads/media/{file_id}?")
+
+    resp = await client.get(f"/api/v1{signed_url}")
+    assert resp.status_code == 200
+    assert resp.content == content_bytes
+    assert resp.headers["cache-control"].startswith("public, max-age=")
+
+    parts = urlsplit(signed_url)
+    params = {k: v[0] for k, v in parse_qs(parts.query).items()}
+    tampered = {**params, "path": "../../etc/passwd"}
+    resp = await client.get(f"/api/v1{parts.path}?{urlencode(tampered)}")
+    assert resp.status_code == 403
+
+    expired = service.build_signed_content_url(file_id, params["path"], params["type"], now=0)
+    resp = await client.get(f"/api/v1{expired}")
+    assert resp.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_signed_media_url_survives_key_rotation(client: AsyncClient, monkeypatch):
+    """URLs signed with the previous key keep working while it is still configured."""
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "MEDIA_URL_SIGNING_KEYS", ["old-key"])
+    token = await _register_and_get_token(client, "upload23@test.com", "seeker")
+    presign_resp = await client.post(
+        "/api/v1/uploads/presign",
+        json={"filename": "photo.jpg", "mime_type": "image/jpeg", "size": 9},
+        headers=_auth(token),
+    )
+    file_id = presign_resp.json()["file_id"]
+    upload_resp = await client.put(
+        f"/api/v1/uploads/{file_id}/content",
+        content=b"rotate-me",
+        headers={**_auth(token), "Content-Type": "image/jpeg"},
+    )
+    old_url = upload_resp.json()["signed_url"]
+
+    monkeypatch.setattr(settings, "MEDIA_URL_SIGNING_KEYS", ["new-key", "old-key"])
+    assert (await client.get(f"/api/v1{old_url}")).status_code == 200
+
+    monkeypatch.setattr(settings, "MEDIA_URL_SIGNING_KEYS", ["new-key"])
+    assert (await client.get(f"/api/v1{old_url}")).status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_content_offloaded_to_front_proxy(client: AsyncClient, monkeypatch):
+    """In offload modes the app only authorizes and names the file for the proxy."""
+    from pathlib import Path
+
+    from app.core.config import settings
+
+    token = await _register_and_get_token(client, "upload24@test.com", "seeker")
+    content_bytes = b"offload-me" * 100
+    upload_resp = await _store_image(client, token, content_bytes)
+    url = f"/api/v1{upload_resp.json()['file_url']}"
+    sha256 = upload_resp.json()["sha256"]
+    blob_key = f"blobs/{sha256[:2]}/{sha256[2:4]}/{sha256}"
+
+    monkeypatch.setattr(settings, "STORAGE_SERVE_MODE", "x-accel-redirect")
+    resp = await client.get(url, headers=_auth(token))
+    assert resp.status_code == 200
+    assert resp.content == b""
+    assert resp.headers["x-accel-redirect"] == f"/_protected/uploads/{blob_key}"
+    assert resp.headers["content-type"] == "image/jpeg"
+    assert resp.headers["etag"] == f'"{sha256}"'
+    not_modified = await client.get(url, headers={**_auth(token), "If-None-Match": f'"{sha256}"'})
+    assert not_modified.status_code == 304
+    assert "x-accel-redirect" not in not_modified.headers
+
+    signed = await client.get(f"/api/v1{upload_resp.json()['signed_url']}")
+    assert signed.headers["x-accel-redirect"] == f"/_protected/uploads/{blob_key}"
+
+    monkeypatch.setattr(settings, "STORAGE_SERVE_MODE", "x-sendfile")
+    resp = await client.get(url, headers=_auth(token))
+    assert resp.content == b""
+    assert Path(resp.headers["x-sendfile"]).read_bytes() == content_bytes
+
+
+@pytest.fixture
+def s3_bucket(monkeypatch):
+    """A bucket on a local S3 stand-in, selected as the storage backend."""
+    boto3 = pytest.importorskip("boto3")
+    moto_server = pytest.importorskip("moto.server")
+    from app.core.config import settings
+
+    server = moto_server.ThreadedMotoServer(ip_address="127.0.0.1", port=0, verbose=False)
+    server.start()
+    host, port = server.get_host_and_port()
+    config = {
+        "S3_ENDPOINT_URL": f"http://{host}:{port}",
+        "S3_ACCESS_KEY_ID": "test",
+        "S3_SECRET_ACCESS_KEY": "test",
+        "S3_BUCKET": "seeforme-test",
+        "S3_KEY_PREFIX": "uploads/",
+    }
+    for name, value in config.items():
+        monkeypatch.setattr(settings, name, value)
+    monkeypatch.setattr(settings, "STORAGE_BACKEND", "s3")
+
+    s3 = boto3.client(
+        "s3",
+        endpoint_url=config["S3_ENDPOINT_URL"],
+        region_name="us-east-1",
+        aws_access_key_id="test",
+        aws_secret_access_key="test",
+    )
+    s3.create_bucket(Bucket=config["S3_BUCKET"])
+    yield s3
+    server.stop()
+
+
+@pytest.mark.asyncio
+async def test_s3_storage_backend(client: AsyncClient, s3_bucket, monkeypatch):
+    """Blobs round-trip through an S3-compatible store, deduplicated and collected."""
+    import shutil
+    from pathlib import Path
+
+    from app.core.config import settings
+
+    token = await _register_and_get_token(client, "upload25@test.com", "seeker")
+    content_bytes = b"s3-photo-bytes" * 200
+    first = await _store_image(client, token, content_bytes)
+    first_id = first.json()["file_id"]
+    sha256 = first.json()["sha256"]
+    object_key = f"uploads/blobs/{sha256[:2]}/{sha256[2:4]}/{sha256}"
+    stored = s3_bucket.get_object(Bucket="seeforme-test", Key=object_key)
+    assert stored["Body"].read() == content_bytes
+    assert not (Path(settings.UPLOAD_DIR) / "blobs").exists()
+
+    second = await _store_image(client, token, content_bytes)
+    second_id = second.json()["file_id"]
+    assert second.json()["deduplicated"] is True
+
+    # Served from a fresh read-through copy, then offloaded without touching S3.
+    shutil.rmtree(Path(settings.UPLOAD_DIR) / "cache", ignore_errors=True)
+    read_resp = await client.get(f"/api/v1/uploads/{second_id}/content", headers=_auth(token))
+    assert read_resp.content == content_bytes
+    monkeypatch.setattr(settings, "STORAGE_SERVE_MODE", "x-accel-redirect")
+    offloaded = await client.get(f"/api/v1{second.json()['signed_url']}")
+    assert offloaded.headers["x-accel-redirect"] == f"/_protected/s3/{object_key}"
+
+    for file_id in (first_id, second_id):
+        assert (await client.delete(f"/api/v1/uploads/{file_id}", headers=_auth(token))).status_code == 204
+    listing = s3_bucket.list_objects_v2(Bucket="seeforme-test")
+    assert listing.get("KeyCount", 0) == 0
+
+
+@pytest.mark.asyncio
+async def test_s3_read_through_cache_is_pruned(client: AsyncClient, s3_bucket):
+    """Cached S3 copies are trimmed stalest first; recently used ones are kept."""
+    import os
+    import time
+    from pathlib import Path
+
+    from app.core.config import settings
+    from app.modules.uploads.storage import get_storage
+
+    token = await _register_and_get_token(client, "upload29@test.com", "seeker")
+    cache_dir = Path(settings.UPLOAD_DIR) / "cache"
+    stored = {}
+    for name in ("old", "warm", "hot"):
+        upload = (await _store_image(client, token, f"{name}-photo".encode() * 100)).json()
+        read_resp = await client.get(f"/api/v1/uploads/{upload['file_id']}/content", headers=_auth(token))
+        assert read_resp.status_code == 200
+        sha256 = upload["sha256"]
+        stored[name] = (upload["file_id"], cache_dir / "blobs" / sha256[:2] / sha256[2:4] / sha256)
+    now = time.time()
+    for name, age in (("old", 3600), ("warm", 1800)):
+        os.utime(stored[name][1], (now - age, now - age))
+
+    storage = get_storage()
+    assert storage.prune_cache(10**9) == 0
+    assert storage.prune_cache(0) == len(b"old-photo" * 100) + len(b"warm-photo" * 100)
+    assert [path.exists() for _, path in stored.values()] == [False, False, True]
+
+    read_resp = await client.get(f"/api/v1/uploads/{stored['old'][0]}/content", headers=_auth(token))
+    assert read_resp.content == b"old-photo" * 100
+    assert stored["old"][1].exists()
+
+
+@pytest.mark.asyncio
+async def test_orphan_uploads_are_collected(client: AsyncClient):
+    """Stale pending and unreferenced uploads are collected; dry runs change nothing."""
+    from datetime import datetime, timedelta, timezone
+    from pathlib import Path
+
+    from sqlalchemy import update
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+    from app.core.config import settings
+    from app.modules.uploads.models import UploadedFile
+    from app.modules.uploads.orphans import collect_orphan_uploads, collector_stats
+    from tests.conftest import TEST_DATABASE_URL
+
+    token = await _register_and_get_token(client, "upload26@test.com", "seeker")
+    shared_bytes = b"kept-photo" * 100
+    attached_id = await _upload_image(client, token, shared_bytes)
+    await client.post(
+        "/api/v1/help-requests",
+        json={"text": "keep me", "mode": "hall", "image_file_ids": [attached_id]},
+        headers=_auth(token),
+    )
+    duplicate_id = await _upload_image(client, token, shared_bytes)
+    orphan = await _store_image(client, token, b"orphan-photo" * 100)
+    pending = await client.post(
+        "/api/v1/uploads/presign",
+        json={"filename": "never.jpg", "mime_type": "image/jpeg", "size": 10},
+        headers=_auth(token),
+    )
+    sha256 = orphan.json()["sha256"]
+    orphan_blob = Path(settings.UPLOAD_DIR) / "blobs" / sha256[:2] / sha256[2:4] / sha256
+
+    engine = create_async_engine(TEST_DATABASE_URL)
+    try:
+        async with AsyncSession(engine, expire_on_commit=False) as db:
+            await db.execute(
+                update(UploadedFile).values(
+                    created_at=datetime.now(timezone.utc) - timedelta(days=30)
+                )
+            )
+            await db.commit()
+            fresh_id = await _upload_image(client, token, b"fresh-photo")
+
+            deleted_before = collector_stats.records_deleted
+            dry = await collect_orphan_uploads(db, dry_run=True)
+            assert (dry.records, dry.pending_records, dry.blobs) == (3, 1, 1)
+            assert dry.bytes_reclaimed == len(b"orphan-photo" * 100)
+            assert orphan_blob.exists()
+            assert collector_stats.records_deleted == deleted_before
+
+            result = await collect_orphan_uploads(db, dry_run=False)
+            assert (result.records, result.blobs, result.bytes_reclaimed) == (
+                dry.records, dry.blobs, dry.bytes_reclaimed
+            )
+            assert collector_stats.records_deleted == deleted_before + 3
+            assert (await collect_orphan_uploads(db, dry_run=False)).records == 0
+    finally:
+        await engine.dispose()
+
+    assert not orphan_blob.exists()
+    for gone in (duplicate_id, orphan.json()["file_id"], pending.json()["file_id"]):
+        resp = await client.get(f"/api/v1/uploads/{gone}/content", headers=_auth(token))
+        assert resp.status_code == 404
+    for kept in (attached_id, fresh_id):
+        resp = await client.get(f"/api/v1/uploads/{kept}/content", headers=_auth(token))
+        assert resp.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_released_blob_survives_reacquisition(client: AsyncClient):
+    """Content released and then uploaded again before the delete runs is kept."""
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+    from app.modules.uploads import service
+    from tests.conftest import TEST_DATABASE_URL
+
+    token = await _register_and_get_token(client, "upload27@test.com", "seeker")
+    content_bytes = b"reacquired-photo" * 100
+    first_id = await _upload_image(client, token, content_bytes)
+
+    engine = create_async_engine(TEST_DATABASE_URL)
+    try:
+        async with AsyncSession(engine) as db:
+            record = await service.get_uploaded_file(db, first_id)
+            await db.delete(record)
+            freed = await service._release_blob(db, record.sha256, record.storage_path)
+            await db.commit()
+
+            second = await _store_image(client, token, content_bytes)
+            assert second.json()["deduplicated"] is False
+            await service.delete_released_content(db, [freed])
+    finally:
+        await engine.dispose()
+
+    read_resp = await client.get(
+        f"/api/v1/uploads/{second.json()['file_id']}/content", headers=_auth(token)
+    )
+    assert read_resp.status_code == 200
+    assert read_resp.content == content_bytes
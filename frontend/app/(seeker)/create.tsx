@@ -21,7 +21,7 @@ import { useAuth } from "@/lib/auth";
 import type {
   HelpRequestCreate,
   UploadContentResponse,
-  UploadPresignResponse,
+  UploadPresignBatchResponse,
 } from "@/lib/types";
 
 interface ModalState {
@@ -276,7 +276,7 @@ export default function SeekerCreateScreen() {
     trigger("success");
   };
 
-  const createUploadRecord = async (media: PickedMedia) => {
+  const prepareUpload = async (media: PickedMedia) => {
     const formData = new FormData();
     let uploadMimeType = normalizeUploadMimeType(media.mimeType);
     let uploadFileName = ensureFileNameExtension(media.fileName, uploadMimeType);
@@ -302,14 +302,25 @@ export default function SeekerCreateScreen() {
       );
     }
 
-    const result = await api.post<UploadPresignResponse>("/uploads/presign", {
-      filename: uploadFileName,
-      mime_type: uploadMimeType,
-      size: uploadSize,
-    });
+    return {
+      formData,
+      presign: { filename: uploadFileName, mime_type: uploadMimeType, size: uploadSize },
+    };
+  };
 
-    const uploaded = await api.put<UploadContentResponse>(result.upload_url, formData);
-    return uploaded.file_id;
+  /** Presign every attachment in one round-trip, then upload the bytes in parallel. */
+  const uploadAll = async (medias: PickedMedia[]): Promise<string[]> => {
+    if (medias.length === 0) return [];
+    const prepared = await Promise.all(medias.map(prepareUpload));
+    const { items } = await api.post<UploadPresignBatchResponse>("/uploads/presign:batch", {
+      items: prepared.map((upload) => upload.presign),
+    });
+    const uploaded = await Promise.all(
+      items.map((item, index) =>
+        api.put<UploadContentResponse>(item.upload_url, prepared[index].formData)
+      )
+    );
+    return uploaded.map((result) => result.file_id);
   };
 
   const handleSubmit = async () => {
@@ -326,9 +337,10 @@ export default function SeekerCreateScreen() {
 
     setLoading(true);
     try {
-      const imageIds = await Promise.all(images.map(createUploadRecord));
-      const videoIds = await Promise.all(videos.map(createUploadRecord));
-      const voiceId = audioFile ? await createUploadRecord(audioFile) : undefined;
+      const fileIds = await uploadAll([...images, ...videos, ...(audioFile ? [audioFile] : [])]);
+      const imageIds = fileIds.slice(0, images.length);
+      const videoIds = fileIds.slice(images.length, images.length + videos.length);
+      const voiceId = audioFile ? fileIds[fileIds.length - 1] : undefined;
 
       const payload: HelpRequestCreate = { mode: "hall" };
       if (text.trim()) payload.text = text.trim();
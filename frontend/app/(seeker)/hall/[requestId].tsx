@@ -219,7 +219,8 @@ export default function SeekerRequestDetail() {
                     media.file_url ? (
                       <SecureImage
                         key={media.id}
-                        endpoint={media.file_url}
+                        endpoint={media.signed_url ?? media.file_url}
+                        variant="display"
                         className="h-40 w-full rounded-2xl"
                       />
                     ) : null
@@ -233,7 +234,7 @@ export default function SeekerRequestDetail() {
                     media.file_url ? (
                       <AttachmentAudioPlayer
                         key={media.id}
-                        endpoint={media.file_url}
+                        endpoint={media.signed_url ?? media.file_url}
                         label={`语音 ${index + 1}`}
                         speakerName="我"
                         subtitle={new Date(request.created_at).toLocaleString("zh-CN", {
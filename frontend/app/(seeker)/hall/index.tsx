@@ -238,7 +238,8 @@ export default function SeekerHallScreen() {
 
                           {imageAttachments[0]?.file_url ? (
                             <SecureImage
-                              endpoint={imageAttachments[0].file_url}
+                              endpoint={imageAttachments[0].signed_url ?? imageAttachments[0].file_url}
+                              variant="thumb"
                               className="mt-3 h-36 w-full rounded-2xl"
                             />
                           ) : null}
@@ -246,7 +247,7 @@ export default function SeekerHallScreen() {
                           {voiceAttachments[0]?.file_url ? (
                             <View className="mt-3 rounded-2xl border border-cyan-200/80 bg-cyan-50/70 p-2.5">
                               <AttachmentAudioPlayer
-                                endpoint={voiceAttachments[0].file_url}
+                                endpoint={voiceAttachments[0].signed_url ?? voiceAttachments[0].file_url}
                                 label="语音内容"
                                 speakerName="我"
                                 subtitle={new Date(item.created_at).toLocaleString("zh-CN", {
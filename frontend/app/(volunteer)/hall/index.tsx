@@ -212,7 +212,8 @@ export default function VolunteerHallScreen() {
 
                       {imageAttachments[0]?.file_url ? (
                         <SecureImage
-                          endpoint={imageAttachments[0].file_url}
+                          endpoint={imageAttachments[0].signed_url ?? imageAttachments[0].file_url}
+                          variant="thumb"
                           className="mt-3 h-36 w-full rounded-2xl"
                         />
                       ) : null}
@@ -220,7 +221,7 @@ export default function VolunteerHallScreen() {
                       {voiceAttachments[0]?.file_url ? (
                         <View className="mt-3">
                           <AttachmentAudioPlayer
-                            endpoint={voiceAttachments[0].file_url}
+                            endpoint={voiceAttachments[0].signed_url ?? voiceAttachments[0].file_url}
                             label="语音内容"
                             speakerName="求助者"
                             subtitle={new Date(item.created_at).toLocaleString("zh-CN", {
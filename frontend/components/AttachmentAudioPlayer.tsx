@@ -14,6 +14,8 @@ import * as storage from "@/lib/storage";
 
 interface AttachmentAudioPlayerProps {
   endpoint: string;
+  /** Server variant to stream; the compact one is a fraction of the original's size. */
+  variant?: "compact" | null;
   label?: string;
   compact?: boolean;
   speakerName?: string;
@@ -44,6 +46,7 @@ function clamp01(value: number): number {
 
 export default function AttachmentAudioPlayer({
   endpoint,
+  variant = "compact",
   label = "语音内容",
   compact = false,
   speakerName = "求助者",
@@ -64,6 +67,14 @@ export default function AttachmentAudioPlayer({
   const [durationSec, setDurationSec] = useState(0);
   const [waveLevels, setWaveLevels] = useState<number[]>(DEFAULT_WAVE_LEVELS);
 
+  const sourceUrl = useMemo(
+    () => {
+      const joiner = endpoint.includes("?") ? "&" : "?";
+      return buildApiUrl(variant ? `${endpoint}${joiner}variant=${variant}` : endpoint);
+    },
+    [endpoint, variant]
+  );
+
   const playbackProgress = useMemo(
     () => clamp01(durationSec > 0 ? positionSec / durationSec : 0),
     [durationSec, positionSec]
@@ -111,7 +122,7 @@ export default function AttachmentAudioPlayer({
     setPositionSec(0);
     setDurationSec(0);
     setWaveLevels(DEFAULT_WAVE_LEVELS);
-  }, [endpoint, cleanup]);
+  }, [sourceUrl, cleanup]);
 
   useEffect(() => {
     return () => {
@@ -173,10 +184,9 @@ export default function AttachmentAudioPlayer({
 
   const buildSource = useCallback(async (): Promise<AVPlaybackSource> => {
     const token = await storage.getItem("access_token");
-    const absoluteUrl = buildApiUrl(endpoint);
     const headers = token ? { Authorization: `Bearer ${token}` } : undefined;
-    return { uri: absoluteUrl, headers };
-  }, [endpoint]);
+    return { uri: sourceUrl, headers };
+  }, [sourceUrl]);
 
   const ensureSound = useCallback(async (): Promise<Audio.Sound> => {
     if (soundRef.current) {
@@ -199,9 +209,8 @@ export default function AttachmentAudioPlayer({
     }
 
     const token = await storage.getItem("access_token");
-    const absoluteUrl = buildApiUrl(endpoint);
     const headers = token ? { Authorization: `Bearer ${token}` } : undefined;
-    const response = await fetch(absoluteUrl, { headers });
+    const response = await fetch(sourceUrl, { headers });
     if (!response.ok) {
       throw new Error(`Audio fetch failed: ${response.status}`);
     }
@@ -249,7 +258,7 @@ export default function AttachmentAudioPlayer({
 
     webAudioRef.current = audio;
     return audio;
-  }, [endpoint]);
+  }, [sourceUrl]);
 
   const onToggle = useCallback(async () => {
     setLoading(true);
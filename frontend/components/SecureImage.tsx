@@ -12,14 +12,19 @@ import {
 import { buildApiUrl } from "@/lib/api";
 import * as storage from "@/lib/storage";
 
+export type ImageVariant = "thumb" | "display" | "normalized";
+
 interface SecureImageProps {
   endpoint: string;
+  /** Server-rendered derivative to fetch instead of the original upload. */
+  variant?: ImageVariant;
   className?: string;
   resizeMode?: ImageResizeMode;
 }
 
 export default function SecureImage({
   endpoint,
+  variant,
   className,
   resizeMode = "cover",
 }: SecureImageProps) {
@@ -36,7 +41,10 @@ export default function SecureImage({
 
       try {
         const token = await storage.getItem("access_token");
-        const absoluteUrl = buildApiUrl(endpoint);
+        const joiner = endpoint.includes("?") ? "&" : "?";
+        const absoluteUrl = buildApiUrl(
+          variant ? `${endpoint}${joiner}variant=${variant}` : endpoint
+        );
         const authHeaders = token
           ? { Authorization: `Bearer ${token}` }
           : undefined;
@@ -72,7 +80,7 @@ export default function SecureImage({
         URL.revokeObjectURL(objectUrl);
       }
     };
-  }, [endpoint]);
+  }, [endpoint, variant]);
 
   if (!source) {
     return (
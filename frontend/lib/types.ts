@@ -70,6 +70,7 @@ export interface RequestAttachment {
   file_id: string;
   file_type: "image" | "voice" | "video";
   file_url?: string;
+  signed_url?: string | null;
 }
 
 export interface HelpRequest {
@@ -89,9 +90,10 @@ export interface HelpRequest {
 
 export interface HelpRequestListResponse {
   items: HelpRequest[];
-  total: number;
+  total: number | null;
   page: number;
   page_size: number;
+  next_cursor?: string | null;
 }
 
 // ── Reply ─────────────────────────────────────────
@@ -115,7 +117,7 @@ export interface ReplyListResponse {
   items: Reply[];
 }
 
-export type NotificationType = "reply" | "system";
+export type NotificationType = "reply" | "claim" | "feedback" | "system";
 
 export interface NotificationItem {
   id: string;
@@ -126,6 +128,7 @@ export interface NotificationItem {
   tag: string;
   request_id: string | null;
   reply_id: string | null;
+  is_read?: boolean;
   created_at: string;
 }
 
@@ -158,14 +161,29 @@ export interface UploadPresignRequest {
 export interface UploadPresignResponse {
   file_id: string;
   upload_url: string;
+  chunks_url: string;
+  chunk_size: number;
   category: "image" | "voice" | "video";
 }
 
+export interface UploadPresignBatchRequest {
+  items: UploadPresignRequest[];
+}
+
+export interface UploadPresignBatchResponse {
+  items: UploadPresignResponse[];
+}
+
 export interface UploadContentResponse {
   file_id: string;
   file_url: string;
+  signed_url?: string | null;
   category: "image" | "voice" | "video";
   mime_type: string;
   size: number;
+  sha256: string | null;
+  deduplicated: boolean;
+  duration_ms: number | null;
+  waveform: number[] | null;
 }
 